@@ -1,47 +1,48 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.ticker import FuncFormatter
-from db_conector import get_db_connection
+from df_Queries import get_lap_stats, get_race_positions, get_session_laps, get_stint_degradation
+import common_path  # noqa: F401  (common/ on sys.path)
+from lap_flags import FIRST_LAP, OUT_LAP
 
 # ===============================
 # Configuration
 # ===============================
 SESSION_ID = 1  # Race session ID
 DRIVERS = {"LEC": "Charles Leclerc", "PIA": "Oscar Piastri"}
+EVENT = "2024 Italian GP"
 
 DRIVER_COLORS = {
     "Charles Leclerc": "#FF0000",  # red
     "Oscar Piastri": "#FF8800"     # orange
 }
 
+TYRE_COLORS = {
+    "SOFT": "#FF3333",
+    "MEDIUM": "#FFCC00",
+    "HARD": "#BBBBBB"
+}
+
 TYRE_STYLES = {
     "HARD": "-",    # solid
     "MEDIUM": "--", # dashed
     "SOFT": ":"     # optional
 }
 
+
 # ===============================
 # Load laps
 # ===============================
-conn = get_db_connection()
-query = """
-SELECT d.full_name AS driver,
-       l.lap_number,
-       l.lap_time,
-       l.pit,
-       l.tyre_compound,
-       l.stint_number
-FROM laps l
-JOIN drivers d ON l.driver_id = d.driver_id
-WHERE l.session_id = %s
-AND (d.full_name = %s OR d.full_name = %s)
-ORDER BY l.lap_number, d.full_name
-"""
-df = pd.read_sql(query, conn, params=(SESSION_ID, DRIVERS["LEC"], DRIVERS["PIA"]))
-conn.close()
-
-df = df.dropna(subset=["lap_time"])
-df["tyre_compound"] = df["tyre_compound"].str.strip().str.upper()
+def prepare_laps(laps, drivers=DRIVERS):
+    """Timed laps of the compared drivers, from get_session_laps()."""
+    df = laps[laps["full_name"].isin(list(drivers.values()))]
+    df = df.rename(columns={"full_name": "driver"})
+    df = df[["driver", "lap_number", "lap_time", "pit", "tyre_compound", "stint_number", "flags"]]
+    df = df.sort_values(["lap_number", "driver"])
+
+    df = df.dropna(subset=["lap_time"]).copy()
+    df["tyre_compound"] = df["tyre_compound"].str.strip().str.upper()
+    return df
+
 
 # ===============================
 # Helper to format lap time
@@ -51,89 +52,187 @@ def format_lap_time(seconds):
     sec = seconds % 60
     return f"{minutes}:{sec:06.3f}"
 
+
 # ===============================
-# Remove pit-out laps for line plot
+# Remove pit-out laps
 # ===============================
-df_line = df[df.groupby(['driver', 'stint_number'])['lap_number'].transform('min') != df['lap_number']]
+def without_pit_out_laps(df):
+    return df[(df["flags"] & (OUT_LAP | FIRST_LAP)) == 0]
+
 
 # ===============================
 # Line plot: lap times with tyre & pit info
 # ===============================
-plt.figure(figsize=(14, 6))
-
-for driver_name in DRIVERS.values():
-    driver_df = df_line[df_line["driver"] == driver_name]
-
-    for tyre, style in TYRE_STYLES.items():
-        tyre_laps = driver_df[driver_df["tyre_compound"] == tyre]
-        if not tyre_laps.empty:
-            plt.plot(
-                tyre_laps["lap_number"],
-                tyre_laps["lap_time"],
-                linestyle=style,
-                color=DRIVER_COLORS[driver_name],
-                marker='o',
-                markersize=4,
-                label=f"{driver_name} – {tyre}"
-            )
-
-    # pit stops as small dots
-    pits = driver_df[driver_df["pit"] == 1]
-    plt.scatter(
-        pits["lap_number"],
-        pits["lap_time"],
-        s=40,  # smaller dots
-        facecolor='white',
-        edgecolor=DRIVER_COLORS[driver_name],
-        linewidth=1.5,
-        zorder=5
-    )
-
-plt.xlabel("Lap Number", color='black')
-plt.ylabel("Lap Time (min:sec.ms)", color='black')
-plt.title("2024 Italian GP – Leclerc vs Piastri Strategy Battle", color='black')
-
-# y-axis formatting using FuncFormatter
-plt.gca().yaxis.set_major_formatter(FuncFormatter(lambda y, _: format_lap_time(y)))
-
-plt.grid(alpha=0.3)
-plt.legend(bbox_to_anchor=(1.05,1), loc='upper left')
-plt.tight_layout()
-plt.show()
-
-# ===============================
-# Cumulative race time per driver
-# ===============================
-df_cumm = df.copy()
-
-# Remove pit-out laps if desired
-df_cumm = df_cumm[df_cumm.groupby(['driver', 'stint_number'])['lap_number'].transform('min') != df_cumm['lap_number']]
-
-# Compute cumulative time
-df_cumm['cum_time'] = df_cumm.groupby('driver')['lap_time'].cumsum()
-
-# ===============================
-# Plot cumulative race time
-# ===============================
-plt.figure(figsize=(14, 6))
-
-for driver_name in DRIVERS.values():
-    driver_df = df_cumm[df_cumm['driver'] == driver_name]
-    plt.plot(
-        driver_df['lap_number'],
-        driver_df['cum_time'],
-        color=DRIVER_COLORS[driver_name],
-        linestyle='-',
-        marker='o',
-        markersize=4,
-        label=driver_name
-    )
-
-plt.xlabel("Lap Number")
-plt.ylabel("Cumulative Race Time (s)")
-plt.title("2024 Italian GP – Cumulative Race Time: Leclerc vs Piastri")
-plt.grid(alpha=0.3)
-plt.legend()
-plt.tight_layout()
-plt.show()
+def plot_strategy(df, drivers=DRIVERS, event=EVENT):
+    df_line = without_pit_out_laps(df)
+    fig, ax = plt.subplots(figsize=(14, 6))
+
+    for driver_name in drivers.values():
+        driver_df = df_line[df_line["driver"] == driver_name]
+
+        for tyre, style in TYRE_STYLES.items():
+            tyre_laps = driver_df[driver_df["tyre_compound"] == tyre]
+            if not tyre_laps.empty:
+                ax.plot(
+                    tyre_laps["lap_number"],
+                    tyre_laps["lap_time"],
+                    linestyle=style,
+                    color=DRIVER_COLORS.get(driver_name),
+                    marker='o',
+                    markersize=4,
+                    label=f"{driver_name} – {tyre}"
+                )
+
+        # pit stops as small dots
+        pits = driver_df[driver_df["pit"] == 1]
+        ax.scatter(
+            pits["lap_number"],
+            pits["lap_time"],
+            s=40,  # smaller dots
+            facecolor='white',
+            edgecolor=DRIVER_COLORS.get(driver_name),
+            linewidth=1.5,
+            zorder=5
+        )
+
+    names = " vs ".join(name.split()[-1] for name in drivers.values())
+    ax.set_xlabel("Lap Number", color='black')
+    ax.set_ylabel("Lap Time (min:sec.ms)", color='black')
+    ax.set_title(f"{event} – {names} Strategy Battle", color='black')
+
+    # y-axis formatting using FuncFormatter
+    ax.yaxis.set_major_formatter(FuncFormatter(lambda y, _: format_lap_time(y)))
+
+    ax.grid(alpha=0.3)
+    ax.legend(bbox_to_anchor=(1.05,1), loc='upper left')
+    fig.tight_layout()
+    return fig
+
+
+# ===============================
+# Race time and gaps per driver (race_positions table)
+# ===============================
+def prepare_cumulative(positions, drivers=DRIVERS):
+    df = positions[positions["full_name"].isin(list(drivers.values()))]
+    return df.rename(columns={"full_name": "driver", "race_time": "cum_time"})
+
+
+def plot_cumulative_time(df_cumm, drivers=DRIVERS, event=EVENT):
+    fig, ax = plt.subplots(figsize=(14, 6))
+
+    for driver_name in drivers.values():
+        driver_df = df_cumm[df_cumm['driver'] == driver_name]
+        ax.plot(
+            driver_df['lap_number'],
+            driver_df['cum_time'],
+            color=DRIVER_COLORS.get(driver_name),
+            linestyle='-',
+            marker='o',
+            markersize=4,
+            label=driver_name
+        )
+
+    names = " vs ".join(name.split()[-1] for name in drivers.values())
+    ax.set_xlabel("Lap Number")
+    ax.set_ylabel("Cumulative Race Time (s)")
+    ax.set_title(f"{event} – Cumulative Race Time: {names}")
+    ax.grid(alpha=0.3)
+    ax.legend()
+    fig.tight_layout()
+    return fig
+
+
+def plot_gaps(df_cumm, drivers=DRIVERS, event=EVENT):
+    """Gap to the race leader after every lap; the leader sits on the zero line."""
+    fig, ax = plt.subplots(figsize=(14, 6))
+
+    for driver_name in drivers.values():
+        driver_df = df_cumm[df_cumm['driver'] == driver_name]
+        ax.plot(
+            driver_df['lap_number'],
+            driver_df['gap_to_leader'].fillna(0.0),
+            color=DRIVER_COLORS.get(driver_name),
+            marker='o',
+            markersize=3,
+            label=driver_name
+        )
+
+    names = " vs ".join(name.split()[-1] for name in drivers.values())
+    ax.invert_yaxis()  # leader on top
+    ax.set_xlabel("Lap Number")
+    ax.set_ylabel("Gap to Leader (s)")
+    ax.set_title(f"{event} – Gap to Leader: {names}")
+    ax.grid(alpha=0.3)
+    ax.legend()
+    fig.tight_layout()
+    return fig
+
 
+# ===============================
+# Stint degradation (stint_degradation summary table)
+# ===============================
+def plot_degradation(deg, drivers=DRIVERS, event=EVENT):
+    """Fuel-corrected seconds lost per lap of tyre age, one bar per stint."""
+    df = deg[deg["full_name"].isin(list(drivers.values()))]
+    labels = [f"{name.split()[-1]} S{int(stint)}" for name, stint in zip(df["full_name"], df["stint_number"])]
+
+    fig, ax = plt.subplots(figsize=(10, 5))
+    ax.bar(labels, df["deg_per_lap"],
+           color=[TYRE_COLORS.get(tyre, "grey") for tyre in df["tyre_compound"]],
+           edgecolor="black")
+    for i, (laps, slope) in enumerate(zip(df["laps"], df["deg_per_lap"])):
+        ax.annotate(f"{int(laps)} laps", (i, slope), ha="center",
+                    va="bottom" if slope >= 0 else "top", fontsize=8)
+
+    ax.axhline(0, color="black", linewidth=0.8)
+    ax.set_ylabel("Degradation (s / lap, fuel corrected)")
+    ax.set_title(f"{event} – Tyre Degradation per Stint")
+    ax.grid(alpha=0.3, axis="y")
+    fig.tight_layout()
+    return fig
+
+
+# ===============================
+# Stint pace (lap_stats summary table)
+# ===============================
+def plot_stint_pace(stats, drivers=DRIVERS, event=EVENT):
+    """Mean lap time per stint with the best lap as a marker, from get_lap_stats()."""
+    df = stats[stats["abbreviation"].isin(list(drivers))]
+    labels = [f"{abbr} S{int(stint)}" for abbr, stint in zip(df["abbreviation"], df["stint_number"])]
+
+    fig, ax = plt.subplots(figsize=(10, 5))
+    ax.bar(labels, df["mean_lap_time"], yerr=df["std_lap_time"].fillna(0.0),
+           color=[TYRE_COLORS.get(tyre, "grey") for tyre in df["tyre_compound"]],
+           edgecolor=[DRIVER_COLORS.get(drivers[abbr]) for abbr in df["abbreviation"]],
+           linewidth=2, capsize=3)
+    ax.scatter(labels, df["best_lap_time"], marker="_", s=400, color="black", zorder=5, label="Best lap")
+    for i, (laps, mean) in enumerate(zip(df["laps"], df["mean_lap_time"])):
+        ax.annotate(f"{int(laps)} laps", (i, mean), ha="center", va="bottom", fontsize=8)
+
+    ax.set_ylim(df["best_lap_time"].min() - 1.0, (df["mean_lap_time"] + df["std_lap_time"].fillna(0.0)).max() + 1.0)
+    ax.yaxis.set_major_formatter(FuncFormatter(lambda y, _: format_lap_time(y)))
+    ax.set_ylabel("Lap Time (min:sec.ms)")
+    ax.set_title(f"{event} – Stint Pace")
+    ax.grid(alpha=0.3, axis="y")
+    ax.legend()
+    fig.tight_layout()
+    return fig
+
+
+def main():
+    df = prepare_laps(get_session_laps(SESSION_ID))
+    plot_strategy(df)
+    plt.show()
+    race = prepare_cumulative(get_race_positions(SESSION_ID))
+    plot_cumulative_time(race)
+    plt.show()
+    plot_gaps(race)
+    plt.show()
+    plot_degradation(get_stint_degradation(SESSION_ID))
+    plt.show()
+    plot_stint_pace(get_lap_stats(SESSION_ID))
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
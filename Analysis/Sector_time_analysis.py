@@ -1,62 +1,64 @@
-import pandas as pd
 import matplotlib.pyplot as plt
-from db_conector import get_db_connection
+from df_Queries import get_sector_stats
 
 SESSION_ID = 1  # Monza race
+EVENT = "2024 Italian GP"
+SECTORS = ["sector1_time", "sector2_time", "sector3_time"]
+
+
+# --- average per driver over non-pit laps (sector_stats summary table) ---
+def prepare_sectors(sector_stats):
+    return sector_stats.rename(columns={"abbreviation": "driver"})[["driver"] + SECTORS]
+
+
+# --- gap to fastest driver per sector ---
+def sector_gaps(sector_avg):
+    sector_gap = sector_avg.copy()
+    for s in SECTORS:
+        sector_gap[s] = (sector_gap[s] - sector_gap[s].min())   # seconds → milliseconds
+    return sector_gap
 
-# --- query ---
-query = """
-SELECT
-    d.abbreviation AS driver,
-    l.sector1_time,
-    l.sector2_time,
-    l.sector3_time
-FROM laps l
-JOIN drivers d ON l.driver_id = d.driver_id
-WHERE l.session_id = %s
-  AND l.pit = 0
-"""
-
-conn = get_db_connection()
-df = pd.read_sql(query, conn, params=(SESSION_ID,))
-conn.close()
-
-# --- cleaning ---
-df = df.dropna()
-
-# --- compute average per driver ---
-sector_avg = df.groupby("driver")[["sector1_time", "sector2_time", "sector3_time"]].mean().reset_index()
-
-# --- compute gap to fastest driver per sector (ms) ---
-sector_gap = sector_avg.copy()
-for s in ["sector1_time", "sector2_time", "sector3_time"]:
-    sector_gap[s] = (sector_gap[s] - sector_gap[s].min())   # seconds → milliseconds
 
 # --- plot ---
-sector_gap.set_index("driver")[["sector1_time", "sector2_time", "sector3_time"]].plot(
-    kind="bar",
-    figsize=(12, 6),
-    width=0.8
-)
-
-plt.ylabel("Gap to Fastest Driver (ms)")
-plt.title("Sector Time Gaps – 2024 Italian GP")
-plt.xticks(rotation=0)
-plt.grid(axis="y", alpha=0.3)
-plt.tight_layout()
-plt.show()
+def plot_sector_gaps(sector_gap, event=EVENT):
+    fig, ax = plt.subplots(figsize=(12, 6))
+    sector_gap.set_index("driver")[SECTORS].plot(
+        kind="bar",
+        ax=ax,
+        width=0.8
+    )
+
+    ax.set_ylabel("Gap to Fastest Driver (ms)")
+    ax.set_title(f"Sector Time Gaps – {event}")
+    ax.tick_params(axis="x", rotation=0)
+    ax.grid(axis="y", alpha=0.3)
+    fig.tight_layout()
+    return fig
+
 
 # --- print dominant sector ---
-sector_spread = {
-    "Sector 1": sector_gap["sector1_time"].max(),
-    "Sector 2": sector_gap["sector2_time"].max(),
-    "Sector 3": sector_gap["sector3_time"].max(),
-}
-dominant_sector = max(sector_spread, key=sector_spread.get)
+def print_dominant_sector(sector_gap):
+    sector_spread = {
+        "Sector 1": sector_gap["sector1_time"].max(),
+        "Sector 2": sector_gap["sector2_time"].max(),
+        "Sector 3": sector_gap["sector3_time"].max(),
+    }
+    dominant_sector = max(sector_spread, key=sector_spread.get)
+
+
+
+    print("Sector Time Contribution Analysis\n")
+    for sector, spread in sector_spread.items():
+        print(f"{sector}: max gap = {spread:.3f} s")
+    print(f"\n➡ Sector with largest performance gap: {dominant_sector}")
+
 
+def main():
+    sector_gap = sector_gaps(prepare_sectors(get_sector_stats(SESSION_ID)))
+    plot_sector_gaps(sector_gap)
+    plt.show()
+    print_dominant_sector(sector_gap)
 
 
-print("Sector Time Contribution Analysis\n")
-for sector, spread in sector_spread.items():
-    print(f"{sector}: max gap = {spread:.3f} s")
-print(f"\n➡ Sector with largest performance gap: {dominant_sector}")
+if __name__ == "__main__":
+    main()
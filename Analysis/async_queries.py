@@ -0,0 +1,78 @@
+import asyncio
+
+import df_Queries
+import common_path  # noqa: F401  (common/ on sys.path)
+from db_conector import get_pool
+
+# ===============================
+# Configuration
+# ===============================
+# Queries loaded per session by default (df_Queries function names)
+DASHBOARD_QUERIES = ("get_laps", "get_sectors", "get_telemetry")
+
+
+def default_concurrency():
+    """One query per pooled connection, so no thread waits for the pool."""
+    return get_pool().pool_size
+
+
+# ===============================
+# Thread bridge
+# ===============================
+# df_Queries and the query cache are blocking (mysql-connector, pd.read_sql);
+# each call runs on a worker thread with its own pooled connection.
+async def _run(semaphore, func, args):
+    async with semaphore:
+        return await asyncio.to_thread(func, *args)
+
+
+async def gather_queries(calls, max_concurrency=None, timeout=None):
+    """
+    Run independent blocking query calls, each a (func, *args) tuple,
+    concurrently. At most max_concurrency run at once (default: the
+    connection pool size). Results come back in call order.
+
+    If one call fails, the timeout expires or the caller is cancelled,
+    every call that has not started yet is cancelled. A call that is
+    already running on a thread still finishes, but its result is dropped.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency or default_concurrency())
+    tasks = [asyncio.ensure_future(_run(semaphore, func, args)) for func, *args in calls]
+    try:
+        return await asyncio.wait_for(asyncio.gather(*tasks), timeout)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+# ===============================
+# Dashboard loads
+# ===============================
+async def load_sessions(session_ids, queries=DASHBOARD_QUERIES, max_concurrency=None, timeout=None):
+    """{session_id: {query name: DataFrame}} with every (session, query) pair fetched concurrently."""
+    pairs = [(session_id, name) for session_id in session_ids for name in queries]
+    results = await gather_queries(
+        [(getattr(df_Queries, name), session_id) for session_id, name in pairs],
+        max_concurrency, timeout
+    )
+    data = {session_id: {} for session_id in session_ids}
+    for (session_id, name), df in zip(pairs, results):
+        data[session_id][name] = df
+    return data
+
+
+async def load_lap_telemetry(session_id, laps, max_concurrency=None, timeout=None):
+    """{(driver_id, lap_number): telemetry DataFrame} for several laps at once."""
+    laps = list(laps)
+    results = await gather_queries(
+        [(df_Queries.get_lap_telemetry, session_id, driver_id, lap_number) for driver_id, lap_number in laps],
+        max_concurrency, timeout
+    )
+    return dict(zip(laps, results))
+
+
+def load_dashboard(session_ids, queries=DASHBOARD_QUERIES, max_concurrency=None, timeout=None):
+    """Blocking entry point for scripts: load_sessions on a fresh event loop."""
+    return asyncio.run(load_sessions(session_ids, queries, max_concurrency, timeout))
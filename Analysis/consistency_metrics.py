@@ -0,0 +1,57 @@
+# ===============================
+# Configuration
+# ===============================
+IQR_FACTOR = 1.5  # Tukey fences: [Q1 - 1.5 IQR, Q3 + 1.5 IQR]
+
+
+# ===============================
+# Outliers
+# ===============================
+def iqr_bounds(df, by="driver", value="lap_time", k=IQR_FACTOR):
+    """Per-row lower/upper IQR fences of each row's group, computed in one groupby pass."""
+    grouped = df.groupby(by, sort=False)[value]
+    q1 = grouped.transform("quantile", 0.25)
+    q3 = grouped.transform("quantile", 0.75)
+    iqr = q3 - q1
+    return q1 - k * iqr, q3 + k * iqr
+
+
+def filter_outliers(df, by="driver", value="lap_time", k=IQR_FACTOR):
+    """Rows whose value lies inside their group's IQR fences."""
+    lower, upper = iqr_bounds(df, by, value, k)
+    return df[(df[value] >= lower) & (df[value] <= upper)]
+
+
+# ===============================
+# Consistency statistics
+# ===============================
+def consistency_stats(df, by="driver", value="lap_time"):
+    """
+    Laps, mean, std, IQR and coefficient of variation (std / mean) per group.
+    by may be a column or a list of columns (e.g. session, driver, stint).
+    """
+    grouped = df.groupby(by)[value]
+    stats = grouped.agg(laps="count", mean="mean", std="std")
+    quartiles = grouped.quantile([0.25, 0.75]).unstack()
+    stats["iqr"] = quartiles[0.75] - quartiles[0.25]
+    stats["cv"] = stats["std"] / stats["mean"]
+    return stats.reset_index()
+
+
+def rolling_consistency(df, by="driver", value="lap_time", order="lap_number", window=5):
+    """Rolling standard deviation of value over the last `window` laps of each group."""
+    keys = [by] if isinstance(by, str) else list(by)
+    ordered = df.sort_values(keys + [order])
+    rolling = (
+        ordered.groupby(keys, sort=False)[value]
+        .rolling(window, min_periods=2)
+        .std()
+        .reset_index(level=list(range(len(keys))), drop=True)
+    )
+    return rolling.reindex(df.index)
+
+
+def consistency_report(df, by="driver", value="lap_time", k=IQR_FACTOR):
+    """Outlier-filtered laps and their consistency statistics, most consistent first."""
+    clean = filter_outliers(df, by, value, k)
+    return clean, consistency_stats(clean, by, value).sort_values("std")
@@ -1,47 +1,181 @@
 import pandas as pd
-from db_conector import get_db_connection
+
+import common_path  # noqa: F401  (common/ on sys.path)
+from db_conector import db_connection
+from query_cache import cached_read_sql
+
+# The SQL of every query is a module constant, so Database/migrate.py --check
+# EXPLAINs exactly what the analyses run.
+LAPS_QUERY = """
+SELECT d.abbreviation, l.lap_number, l.lap_time, l.pit, l.track_status
+FROM laps l
+JOIN drivers d ON l.driver_id = d.driver_id
+WHERE l.session_id = %s
+ORDER BY d.abbreviation, l.lap_number
+"""
 
 def get_laps(session_id):
-    query = """
-    SELECT d.abbreviation, l.lap_number, l.lap_time, l.pit, l.track_status
-    FROM laps l
-    JOIN drivers d ON l.driver_id = d.driver_id
-    WHERE l.session_id = %s
-    ORDER BY d.abbreviation, l.lap_number
-    """
-    conn = get_db_connection()
-    df = pd.read_sql(query, conn, params=(session_id,))
-    conn.close()
-    return df
+    return cached_read_sql(LAPS_QUERY, (session_id,), session_id=session_id)
+
+SECTORS_QUERY = """
+SELECT d.abbreviation,
+       l.sector1_time,
+       l.sector2_time,
+       l.sector3_time
+FROM laps l
+JOIN drivers d ON l.driver_id = d.driver_id
+WHERE l.session_id = %s AND l.pit = 0
+"""
 
 def get_sectors(session_id):
-    query = """
-    SELECT d.abbreviation,
-           l.sector1_time,
-           l.sector2_time,
-           l.sector3_time
-    FROM laps l
-    JOIN drivers d ON l.driver_id = d.driver_id
-    WHERE l.session_id = %s AND l.pit = 0
-    """
-    conn = get_db_connection()
-    df = pd.read_sql(query, conn, params=(session_id,))
-    conn.close()
-    return df
+    return cached_read_sql(SECTORS_QUERY, (session_id,), session_id=session_id)
+
+TELEMETRY_QUERY = """
+SELECT d.abbreviation,
+       t.speed, t.throttle, t.brake, t.gear AS nGear, t.rpm, l.lap_time
+FROM telemetry t
+JOIN laps l
+  ON t.session_id = l.session_id
+ AND t.driver_id = l.driver_id
+ AND t.lap_number = l.lap_number
+JOIN drivers d ON d.driver_id = l.driver_id
+WHERE t.session_id = %s AND l.pit = 0
+"""
 
 def get_telemetry(session_id):
-    query = """
-    SELECT d.abbreviation,
-           t.speed, t.throttle, t.brake, t.nGear, t.rpm, l.lap_time
-    FROM telemetry t
-    JOIN laps l
-      ON t.session_id = l.session_id
-     AND t.driver_id = l.driver_id
-     AND t.lap_number = l.lap_number
-    JOIN drivers d ON d.driver_id = l.driver_id
-    WHERE t.session_id = %s AND l.pit = 0
-    """
-    conn = get_db_connection()
-    df = pd.read_sql(query, conn, params=(session_id,))
-    conn.close()
-    return df
+    return cached_read_sql(TELEMETRY_QUERY, (session_id,), session_id=session_id)
+
+SESSION_LAPS_QUERY = """
+SELECT d.abbreviation,
+       d.full_name,
+       l.lap_number,
+       l.lap_time,
+       l.sector1_time,
+       l.sector2_time,
+       l.sector3_time,
+       l.pit,
+       l.tyre_compound,
+       l.stint_number,
+       l.track_status,
+       l.flags
+FROM laps l
+JOIN drivers d ON l.driver_id = d.driver_id
+WHERE l.session_id = %s
+ORDER BY d.abbreviation, l.lap_number
+"""
+
+def get_session_laps(session_id):
+    """Every lap of a session with driver names, shared by the analyses and reports."""
+    return cached_read_sql(SESSION_LAPS_QUERY, (session_id,), session_id=session_id)
+
+CLEAN_LAPS_QUERY = """
+SELECT d.abbreviation,
+       l.lap_number,
+       l.lap_time,
+       l.tyre_compound,
+       l.stint_number
+FROM laps l
+JOIN drivers d ON l.driver_id = d.driver_id
+WHERE l.session_id = %s AND l.flags = 0
+ORDER BY d.abbreviation, l.lap_number
+"""
+
+def get_clean_laps(session_id):
+    """Representative laps only (laps.flags = 0, see lap_flags.py), read through idx_laps_session_flags."""
+    return cached_read_sql(CLEAN_LAPS_QUERY, (session_id,), session_id=session_id)
+
+LAP_TELEMETRY_QUERY = """
+SELECT distance, speed, throttle, brake, gear
+FROM telemetry
+WHERE session_id = %s
+  AND driver_id = %s
+  AND lap_number = %s
+ORDER BY distance
+"""
+
+def get_lap_telemetry(session_id, driver_id, lap_number):
+    """Telemetry of one lap ordered by distance."""
+    return cached_read_sql(LAP_TELEMETRY_QUERY, (session_id, driver_id, lap_number), session_id=session_id)
+
+LAP_STATS_QUERY = """
+SELECT d.abbreviation, s.stint_number, s.tyre_compound, s.laps,
+       s.mean_lap_time, s.best_lap_time, s.std_lap_time
+FROM lap_stats s
+JOIN drivers d ON s.driver_id = d.driver_id
+WHERE s.session_id = %s
+ORDER BY d.abbreviation, s.stint_number
+"""
+
+def get_lap_stats(session_id):
+    """Per driver / stint / compound lap time statistics (lap_stats summary table)."""
+    return cached_read_sql(LAP_STATS_QUERY, (session_id,), session_id=session_id)
+
+SECTOR_STATS_QUERY = """
+SELECT d.abbreviation, s.laps,
+       s.mean_sector1 AS sector1_time,
+       s.mean_sector2 AS sector2_time,
+       s.mean_sector3 AS sector3_time,
+       s.best_sector1, s.best_sector2, s.best_sector3
+FROM sector_stats s
+JOIN drivers d ON s.driver_id = d.driver_id
+WHERE s.session_id = %s
+"""
+
+def get_sector_stats(session_id):
+    """Mean and best sector times per driver over non-pit laps (sector_stats summary table)."""
+    return cached_read_sql(SECTOR_STATS_QUERY, (session_id,), session_id=session_id)
+
+RACE_POSITIONS_QUERY = """
+SELECT d.abbreviation, d.full_name, p.lap_number, p.race_time,
+       p.position, p.gap_to_leader, p.interval_ahead
+FROM race_positions p
+JOIN drivers d ON p.driver_id = d.driver_id
+WHERE p.session_id = %s
+ORDER BY p.lap_number, p.position
+"""
+
+def get_race_positions(session_id):
+    """Position, gap to leader and interval to the car ahead after every lap (race_positions table)."""
+    return cached_read_sql(RACE_POSITIONS_QUERY, (session_id,), session_id=session_id)
+
+SESSION_DRIVERS_QUERY = """
+SELECT DISTINCT d.driver_id, d.abbreviation, d.full_name
+FROM laps l
+JOIN drivers d ON l.driver_id = d.driver_id
+WHERE l.session_id = %s
+ORDER BY d.abbreviation
+"""
+
+def get_session_drivers(session_id):
+    """Drivers with at least one lap in the session, with their ids."""
+    return cached_read_sql(SESSION_DRIVERS_QUERY, (session_id,), session_id=session_id)
+
+STINT_DEGRADATION_QUERY = """
+SELECT d.abbreviation, d.full_name, g.stint_number, g.tyre_compound, g.laps,
+       g.first_lap, g.last_lap, g.base_lap_time, g.deg_per_lap, g.r_squared, g.residual_std
+FROM stint_degradation g
+JOIN drivers d ON g.driver_id = d.driver_id
+WHERE g.session_id = %s
+ORDER BY d.abbreviation, g.stint_number
+"""
+
+def get_stint_degradation(session_id):
+    """Fuel-corrected degradation fit of every stint (stint_degradation summary table)."""
+    return cached_read_sql(STINT_DEGRADATION_QUERY, (session_id,), session_id=session_id)
+
+SEASON_DEGRADATION_QUERY = """
+SELECT s.session_id, s.grand_prix, g.tyre_compound,
+       COUNT(*) AS stints, SUM(g.laps) AS laps,
+       SUM(g.deg_per_lap * g.laps) / SUM(g.laps) AS deg_per_lap
+FROM stint_degradation g
+JOIN sessions s ON s.session_id = g.session_id
+WHERE s.year = %s
+GROUP BY s.session_id, s.grand_prix, g.tyre_compound
+ORDER BY s.session_id, g.tyre_compound
+"""
+
+def get_season_degradation(year):
+    """Lap-weighted mean degradation per race and compound over a season."""
+    # not cached: spans many sessions, any of which may be re-ingested
+    with db_connection() as conn:
+        return pd.read_sql(SEASON_DEGRADATION_QUERY, conn, params=(year,))
@@ -0,0 +1,187 @@
+import numpy as np
+
+from telemetry_mmap import get_telemetry_cache
+
+# ===============================
+# Configuration
+# ===============================
+GRID_STEP = 5.0  # metres between resampled points
+# Laps ending at least this fraction of the median lap distance count as
+# complete; the common grid ends where the shortest complete lap ends
+COMPLETE_LAP_FRACTION = 0.98
+COLUMNS = ("time", "speed", "throttle", "brake", "gear")
+
+
+# ===============================
+# Resampling
+# ===============================
+class ResampledLaps:
+    """
+    Laps on one common distance grid: values[column] is a (laps, grid)
+    array, row i belonging to keys[i] = (driver_id, lap_number). Grid points
+    outside the distance a lap covers are NaN; "time" is elapsed lap time.
+    """
+
+    __slots__ = ("keys", "grid", "values", "_rows")
+
+    def __init__(self, keys, grid, values):
+        self.keys = list(keys)
+        self.grid = grid
+        self.values = values
+        self._rows = {key: i for i, key in enumerate(self.keys)}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def row(self, driver_id, lap_number):
+        return self._rows[(driver_id, lap_number)]
+
+    def trace(self, driver_id, lap_number, column="speed"):
+        return self.values[column][self.row(driver_id, lap_number)]
+
+    @property
+    def driver_ids(self):
+        return np.array([key[0] for key in self.keys])
+
+    @property
+    def lap_numbers(self):
+        return np.array([key[1] for key in self.keys])
+
+    def lap_times(self):
+        """Elapsed time at the end of the grid (NaN for laps that do not reach it)."""
+        return self.values["time"][:, -1]
+
+
+def resample(laps, grid, columns=COLUMNS):
+    """
+    Interpolate every lap onto grid with one np.interp call per column. Each
+    lap's distances are shifted by lap_index * span, which keeps the
+    concatenated x values increasing, so all laps are interpolated at once.
+    laps is a sequence of record arrays / DataFrames ordered by distance.
+    Returns {column: (len(laps), len(grid)) array}.
+    """
+    n, g = len(laps), len(grid)
+    distance = np.concatenate([np.asarray(lap["distance"], dtype=np.float64) for lap in laps])
+    lap_of = np.repeat(np.arange(n), [len(lap) for lap in laps])
+    data = {
+        column: np.concatenate([np.asarray(lap[column], dtype=np.float64) for lap in laps])
+        for column in columns
+    }
+
+    valid = ~np.isnan(distance)
+    distance, lap_of = distance[valid], lap_of[valid]
+    data = {column: values[valid] for column, values in data.items()}
+    counts = np.bincount(lap_of, minlength=n)
+    starts = np.cumsum(counts) - counts
+    has_samples = counts > 0
+    first = np.full(n, np.nan)
+    last = np.full(n, np.nan)
+    first[has_samples] = distance[starts[has_samples]]
+    last[has_samples] = distance[starts[has_samples] + counts[has_samples] - 1]
+    if "time" in data:
+        # elapsed time from the lap's first sample
+        data["time"] = data["time"] - np.repeat(data["time"][starts[has_samples]], counts[has_samples])
+
+    if not len(distance):
+        return {column: np.full((n, g), np.nan) for column in columns}
+    low = min(distance.min(), grid[0])
+    span = max(distance.max(), grid[-1]) - low + 1.0
+    offsets = np.arange(n) * span
+    x = distance - low + offsets[lap_of]
+    query = (grid[None, :] - low + offsets[:, None]).ravel()
+
+    outside = (grid[None, :] < first[:, None]) | (grid[None, :] > last[:, None]) | ~has_samples[:, None]
+    resampled = {}
+    for column, values in data.items():
+        out = np.interp(query, x, values).reshape(n, g)
+        out[outside] = np.nan
+        resampled[column] = out
+    return resampled
+
+
+def lap_grid(laps, step=GRID_STEP):
+    """
+    Distance grid every complete lap covers: it ends at the shortest end
+    distance among laps reaching COMPLETE_LAP_FRACTION of the median. Lap
+    distances differ by tens of metres, so ending at the median would leave
+    half of the complete laps without a time at the end of the grid.
+    """
+    ends = np.array([lap["distance"][-1] for lap in laps if len(lap)], dtype=np.float64)
+    ends = ends[~np.isnan(ends)]
+    if not len(ends):
+        return np.arange(0.0)
+    complete = ends[ends >= COMPLETE_LAP_FRACTION * np.median(ends)]
+    last = np.floor(complete.min() / step) * step
+    return np.arange(0.0, last + step / 2, step)
+
+
+def resample_session(session_id, keys=None, step=GRID_STEP, columns=COLUMNS):
+    """
+    Resample laps of a session (default: every lap with telemetry) from the
+    memory-mapped cache onto the grid of lap_grid().
+    """
+    cache = get_telemetry_cache(session_id)
+    keys = sorted(cache.laps) if keys is None else list(keys)
+    laps = [cache.lap(*key) for key in keys]
+    grid = lap_grid(laps, step)
+    return ResampledLaps(keys, grid, resample(laps, grid, columns))
+
+
+# ===============================
+# Comparisons
+# ===============================
+def fastest_laps(resampled):
+    """
+    {driver_id: lap_number} of each driver's quickest lap covering the whole
+    grid (every complete lap does, see lap_grid).
+    """
+    lap_times = resampled.lap_times()
+    drivers = resampled.driver_ids
+    fastest = {}
+    for driver_id in np.unique(drivers):
+        rows = np.flatnonzero((drivers == driver_id) & ~np.isnan(lap_times))
+        if len(rows):
+            fastest[int(driver_id)] = resampled.keys[rows[np.argmin(lap_times[rows])]][1]
+    return fastest
+
+
+def lap_delta(resampled, lap_a, lap_b):
+    """
+    Speed delta and cumulative time delta of lap_a against lap_b, both
+    (driver_id, lap_number). Positive time delta: lap_a is behind.
+    """
+    a, b = resampled.row(*lap_a), resampled.row(*lap_b)
+    speed = resampled.values["speed"]
+    time = resampled.values["time"]
+    return speed[a] - speed[b], time[a] - time[b]
+
+
+def head_to_head(resampled, driver_a, driver_b):
+    """
+    Speed and time deltas of driver_a against driver_b on every lap both
+    completed, computed as one array operation over all laps of the race.
+    Returns (lap_numbers, speed_delta, time_delta), deltas shaped (laps, grid).
+    """
+    drivers, laps = resampled.driver_ids, resampled.lap_numbers
+    laps_a = {int(n): i for i, n in zip(np.flatnonzero(drivers == driver_a), laps[drivers == driver_a])}
+    laps_b = {int(n): i for i, n in zip(np.flatnonzero(drivers == driver_b), laps[drivers == driver_b])}
+    common = sorted(laps_a.keys() & laps_b.keys())
+    rows_a = np.array([laps_a[n] for n in common], dtype=int)
+    rows_b = np.array([laps_b[n] for n in common], dtype=int)
+    speed = resampled.values["speed"]
+    time = resampled.values["time"]
+    return np.array(common), speed[rows_a] - speed[rows_b], time[rows_a] - time[rows_b]
+
+
+def grid_deltas(resampled, laps=None):
+    """
+    Pairwise time deltas between one lap per driver (default: each driver's
+    fastest) in a single broadcast. Returns (driver_ids, deltas) with
+    deltas[i, j] the time trace of driver i minus driver j, shaped
+    (drivers, drivers, grid).
+    """
+    laps = fastest_laps(resampled) if laps is None else laps
+    driver_ids = sorted(laps)
+    rows = [resampled.row(d, laps[d]) for d in driver_ids]
+    time = resampled.values["time"][rows]
+    return driver_ids, time[:, None, :] - time[None, :, :]
@@ -1,12 +1,12 @@
-import pandas as pd
 import matplotlib.pyplot as plt
-from db_conector import get_db_connection
+from df_Queries import get_session_laps
 
 # ===============================
 # Configuration
 # ===============================
 SESSION_ID = 1
 DRIVER_IDS = {"LEC": 1, "SAI": 4, "HAM": 5, "NOR": 3, "PIA": 2}
+EVENT = "2024 Italian GP"
 
 # Tire colors
 TIRE_COLORS = {
@@ -15,28 +15,17 @@ TIRE_COLORS = {
     "HARD": "#FFFFFF"  # white
 }
 
+
 # ===============================
 # Load laps
 # ===============================
-conn = get_db_connection()
-
-query = """
-        SELECT d.abbreviation AS driver, \
-               l.lap_number, \
-               l.lap_time, \
-               l.pit, \
-               l.tyre_compound
-        FROM laps l
-                 JOIN drivers d ON l.driver_id = d.driver_id
-        WHERE l.session_id = %s
-        ORDER BY d.abbreviation, l.lap_number \
-        """
-
-df = pd.read_sql(query, conn, params=(SESSION_ID,))
-conn.close()
-
-df = df.dropna(subset=["lap_time"])
-df["tyre_compound"] = df["tyre_compound"].str.strip().str.upper()  # normalize tire names
+def prepare_laps(laps):
+    """Timed laps with normalized tyre names, from get_session_laps()."""
+    df = laps.rename(columns={"abbreviation": "driver"})
+    df = df[["driver", "lap_number", "lap_time", "pit", "tyre_compound"]]
+    df = df.dropna(subset=["lap_time"]).copy()
+    df["tyre_compound"] = df["tyre_compound"].str.strip().str.upper()  # normalize tire names
+    return df
 
 
 # ===============================
@@ -51,7 +40,7 @@ def format_lap_time(seconds):
 # ===============================
 # Plot per driver
 # ===============================
-for driver, driver_id in DRIVER_IDS.items():
+def plot_driver_laps(df, driver, event=EVENT):
     d = df[df["driver"] == driver].copy()
 
     fig, ax = plt.subplots(figsize=(12, 5))
@@ -79,7 +68,7 @@ for driver, driver_id in DRIVER_IDS.items():
     # Axes & labels
     ax.set_xlabel("Lap Number", color="white")
     ax.set_ylabel("Lap Time (min:sec.ms)", color="white")
-    ax.set_title(f"{driver} – Lap Time Progression\n2024 Italian GP", color="white")
+    ax.set_title(f"{driver} – Lap Time Progression\n{event}", color="white")
 
     # Set tick labels to white
     ax.tick_params(axis='x', colors='white')
@@ -87,11 +76,23 @@ for driver, driver_id in DRIVER_IDS.items():
 
     # Convert y-axis to min:sec.ms format
     yticks = ax.get_yticks()
+    ax.set_yticks(yticks)
     ax.set_yticklabels([format_lap_time(y) for y in yticks], color='white')
 
     # Optional: grid in white
     ax.grid(alpha=0.3, color="white")
 
     ax.legend(facecolor='black', edgecolor='white', labelcolor='white')  # legend matches black bg
-    plt.tight_layout()
-    plt.show()
+    fig.tight_layout()
+    return fig
+
+
+def main():
+    df = prepare_laps(get_session_laps(SESSION_ID))
+    for driver in DRIVER_IDS:
+        plot_driver_laps(df, driver)
+        plt.show()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import glob
+import os
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+# ===============================
+# Configuration
+# ===============================
+# Same location as Database/parquet_writer.py
+PARQUET_ROOT = os.environ.get(
+    "F1_PARQUET_ROOT",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Database", "parquet")
+)
+
+# Columns returned by df_Queries.get_telemetry, mapped to the Parquet column names
+TELEMETRY_COLUMNS = {
+    "abbreviation": "driver",
+    "speed": "speed",
+    "throttle": "throttle",
+    "brake": "brake",
+    "nGear": "gear",
+    "rpm": "rpm",
+    "lap_time": "lap_time",
+}
+
+DRIVER_PARTITIONING = ds.partitioning(pa.schema([("driver", pa.string())]), flavor="hive")
+
+
+def session_dataset(session_id, year=None, root=PARQUET_ROOT):
+    """
+    Dataset of one session's telemetry. Only the session's directory is
+    listed, so other seasons and sessions are pruned before any file is opened.
+    """
+    season = year if year is not None else "*"
+    paths = glob.glob(os.path.join(root, f"season={season}", f"session_id={session_id}"))
+    if not paths:
+        raise FileNotFoundError(f"No Parquet telemetry for session {session_id} under {root}")
+    return ds.dataset(paths[0], format="parquet", partitioning=DRIVER_PARTITIONING)
+
+
+def get_telemetry(session_id, columns=None, drivers=None, laps=None, include_pit=False, year=None):
+    """
+    Parquet equivalent of df_Queries.get_telemetry: telemetry of the non-pit
+    laps of a session. columns selects a subset of the output columns (column
+    projection), drivers / laps restrict the partitions and row groups read.
+    """
+    columns = list(columns or TELEMETRY_COLUMNS)
+    dataset = session_dataset(session_id, year)
+
+    condition = None
+    if drivers:
+        condition = ds.field("driver").isin(list(drivers))
+    if laps:
+        lap_filter = ds.field("lap_number").isin(list(laps))
+        condition = lap_filter if condition is None else condition & lap_filter
+    if not include_pit:
+        pit_filter = ds.field("pit") == False  # noqa: E712 (Arrow expression)
+        condition = pit_filter if condition is None else condition & pit_filter
+
+    source_columns = [TELEMETRY_COLUMNS.get(c, c) for c in columns]
+    table = dataset.to_table(columns=source_columns, filter=condition)
+    df = table.to_pandas()
+    df.columns = columns
+    return df
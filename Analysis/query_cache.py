@@ -0,0 +1,199 @@
+import hashlib
+import importlib.util
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+import common_path  # noqa: F401  (common/ on sys.path)
+from db_conector import db_connection
+from instrumentation import sql_timer
+
+# ===============================
+# Configuration
+# ===============================
+CACHE_DIR = os.environ.get(
+    "F1_QUERY_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".query_cache")
+)
+MEMORY_LIMIT_BYTES = int(os.environ.get("F1_QUERY_CACHE_MEMORY_MB", "256")) * 1024 ** 2
+DISK_LIMIT_BYTES = int(os.environ.get("F1_QUERY_CACHE_DISK_MB", "2048")) * 1024 ** 2
+# Offline: trust the last session versions seen instead of asking the database
+OFFLINE = os.environ.get("F1_QUERY_CACHE_OFFLINE") == "1"
+# Seconds a looked-up session version is trusted before session_versions is read
+# again (one primary key lookup); a re-ingest is seen at most this late
+VERSION_TTL = float(os.environ.get("F1_QUERY_CACHE_VERSION_TTL", "2"))
+
+VERSIONS_FILE = os.path.join(CACHE_DIR, "versions.json")
+DISK_ENABLED = importlib.util.find_spec("pyarrow") is not None  # Feather needs pyarrow
+
+_memory = OrderedDict()  # key -> (DataFrame, size in bytes)
+_memory_bytes = 0
+_versions = {}           # session_id -> (version, monotonic time it was read)
+_lock = threading.RLock()  # the async query layer calls in from worker threads
+
+
+# ===============================
+# Session versions
+# ===============================
+def _load_versions_file():
+    try:
+        with open(VERSIONS_FILE) as f:
+            return {int(k): v for k, v in json.load(f).items()}
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_versions_file(versions):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(VERSIONS_FILE, "w") as f:
+        json.dump({str(k): v for k, v in versions.items()}, f)
+
+
+def session_version(session_id):
+    """
+    Version of a session's data, bumped by the ingestion pipeline on every
+    reload. It is part of every cache key, so a reload invalidates old entries.
+    Versions are re-read from the database after VERSION_TTL seconds, so
+    long-running processes pick up re-ingested sessions.
+    """
+    with _lock:
+        cached = _versions.get(session_id)
+    if cached is not None and time.monotonic() - cached[1] < VERSION_TTL:
+        return cached[0]
+
+    known = _load_versions_file()
+    if OFFLINE:
+        version = known.get(session_id, 0)
+    else:
+        from mysql.connector import Error
+
+        try:
+            with db_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT version FROM session_versions WHERE session_id = %s", (session_id,))
+                row = cursor.fetchone()
+                cursor.close()
+            version = row[0] if row else 0
+        except Error:
+            version = 0  # no session_versions table yet
+        with _lock:
+            known = _load_versions_file()
+            if known.get(session_id) != version:
+                known[session_id] = version
+                _save_versions_file(known)
+
+    with _lock:
+        _versions[session_id] = (version, time.monotonic())
+    return version
+
+
+# ===============================
+# Cache tiers
+# ===============================
+def cache_key(query, params, version):
+    text = json.dumps([" ".join(query.split()), [str(p) for p in params], version])
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+def _remember(key, df):
+    global _memory_bytes
+    size = int(df.memory_usage(deep=True).sum())
+    if size > MEMORY_LIMIT_BYTES:
+        return
+    with _lock:
+        if key in _memory:
+            _memory_bytes -= _memory.pop(key)[1]
+        _memory[key] = (df, size)
+        _memory_bytes += size
+        while _memory_bytes > MEMORY_LIMIT_BYTES:
+            _, (_, evicted) = _memory.popitem(last=False)
+            _memory_bytes -= evicted
+
+
+def _disk_path(key):
+    return os.path.join(CACHE_DIR, f"{key}.feather")
+
+
+def _evict_disk():
+    """Remove the least recently used files until the disk cache fits its budget."""
+    entries = [
+        (os.stat(path).st_mtime, os.path.getsize(path), path)
+        for path in (os.path.join(CACHE_DIR, name) for name in os.listdir(CACHE_DIR))
+        if path.endswith(".feather")
+    ]
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= DISK_LIMIT_BYTES:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass  # evicted by another thread or process
+        total -= size
+
+
+def _read_disk(key):
+    path = _disk_path(key)
+    if not DISK_ENABLED or not os.path.exists(path):
+        return None
+    os.utime(path)  # mark as recently used for eviction
+    return pd.read_feather(path)
+
+
+def _write_disk(key, df):
+    if not DISK_ENABLED:
+        return
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    # write then rename, so a concurrent reader never sees a partial file
+    tmp = f"{_disk_path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+    df.reset_index(drop=True).to_feather(tmp)
+    os.replace(tmp, _disk_path(key))
+    with _lock:
+        _evict_disk()
+
+
+# ===============================
+# Public API
+# ===============================
+def cached_read_sql(query, params=(), session_id=None):
+    """
+    pd.read_sql through an in-process LRU and an on-disk Feather cache. Pass
+    the session_id the query depends on so that a re-ingest invalidates it.
+    A copy is returned, callers are free to modify it.
+    """
+    params = tuple(params)
+    version = session_version(session_id) if session_id is not None else 0
+    key = cache_key(query, params, version)
+
+    with _lock:
+        cached = _memory.get(key)
+        if cached is not None:
+            _memory.move_to_end(key)
+    if cached is not None:
+        return cached[0].copy()
+
+    df = _read_disk(key)
+    if df is None:
+        with db_connection() as conn:
+            with sql_timer(query):
+                df = pd.read_sql(query, conn, params=params)
+        _write_disk(key, df)
+
+    _remember(key, df)
+    return df.copy()
+
+
+def clear_cache(disk=True):
+    """Drop every cached result (memory and, optionally, disk)."""
+    global _memory_bytes
+    with _lock:
+        _memory.clear()
+        _versions.clear()
+        _memory_bytes = 0
+    if disk and os.path.isdir(CACHE_DIR):
+        for name in os.listdir(CACHE_DIR):
+            os.remove(os.path.join(CACHE_DIR, name))
@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+
+from df_Queries import get_race_positions
+from telemetry_stream import stream_telemetry
+
+# ===============================
+# Configuration
+# ===============================
+TIME_STEP = 1.0  # seconds between timeline points
+
+PROGRESS_COLUMNS = ["abbreviation", "race_time", "progress"]
+TIMELINE_COLUMNS = ["time", "abbreviation", "position", "gap_to_leader", "interval_ahead"]
+
+
+# ===============================
+# Race progress from telemetry
+# ===============================
+def race_progress(session_id, positions=None):
+    """
+    Telemetry samples of a race as (abbreviation, race_time, progress), where
+    progress is completed laps plus the fraction of the current lap by
+    distance. Each lap starts at the race_time its previous lap ended
+    (race_positions), so laps of different drivers share one clock. Empty
+    when the session has no race positions or no telemetry.
+    """
+    if positions is None:
+        positions = get_race_positions(session_id)
+    if positions.empty:
+        return pd.DataFrame(columns=PROGRESS_COLUMNS)
+    ends = positions.sort_values(["abbreviation", "lap_number"])
+    starts = ends[["abbreviation", "lap_number"]].assign(
+        lap_start=ends.groupby("abbreviation")["race_time"].shift(fill_value=0.0)
+    )
+
+    chunks = list(stream_telemetry(session_id, columns=("time", "distance"), include_pit=True))
+    if not chunks:
+        return pd.DataFrame(columns=PROGRESS_COLUMNS)
+    samples = pd.concat(chunks, ignore_index=True)
+    samples = samples.merge(starts, on=["abbreviation", "lap_number"])  # completed laps only
+    if samples.empty:
+        return pd.DataFrame(columns=PROGRESS_COLUMNS)
+    lap_length = samples.groupby(["abbreviation", "lap_number"])["distance"].max().median()
+
+    fraction = np.clip(samples["distance"].to_numpy() / lap_length, 0.0, 1.0)
+    return pd.DataFrame({
+        "abbreviation": samples["abbreviation"],
+        "race_time": samples["lap_start"].to_numpy() + samples["time"].to_numpy(),
+        "progress": samples["lap_number"].to_numpy() - 1 + fraction,
+    })
+
+
+# ===============================
+# Timeline on a time grid
+# ===============================
+def timeline_at(progress, grid):
+    """
+    Position, gap to the leader and interval to the car ahead of every
+    driver at every time of grid. Progress is interpolated onto the grid
+    (drivers x times), one argsort per column gives the running order, and a
+    gap is how long ago the car in question's current progress was reached
+    by the leader / the car ahead.
+    """
+    drivers = sorted(progress["abbreviation"].unique())
+    curves = []
+    for driver in drivers:
+        d = progress[progress["abbreviation"] == driver].sort_values("race_time")
+        t = d["race_time"].to_numpy()
+        p = np.maximum.accumulate(d["progress"].to_numpy())  # noisy distance never runs backwards
+        curves.append((t, p))
+
+    # progress[d, i] at grid[i]; NaN before a driver's first sample, frozen after the last
+    at = np.array([np.interp(grid, t, p, left=np.nan, right=p[-1]) for t, p in curves])
+    running = ~np.isnan(at)
+
+    order = np.argsort(np.where(running, -at, np.inf), axis=0, kind="stable")
+    columns = np.arange(len(grid))
+    position = np.empty_like(order)
+    position[order, columns] = np.arange(1, len(drivers) + 1)[:, None]
+
+    # reached[j, d, i]: when driver j reached driver d's progress at grid[i]
+    reached = np.array([np.interp(at, p, t, left=np.nan, right=np.nan) for t, p in curves])
+    leader = order[0]
+    ahead = order[np.maximum(position - 2, 0), columns]
+    driver_index = np.arange(len(drivers))[:, None]
+    gap = grid - reached[leader[None, :], driver_index, columns]
+    interval = grid - reached[ahead, driver_index, columns]
+    gap[position == 1] = np.nan
+    interval[position == 1] = np.nan
+
+    frame = pd.DataFrame({
+        "time": np.tile(grid, len(drivers)),
+        "abbreviation": np.repeat(drivers, len(grid)),
+        "position": position.ravel(),
+        "gap_to_leader": gap.ravel(),
+        "interval_ahead": interval.ravel(),
+    })
+    return frame[running.ravel()].reset_index(drop=True)
+
+
+def race_timeline(session_id, step=TIME_STEP):
+    """Timeline of a race every step seconds, reconstructed from its telemetry."""
+    progress = race_progress(session_id)
+    if progress.empty:
+        return pd.DataFrame(columns=TIMELINE_COLUMNS)
+    grid = np.arange(0.0, progress["race_time"].max(), step)
+    return timeline_at(progress, grid)
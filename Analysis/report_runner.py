@@ -0,0 +1,205 @@
+import argparse
+import html
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import matplotlib
+
+matplotlib.use("Agg")  # headless: never open a window
+
+import Best_driver
+import common_path  # noqa: F401  (common/ on sys.path)
+import instrumentation
+import Sector_time_analysis
+import consistency_is_key
+import lap_time_analysis
+import telemetry_analysis
+import pandas as pd
+
+from db_conector import db_connection
+from df_Queries import get_lap_stats, get_race_positions, get_sector_stats, get_session_laps, get_stint_degradation
+
+# ===============================
+# Configuration
+# ===============================
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reports")
+DPI = 120
+
+
+# ===============================
+# Rendering (runs in the worker processes)
+# ===============================
+def _init_worker():
+    matplotlib.use("Agg")
+
+
+def render_figure(func, args, kwargs, path, fmt):
+    """Build one figure, save it and free it. Returns the file path."""
+    import matplotlib.pyplot as plt
+    fig = func(*args, **kwargs)
+    fig.savefig(path, format=fmt, dpi=DPI)
+    plt.close(fig)
+    return path
+
+
+# ===============================
+# Report contents
+# ===============================
+def get_sessions(session_ids=None, year=None):
+    query = "SELECT session_id, year, grand_prix, session_type FROM sessions"
+    params = ()
+    if session_ids:
+        query += f" WHERE session_id IN ({', '.join(['%s'] * len(session_ids))})"
+        params = tuple(session_ids)
+    elif year is not None:
+        query += " WHERE year = %s"
+        params = (year,)
+    # not cached: the list changes whenever a new session is ingested
+    with db_connection() as conn:
+        return pd.read_sql(query + " ORDER BY session_id", conn, params=params)
+
+
+def figure_tasks(session, laps, lap_telemetry=None):
+    """
+    (title, func, args, kwargs) for every figure of one session. The laps
+    DataFrame is loaded once and each analysis derives its own view from it;
+    stint pace and sector figures read the summary tables and the cumulative race time
+    figure reads race_positions.
+    lap_telemetry is an optional (telemetry, driver label, lap_number).
+    """
+    session_id = int(session["session_id"])
+    event = f"{session['year']} {session['grand_prix']} ({session['session_type']})"
+    tasks = []
+
+    lap_df = lap_time_analysis.prepare_laps(laps)
+    for driver in sorted(lap_df["driver"].unique()):
+        tasks.append((f"{driver} lap times", lap_time_analysis.plot_driver_laps,
+                      (lap_df[lap_df["driver"] == driver], driver), {"event": event}))
+
+    battle = Best_driver.prepare_laps(laps)
+    if battle["driver"].nunique() == len(Best_driver.DRIVERS):
+        tasks.append(("Strategy battle", Best_driver.plot_strategy, (battle,), {"event": event}))
+        race = Best_driver.prepare_cumulative(get_race_positions(session_id))
+        if not race.empty:
+            tasks.append(("Cumulative race time", Best_driver.plot_cumulative_time, (race,), {"event": event}))
+            tasks.append(("Gap to leader", Best_driver.plot_gaps, (race,), {"event": event}))
+        degradation = get_stint_degradation(session_id)
+        if not degradation.empty:
+            tasks.append(("Tyre degradation", Best_driver.plot_degradation, (degradation,), {"event": event}))
+        stint_stats = get_lap_stats(session_id)
+        if not stint_stats.empty:
+            tasks.append(("Stint pace", Best_driver.plot_stint_pace, (stint_stats,), {"event": event}))
+
+    sectors = Sector_time_analysis.prepare_sectors(get_sector_stats(session_id))
+    if not sectors.empty:
+        tasks.append(("Sector gaps", Sector_time_analysis.plot_sector_gaps,
+                      (Sector_time_analysis.sector_gaps(sectors),), {"event": event}))
+
+    consistency = consistency_is_key.prepare_laps(laps)
+    if not consistency.empty:
+        tasks.append(("Lap time distribution", consistency_is_key.plot_distribution,
+                      (consistency,), {"event": event}))
+
+    race_corr = telemetry_analysis.race_correlation_matrix(session_id)
+    if not race_corr.isna().all().all():
+        tasks.append(("Race telemetry correlation", telemetry_analysis.plot_correlation,
+                      (race_corr,), {"driver": "All drivers", "scope": "Whole Race"}))
+
+    telemetry, driver, lap_number = lap_telemetry or (None, None, None)
+    if telemetry is not None and not telemetry.empty:
+        lap_kwargs = {"driver": driver, "lap_number": lap_number, "event": event}
+        for var, cmap, label in telemetry_analysis.TRACK_MAPS:
+            tasks.append((f"{label} map", telemetry_analysis.plot_telemetry,
+                          (telemetry, var, cmap, label), lap_kwargs))
+        tasks.append(("Telemetry trace", telemetry_analysis.plot_telemetry_trace, (telemetry,), lap_kwargs))
+        tasks.append(("Telemetry correlation", telemetry_analysis.plot_correlation,
+                      (telemetry_analysis.correlation_matrix(telemetry),),
+                      {"driver": lap_kwargs["driver"]}))
+    return tasks
+
+
+def write_index(out_dir, title, figures):
+    """index.html listing the session's figures in order."""
+    items = "\n".join(
+        f'<figure><img src="{html.escape(os.path.basename(path))}" alt="{html.escape(name)}">'
+        f"<figcaption>{html.escape(name)}</figcaption></figure>"
+        for name, path in figures
+    )
+    with open(os.path.join(out_dir, "index.html"), "w", encoding="utf-8") as f:
+        f.write(
+            f"<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>{html.escape(title)}</title>"
+            "<style>img{max-width:100%}figure{margin:2em 0}</style></head>\n"
+            f"<body><h1>{html.escape(title)}</h1>\n{items}\n</body></html>\n"
+        )
+
+
+def slug(text):
+    return "".join(c if c.isalnum() else "_" for c in text).strip("_").lower()
+
+
+# ===============================
+# Runner
+# ===============================
+def run_reports(sessions, out_root=OUTPUT_DIR, fmt="png", workers=None, telemetry_lap=None,
+                track_id=telemetry_analysis.TRACK_ID):
+    """
+    Render every figure of every session in a process pool (one figure per
+    task) and write one index.html per session. telemetry_lap = (driver_id,
+    lap_number) adds the single-lap telemetry figures.
+    """
+    pending = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        for _, session in sessions.iterrows():
+            session_id = int(session["session_id"])
+            out_dir = os.path.join(out_root, f"session_{session_id}")
+            os.makedirs(out_dir, exist_ok=True)
+
+            lap_telemetry = None
+            if telemetry_lap is not None:
+                driver_id, lap_number = telemetry_lap
+                telemetry = telemetry_analysis.load_lap(session_id, driver_id, lap_number, track_id)
+                lap_telemetry = (telemetry, f"Driver {driver_id}", lap_number)
+
+            with instrumentation.stage("report_data") as record:
+                tasks = figure_tasks(session, get_session_laps(session_id), lap_telemetry)
+                record.rows = len(tasks)
+            title = f"{session['year']} {session['grand_prix']} – {session['session_type']}"
+            figures = pending.setdefault(session_id, (out_dir, title, {}))[2]
+            for i, (name, func, args, kwargs) in enumerate(tasks):
+                path = os.path.join(out_dir, f"{i:02d}_{slug(name)}.{fmt}")
+                future = pool.submit(render_figure, func, args, kwargs, path, fmt)
+                figures[future] = (i, name)
+
+        for session_id, (out_dir, title, figures) in pending.items():
+            rendered = []
+            with instrumentation.stage("report_render") as record:
+                for future in as_completed(figures):
+                    i, name = figures[future]
+                    rendered.append((i, name, future.result()))
+                record.rows = len(rendered)
+            write_index(out_dir, title, [(name, path) for _, name, path in sorted(rendered)])
+            print(f"Session {session_id}: {len(rendered)} figures -> {out_dir}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Render analysis figures to files without a display.")
+    parser.add_argument("--sessions", type=int, nargs="+", help="session ids (default: all)")
+    parser.add_argument("--year", type=int, help="every session of a season")
+    parser.add_argument("--out", default=OUTPUT_DIR)
+    parser.add_argument("--format", choices=("png", "svg"), default="png")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--telemetry-lap", type=int, nargs=2, metavar=("DRIVER_ID", "LAP"),
+                        help="also render single-lap telemetry figures")
+    parser.add_argument("--track-id", type=int, default=telemetry_analysis.TRACK_ID)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    with instrumentation.run("reports"):
+        sessions = get_sessions(args.sessions, args.year)
+        run_reports(sessions, args.out, args.format, args.workers, args.telemetry_lap, args.track_id)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+import numpy as np
+import pandas as pd
+
+from df_Queries import get_session_laps
+import common_path  # noqa: F401  (common/ on sys.path)
+from lap_flags import CLEAN
+from query_cache import cached_read_sql
+from telemetry_stream import stream_telemetry
+
+# ===============================
+# Configuration
+# ===============================
+# Smallest dtypes that hold the data. Integer columns cannot hold NaN, missing
+# samples become 0.
+TELEMETRY_DTYPES = {
+    "distance": np.float32,
+    "speed": np.float32,
+    "throttle": np.uint8,
+    "brake": np.uint8,
+    "gear": np.uint8,
+    "rpm": np.uint16,
+}
+
+MISSING = -1  # categorical code of a missing value
+
+# Per-lap arrays of a LapTable
+LAP_ARRAYS = ("driver", "lap_number", "lap_time", "sector1_time", "sector2_time", "sector3_time",
+              "pit", "compound", "stint_number", "track_status", "flags")
+
+
+# ===============================
+# Categorical codes
+# ===============================
+def encode(values):
+    """(int8 codes, sorted categories) for a column of labels; missing -> MISSING."""
+    codes, categories = pd.factorize(pd.Series(values, dtype=object), sort=True)
+    return codes.astype(np.int8), tuple(categories)
+
+
+def codes_for(values, categories):
+    """int8 codes of values in an existing category list (unknown -> MISSING)."""
+    return pd.Categorical(values, categories=list(categories)).codes.astype(np.int8)
+
+
+def categorical(codes, categories):
+    return pd.Categorical.from_codes(codes, categories=list(categories))
+
+
+def _integer(values, dtype):
+    values = np.asarray(values, dtype=np.float64)
+    return np.nan_to_num(values, nan=0.0).astype(dtype)
+
+
+# ===============================
+# Metadata records
+# ===============================
+class SessionInfo:
+    __slots__ = ("session_id", "year", "grand_prix", "session_type")
+
+    def __init__(self, session_id, year, grand_prix, session_type):
+        self.session_id = session_id
+        self.year = year
+        self.grand_prix = grand_prix
+        self.session_type = session_type
+
+    def __repr__(self):
+        return f"SessionInfo({self.session_id}, {self.year} {self.grand_prix} {self.session_type})"
+
+
+class Driver:
+    __slots__ = ("code", "abbreviation", "full_name")
+
+    def __init__(self, code, abbreviation, full_name):
+        self.code = code
+        self.abbreviation = abbreviation
+        self.full_name = full_name
+
+    def __repr__(self):
+        return f"Driver({self.code}, {self.abbreviation})"
+
+
+class Stint:
+    __slots__ = ("driver", "stint_number", "compound", "first_lap", "last_lap", "laps")
+
+    def __init__(self, driver, stint_number, compound, first_lap, last_lap, laps):
+        self.driver = driver
+        self.stint_number = stint_number
+        self.compound = compound
+        self.first_lap = first_lap
+        self.last_lap = last_lap
+        self.laps = laps
+
+    def __repr__(self):
+        return (f"Stint({self.driver} #{self.stint_number} {self.compound}, "
+                f"laps {self.first_lap}-{self.last_lap})")
+
+
+# ===============================
+# Column tables
+# ===============================
+class LapTable:
+    """Laps of one session as typed arrays, one element per lap."""
+
+    __slots__ = LAP_ARRAYS + ("drivers", "compounds", "track_statuses")
+
+    def __init__(self, df, drivers):
+        self.drivers = tuple(drivers)
+        self.driver = codes_for(df["abbreviation"], self.drivers)
+        self.lap_number = _integer(df["lap_number"], np.uint16)
+        for name in ("lap_time", "sector1_time", "sector2_time", "sector3_time"):
+            setattr(self, name, df[name].to_numpy(dtype=np.float32, na_value=np.nan))
+        self.pit = df["pit"].fillna(0).to_numpy(dtype=bool)
+        self.compound, self.compounds = encode(df["tyre_compound"].str.strip().str.upper())
+        self.stint_number = _integer(df["stint_number"], np.uint8)  # 0 = unknown
+        self.track_status, self.track_statuses = encode(df["track_status"])
+        self.flags = _integer(df["flags"], np.uint16)  # lap_flags.py bits
+
+    def __len__(self):
+        return len(self.lap_number)
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in LAP_ARRAYS)
+
+    def to_frame(self):
+        """DataFrame view; numeric arrays are passed with copy=False."""
+        return pd.DataFrame({
+            "abbreviation": categorical(self.driver, self.drivers),
+            "lap_number": self.lap_number,
+            "lap_time": self.lap_time,
+            "sector1_time": self.sector1_time,
+            "sector2_time": self.sector2_time,
+            "sector3_time": self.sector3_time,
+            "pit": self.pit,
+            "tyre_compound": categorical(self.compound, self.compounds),
+            "stint_number": self.stint_number,
+            "track_status": categorical(self.track_status, self.track_statuses),
+            "flags": self.flags,
+        }, copy=False)
+
+    def clean(self):
+        """Boolean mask of the representative laps (no lap_flags.py bit set)."""
+        return self.flags == CLEAN
+
+    def stints(self):
+        """Stint records, from the rows where driver or stint number changes."""
+        order = np.lexsort((self.lap_number, self.stint_number, self.driver))
+        driver = self.driver[order]
+        stint = self.stint_number[order]
+        change = np.ones(len(order), dtype=bool)
+        change[1:] = (driver[1:] != driver[:-1]) | (stint[1:] != stint[:-1])
+        starts = np.flatnonzero(change)
+        ends = np.append(starts[1:], len(order)) - 1
+
+        laps = self.lap_number[order]
+        compound = self.compound[order]
+        return [
+            Stint(
+                self.drivers[driver[s]],
+                int(stint[s]),
+                self.compounds[compound[s]] if compound[s] != MISSING else None,
+                int(laps[s]),
+                int(laps[e]),
+                int(e - s + 1),
+            )
+            for s, e in zip(starts, ends)
+        ]
+
+
+class TelemetryTable:
+    """Telemetry samples of one session as typed arrays, contiguous per lap."""
+
+    __slots__ = ("driver", "lap_number", "columns", "drivers", "_lap_index")
+
+    def __init__(self, driver, lap_number, columns, drivers):
+        self.driver = driver
+        self.lap_number = lap_number
+        self.columns = columns
+        self.drivers = tuple(drivers)
+        self._lap_index = None
+
+    def __len__(self):
+        return len(self.lap_number)
+
+    @property
+    def nbytes(self):
+        return self.driver.nbytes + self.lap_number.nbytes + sum(a.nbytes for a in self.columns.values())
+
+    def lap_slices(self):
+        """{(driver code, lap_number): slice} of every lap, built once."""
+        if self._lap_index is None:
+            change = np.ones(len(self), dtype=bool)
+            change[1:] = (self.driver[1:] != self.driver[:-1]) | (self.lap_number[1:] != self.lap_number[:-1])
+            starts = np.flatnonzero(change)
+            ends = np.append(starts[1:], len(self))
+            self._lap_index = {
+                (int(self.driver[s]), int(self.lap_number[s])): slice(s, e)
+                for s, e in zip(starts, ends)
+            }
+        return self._lap_index
+
+    def lap(self, abbreviation, lap_number):
+        """One lap as a DataFrame over views of the arrays (no copy of the samples)."""
+        rows = self.lap_slices().get((self.drivers.index(abbreviation), lap_number))
+        if rows is None:
+            raise KeyError(f"No telemetry for {abbreviation} lap {lap_number}")
+        return pd.DataFrame({name: values[rows] for name, values in self.columns.items()}, copy=False)
+
+    def to_frame(self):
+        frame = {
+            "abbreviation": categorical(self.driver, self.drivers),
+            "lap_number": self.lap_number,
+        }
+        frame.update(self.columns)
+        return pd.DataFrame(frame, copy=False)
+
+
+class SessionData:
+    """A session held in memory: metadata records plus lap and telemetry arrays."""
+
+    __slots__ = ("info", "drivers", "laps", "telemetry")
+
+    def __init__(self, info, drivers, laps, telemetry=None):
+        self.info = info
+        self.drivers = drivers
+        self.laps = laps
+        self.telemetry = telemetry
+
+    def driver(self, abbreviation):
+        return next(d for d in self.drivers if d.abbreviation == abbreviation)
+
+    @property
+    def nbytes(self):
+        return self.laps.nbytes + (self.telemetry.nbytes if self.telemetry is not None else 0)
+
+    def __repr__(self):
+        samples = len(self.telemetry) if self.telemetry is not None else 0
+        return (f"SessionData({self.info!r}, {len(self.drivers)} drivers, {len(self.laps)} laps, "
+                f"{samples} samples, {self.nbytes / 1024 ** 2:.1f} MB)")
+
+
+# ===============================
+# Loading
+# ===============================
+def _telemetry_arrays(df, drivers):
+    driver = codes_for(df["abbreviation"], drivers)
+    lap_number = _integer(df["lap_number"], np.uint16)
+    columns = {}
+    for name, dtype in TELEMETRY_DTYPES.items():
+        if np.issubdtype(dtype, np.integer):
+            columns[name] = _integer(df[name], dtype)
+        else:
+            columns[name] = df[name].to_numpy(dtype=dtype, na_value=np.nan)
+    return driver, lap_number, columns
+
+
+def telemetry_from_mysql(session_id, drivers):
+    """Stream the session's telemetry and keep only the compact arrays."""
+    parts = [
+        _telemetry_arrays(chunk, drivers)
+        for chunk in stream_telemetry(session_id, columns=tuple(TELEMETRY_DTYPES), include_pit=True)
+    ]
+    if not parts:
+        return TelemetryTable(np.empty(0, np.int8), np.empty(0, np.uint16),
+                              {name: np.empty(0, dtype) for name, dtype in TELEMETRY_DTYPES.items()}, drivers)
+    return TelemetryTable(
+        np.concatenate([p[0] for p in parts]),
+        np.concatenate([p[1] for p in parts]),
+        {name: np.concatenate([p[2][name] for p in parts]) for name in TELEMETRY_DTYPES},
+        drivers,
+    )
+
+
+def telemetry_from_parquet(session_id, drivers, year=None):
+    from parquet_reader import get_telemetry  # needs pyarrow
+
+    df = get_telemetry(session_id, columns=["abbreviation", "lap_number", *TELEMETRY_DTYPES],
+                       include_pit=True, year=year)
+    driver, lap_number, columns = _telemetry_arrays(df, drivers)
+    del df
+    # partitions are read in directory order; make every lap contiguous
+    order = np.lexsort((lap_number, driver))
+    return TelemetryTable(driver[order], lap_number[order],
+                          {name: values[order] for name, values in columns.items()}, drivers)
+
+
+def load_session(session_id, telemetry=None):
+    """
+    Load a session into a SessionData. telemetry is None (laps only),
+    "mysql" or "parquet".
+    """
+    info_df = cached_read_sql(
+        "SELECT session_id, year, grand_prix, session_type FROM sessions WHERE session_id = %s",
+        (session_id,), session_id=session_id
+    )
+    if info_df.empty:
+        raise KeyError(f"Unknown session {session_id}")
+    row = info_df.iloc[0]
+    info = SessionInfo(int(row["session_id"]), int(row["year"]), row["grand_prix"], row["session_type"])
+
+    laps_df = get_session_laps(session_id)
+    names = laps_df.drop_duplicates("abbreviation").sort_values("abbreviation")
+    drivers = [Driver(code, abbr, name)
+               for code, (abbr, name) in enumerate(zip(names["abbreviation"], names["full_name"]))]
+    abbreviations = [d.abbreviation for d in drivers]
+    laps = LapTable(laps_df, abbreviations)
+
+    if telemetry is None:
+        telemetry_table = None
+    elif telemetry == "mysql":
+        telemetry_table = telemetry_from_mysql(session_id, abbreviations)
+    elif telemetry == "parquet":
+        telemetry_table = telemetry_from_parquet(session_id, abbreviations, info.year)
+    else:
+        raise ValueError(f"Unknown telemetry source: {telemetry}")
+    return SessionData(info, drivers, laps, telemetry_table)
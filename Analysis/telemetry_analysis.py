@@ -1,139 +1,211 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
-from db_conector import get_db_connection
+from df_Queries import get_lap_telemetry, get_session_drivers
+from lap_comparison import fastest_laps, lap_delta, resample_session
+from telemetry_mmap import get_telemetry_cache
+from telemetry_stream import CorrelationAccumulator, aggregate, stream_telemetry
+from track_index import get_track_index
 
 # ===============================
 # Configuration
 # ===============================
 SESSION_ID = 1        # Italian GP Race
 DRIVER_ID = 1         # Leclerc
+DRIVER_NAME = "Leclerc"
+COMPARE_DRIVER_ID = 2  # driver whose fastest lap is compared with DRIVER_ID's
 EARLY_LAP_NUMBER = 5  # Pick one early lap
 TRACK_ID = 1          # Your track ID
 SHIFT_BACK = 320      # meters to shift telemetry backward along the track
+EVENT = "2024 Italian GP"
+LAP_SOURCE = "mmap"   # "mmap": local memory-mapped cache, "mysql": one query per lap
+
+# Track maps drawn per lap: (column, colormap, label)
+TRACK_MAPS = [
+    ('speed', 'viridis', 'Speed (km/h)'),
+    ('throttle', 'plasma', 'Throttle (%)'),
+    ('brake', 'inferno', 'Brake (%)'),
+    ('gear', 'cool', 'Gear'),
+]
+
 
 # ===============================
 # Load telemetry and track coordinates
 # ===============================
-conn = get_db_connection()
-
-# Telemetry for one lap
-query_tel = """
-SELECT distance, speed, throttle, brake, gear
-FROM telemetry
-WHERE session_id = %s
-  AND driver_id = %s
-  AND lap_number = %s
-ORDER BY distance
-"""
-telemetry = pd.read_sql(
-    query_tel,
-    conn,
-    params=(SESSION_ID, DRIVER_ID, EARLY_LAP_NUMBER)
-)
-
-# Track coordinates
-query_track = """
-SELECT distance, x, y
-FROM track_coords
-WHERE track_id = %s
-ORDER BY distance
-"""
-track = pd.read_sql(query_track, conn, params=(TRACK_ID,))
-conn.close()
+def load_lap(session_id=SESSION_ID, driver_id=DRIVER_ID, lap_number=EARLY_LAP_NUMBER,
+             track_id=TRACK_ID, shift=SHIFT_BACK, source=LAP_SOURCE):
+    """Telemetry for one lap with x/y track positions."""
+    if source == "mmap":
+        telemetry = get_telemetry_cache(session_id).lap_frame(
+            driver_id, lap_number, ['distance', 'speed', 'throttle', 'brake', 'gear']
+        )
+    else:
+        telemetry = get_lap_telemetry(session_id, driver_id, lap_number)
+    telemetry['x'], telemetry['y'] = get_track_index(track_id).xy(telemetry['distance'], shift=shift)
+    return telemetry
 
-# ===============================
-# Map telemetry to track coordinates
-# ===============================
-def map_to_track(distances, track_df, shift=0):
-    x_mapped = []
-    y_mapped = []
-    for d in distances:
-        d_shifted = max(d - shift, 0)
-        idx = (track_df['distance'] - d_shifted).abs().idxmin()
-        x_mapped.append(track_df.loc[idx, 'x'])
-        y_mapped.append(track_df.loc[idx, 'y'])
-    return x_mapped, y_mapped
-
-telemetry['x'], telemetry['y'] = map_to_track(
-    telemetry['distance'],
-    track,
-    shift=SHIFT_BACK
-)
 
 # ===============================
 # Plot function for telemetry map
 # ===============================
-def plot_telemetry(var, cmap, label):
-    plt.figure(figsize=(10, 8))
-    sc = plt.scatter(
+def plot_telemetry(telemetry, var, cmap, label, driver=DRIVER_NAME, lap_number=EARLY_LAP_NUMBER,
+                   event=EVENT):
+    fig, ax = plt.subplots(figsize=(10, 8))
+    sc = ax.scatter(
         telemetry['x'],
         telemetry['y'],
         c=telemetry[var],
         cmap=cmap,
         s=15
     )
-    plt.colorbar(sc, label=label)
-    plt.title(f"Leclerc – Lap {EARLY_LAP_NUMBER} {label} Map\n2024 Italian GP")
-    plt.axis('equal')
-    plt.xlabel("Track X")
-    plt.ylabel("Track Y")
-    plt.tight_layout()
-    plt.show()
+    fig.colorbar(sc, ax=ax, label=label)
+    ax.set_title(f"{driver} – Lap {lap_number} {label} Map\n{event}")
+    ax.axis('equal')
+    ax.set_xlabel("Track X")
+    ax.set_ylabel("Track Y")
+    fig.tight_layout()
+    return fig
 
-# ===============================
-# Track maps
-# ===============================
-plot_telemetry('speed', 'viridis', 'Speed (km/h)')
-plot_telemetry('throttle', 'plasma', 'Throttle (%)')
-plot_telemetry('brake', 'inferno', 'Brake (%)')
-plot_telemetry('gear', 'cool', 'Gear')
 
 # ============================================================
 # ADDITION 1: Telemetry vs Distance (Single Lap)
 # ============================================================
-fig, axs = plt.subplots(4, 1, figsize=(14, 10), sharex=True)
+def plot_telemetry_trace(telemetry, driver=DRIVER_NAME, lap_number=EARLY_LAP_NUMBER, event=EVENT):
+    fig, axs = plt.subplots(4, 1, figsize=(14, 10), sharex=True)
 
-axs[0].plot(telemetry['distance'], telemetry['speed'])
-axs[0].set_ylabel("Speed (km/h)")
-axs[0].set_title(
-    f"Leclerc – Telemetry over Distance (Lap {EARLY_LAP_NUMBER})\n2024 Italian GP"
-)
+    axs[0].plot(telemetry['distance'], telemetry['speed'])
+    axs[0].set_ylabel("Speed (km/h)")
+    axs[0].set_title(
+        f"{driver} – Telemetry over Distance (Lap {lap_number})\n{event}"
+    )
 
-axs[1].plot(telemetry['distance'], telemetry['gear'])
-axs[1].set_ylabel("Gear")
+    axs[1].plot(telemetry['distance'], telemetry['gear'])
+    axs[1].set_ylabel("Gear")
 
-axs[2].plot(telemetry['distance'], telemetry['throttle'])
-axs[2].set_ylabel("Throttle (%)")
+    axs[2].plot(telemetry['distance'], telemetry['throttle'])
+    axs[2].set_ylabel("Throttle (%)")
 
-axs[3].plot(telemetry['distance'], telemetry['brake'])
-axs[3].set_ylabel("Brake (%)")
-axs[3].set_xlabel("Distance (m)")
+    axs[3].plot(telemetry['distance'], telemetry['brake'])
+    axs[3].set_ylabel("Brake (%)")
+    axs[3].set_xlabel("Distance (m)")
 
-for ax in axs:
-    ax.grid(alpha=0.3)
+    for ax in axs:
+        ax.grid(alpha=0.3)
+
+    fig.tight_layout()
+    return fig
 
-plt.tight_layout()
-plt.show()
 
 # ============================================================
 # ADDITION 2: Correlation Matrix (Same Lap)
 # ============================================================
-corr_data = telemetry[['speed', 'gear', 'throttle', 'brake']]
-corr_matrix = corr_data.corr()
-
-print("\nCorrelation Matrix – Leclerc Lap "
-      f"{EARLY_LAP_NUMBER} (2024 Italian GP)\n")
-print(corr_matrix)
-
-plt.figure(figsize=(6, 5))
-sns.heatmap(
-    corr_matrix,
-    annot=True,
-    cmap='coolwarm',
-    center=0,
-    fmt=".2f"
-)
-plt.title("Telemetry Correlation – Leclerc (Single Lap)")
-plt.tight_layout()
-plt.show()
+CORRELATION_COLUMNS = ['speed', 'gear', 'throttle', 'brake']
+
+
+def correlation_matrix(telemetry):
+    corr_data = telemetry[CORRELATION_COLUMNS]
+    return corr_data.corr()
+
+
+def race_correlation_matrix(session_id=SESSION_ID):
+    """Correlation over every non-pit lap of the session, streamed in constant memory."""
+    (corr_matrix,) = aggregate(
+        stream_telemetry(session_id, columns=CORRELATION_COLUMNS),
+        CorrelationAccumulator(CORRELATION_COLUMNS),
+    )
+    return corr_matrix
+
+
+def plot_correlation(corr_matrix, driver=DRIVER_NAME, scope="Single Lap"):
+    fig, ax = plt.subplots(figsize=(6, 5))
+    sns.heatmap(
+        corr_matrix,
+        annot=True,
+        cmap='coolwarm',
+        center=0,
+        fmt=".2f",
+        ax=ax
+    )
+    ax.set_title(f"Telemetry Correlation – {driver} ({scope})")
+    fig.tight_layout()
+    return fig
+
+
+# ============================================================
+# ADDITION 3: Fastest-lap comparison on a common distance grid
+# ============================================================
+def compare_fastest_laps(session_id=SESSION_ID, driver_a=DRIVER_ID, driver_b=COMPARE_DRIVER_ID):
+    """
+    Resample every lap of the session once and compare the two drivers'
+    fastest laps. Returns (grid, {label: speed trace}, time delta a - b).
+    Raises KeyError when a driver has no lap covering the whole grid.
+    """
+    resampled = resample_session(session_id)
+    fastest = fastest_laps(resampled)
+    names = get_session_drivers(session_id).set_index('driver_id')['abbreviation']
+    for d in (driver_a, driver_b):
+        if d not in fastest:
+            raise KeyError(f"No complete timed lap for {names.get(d, f'driver {d}')} in session {session_id}")
+    lap_a, lap_b = (driver_a, fastest[driver_a]), (driver_b, fastest[driver_b])
+    _, time_delta = lap_delta(resampled, lap_a, lap_b)
+    traces = {
+        f"{names.get(d, d)} (Lap {n})": resampled.trace(d, n)
+        for d, n in (lap_a, lap_b)
+    }
+    return resampled.grid, traces, time_delta
+
+
+def plot_comparison(grid, traces, time_delta, event=EVENT):
+    fig, axs = plt.subplots(2, 1, figsize=(14, 8), sharex=True,
+                            gridspec_kw={'height_ratios': [3, 1]})
+    for label, speed in traces.items():
+        axs[0].plot(grid, speed, label=label)
+    axs[0].set_ylabel("Speed (km/h)")
+    axs[0].set_title(f"Fastest Lap Comparison – {' vs '.join(traces)}\n{event}")
+    axs[0].legend()
+
+    axs[1].plot(grid, time_delta, color='black')
+    axs[1].axhline(0, color='grey', linewidth=0.8)
+    axs[1].set_ylabel("Time delta (s)")
+    axs[1].set_xlabel("Distance (m)")
+
+    for ax in axs:
+        ax.grid(alpha=0.3)
+
+    fig.tight_layout()
+    return fig
+
+
+def main():
+    telemetry = load_lap()
+
+    # ===============================
+    # Track maps
+    # ===============================
+    for var, cmap, label in TRACK_MAPS:
+        plot_telemetry(telemetry, var, cmap, label)
+        plt.show()
+
+    plot_telemetry_trace(telemetry)
+    plt.show()
+
+    corr_matrix = correlation_matrix(telemetry)
+    print(f"\nCorrelation Matrix – {DRIVER_NAME} Lap "
+          f"{EARLY_LAP_NUMBER} ({EVENT})\n")
+    print(corr_matrix)
+
+    plot_correlation(corr_matrix)
+    plt.show()
+
+    race_corr = race_correlation_matrix()
+    print(f"\nCorrelation Matrix – all drivers, all laps ({EVENT})\n")
+    print(race_corr)
+
+    plot_correlation(race_corr, driver="All drivers", scope="Whole Race")
+    plt.show()
+
+    plot_comparison(*compare_fastest_laps())
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
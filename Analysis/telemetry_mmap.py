@@ -0,0 +1,252 @@
+import json
+import os
+import uuid
+
+import numpy as np
+import pandas as pd
+
+import common_path  # noqa: F401  (common/ on sys.path)
+from db_conector import db_connection
+from query_cache import session_version
+
+# ===============================
+# Configuration
+# ===============================
+MMAP_DIR = os.environ.get(
+    "F1_TELEMETRY_MMAP_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".telemetry_mmap")
+)
+CHUNK_SIZE = 100000
+
+# One record per sample; driver and lap live in the offset index
+SAMPLE_DTYPE = np.dtype([
+    ("time", np.float32),
+    ("distance", np.float32),
+    ("speed", np.float32),
+    ("throttle", np.uint8),
+    ("brake", np.uint8),
+    ("gear", np.uint8),
+    ("drs", np.uint8),
+    ("rpm", np.uint16),
+])
+
+INDEX_DTYPE = np.dtype([
+    ("driver_id", np.uint16),
+    ("lap_number", np.uint16),
+    ("start", np.uint64),
+    ("stop", np.uint64),
+])
+
+# Served by idx_telemetry_lap_distance (migrations/0002) without a filesort
+SAMPLES_QUERY = f"""
+SELECT driver_id, lap_number, {", ".join(SAMPLE_DTYPE.names)}
+FROM telemetry
+WHERE session_id = %s
+ORDER BY driver_id, lap_number, distance
+"""
+
+_caches = {}  # (session_id, root) -> TelemetryCache, per process
+
+
+def meta_path(session_id, root=MMAP_DIR):
+    """meta.json of a session's cache; it names the data files of the published build."""
+    return os.path.join(root, f"session_{session_id}.json")
+
+
+def build_paths(session_id, build, root=MMAP_DIR):
+    """Samples and index files of one build. Every build writes its own files."""
+    base = os.path.join(root, f"session_{session_id}.{build}")
+    return base + ".samples.npy", base + ".index.npy"
+
+
+def _read_meta(session_id, root=MMAP_DIR):
+    try:
+        with open(meta_path(session_id, root)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _published_paths(meta, root):
+    return os.path.join(root, meta["samples_file"]), os.path.join(root, meta["index_file"])
+
+
+# ===============================
+# Build
+# ===============================
+def _lap_index(driver_id, lap_number, offset):
+    """Index rows for the laps starting in one chunk (a lap may continue in the next)."""
+    change = np.ones(len(driver_id), dtype=bool)
+    change[1:] = (driver_id[1:] != driver_id[:-1]) | (lap_number[1:] != lap_number[:-1])
+    starts = np.flatnonzero(change)
+    index = np.empty(len(starts), dtype=INDEX_DTYPE)
+    index["driver_id"] = driver_id[starts]
+    index["lap_number"] = lap_number[starts]
+    index["start"] = starts + offset
+    index["stop"] = np.append(starts[1:], len(driver_id)) + offset
+    return index
+
+
+def _copy_prefix(samples, n, path):
+    """Memory-mapped copy of the first n samples, for builds that got fewer rows than counted."""
+    trimmed = np.lib.format.open_memmap(path, mode="w+", dtype=SAMPLE_DTYPE, shape=(n,))
+    for start in range(0, n, CHUNK_SIZE):
+        trimmed[start:start + CHUNK_SIZE] = samples[start:start + CHUNK_SIZE]
+    trimmed.flush()
+    del trimmed
+
+
+def build_cache(session_id, root=MMAP_DIR):
+    """
+    Write a session's telemetry to a samples file (one contiguous structured
+    array, laps in driver / lap / distance order) plus the per-lap offset
+    index. Rows are streamed into a memory-mapped file, so the build never
+    holds the session in memory.
+
+    Every build writes files under its own name and publishes them by
+    replacing meta.json last, so concurrent builders never share a file and
+    readers see either the old or the new build, never a mix.
+    """
+    os.makedirs(root, exist_ok=True)
+    version = session_version(session_id)
+    build = f"{version}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+    samples_path, index_path = build_paths(session_id, build, root)
+
+    with db_connection() as conn:
+        cursor = conn.cursor(buffered=True)
+        try:
+            cursor.execute("SELECT COUNT(*) FROM telemetry WHERE session_id = %s", (session_id,))
+            total = cursor.fetchone()[0]
+        finally:
+            cursor.close()
+
+        samples = np.lib.format.open_memmap(samples_path, mode="w+", dtype=SAMPLE_DTYPE, shape=(total,))
+        parts = []
+        offset = 0
+        cursor = conn.cursor(buffered=False)
+        try:
+            cursor.execute(SAMPLES_QUERY, (session_id,))
+            while True:
+                rows = cursor.fetchmany(CHUNK_SIZE)
+                if not rows:
+                    break
+                chunk = pd.DataFrame.from_records(rows, columns=["driver_id", "lap_number", *SAMPLE_DTYPE.names])
+                if offset + len(chunk) > total:
+                    raise RuntimeError(f"Telemetry of session {session_id} changed while building its cache")
+                block = samples[offset:offset + len(chunk)]
+                for name in SAMPLE_DTYPE.names:
+                    values = chunk[name].to_numpy(dtype=np.float64, na_value=np.nan)
+                    if SAMPLE_DTYPE[name].kind != "f":
+                        values = np.nan_to_num(values, nan=0.0)
+                    block[name] = values
+                parts.append(_lap_index(chunk["driver_id"].to_numpy(), chunk["lap_number"].to_numpy(), offset))
+                offset += len(chunk)
+        except BaseException:
+            del samples
+            os.remove(samples_path)
+            raise
+        finally:
+            cursor.close()
+
+    samples.flush()
+    if offset < total:
+        # rows were deleted during the build: drop the zero-filled tail
+        trimmed_path = samples_path + ".trim"
+        _copy_prefix(samples, offset, trimmed_path)
+        del samples
+        os.replace(trimmed_path, samples_path)
+    else:
+        del samples
+
+    index = np.concatenate(parts) if parts else np.empty(0, dtype=INDEX_DTYPE)
+    # merge index rows of laps that were split across two chunks
+    if len(index):
+        same = (index["driver_id"][1:] == index["driver_id"][:-1]) & \
+               (index["lap_number"][1:] == index["lap_number"][:-1])
+        keep = np.append(True, ~same)
+        stops = index["stop"][np.append(np.flatnonzero(keep)[1:] - 1, len(index) - 1)]
+        index = index[keep]
+        index["stop"] = stops
+    with open(index_path, "wb") as f:
+        np.save(f, index)
+
+    previous = _read_meta(session_id, root)
+    meta = {
+        "session_id": session_id,
+        "version": version,
+        "samples": int(offset),
+        "samples_file": os.path.basename(samples_path),
+        "index_file": os.path.basename(index_path),
+    }
+    tmp_meta = f"{meta_path(session_id, root)}.{build}.tmp"
+    with open(tmp_meta, "w") as f:
+        json.dump(meta, f)
+    os.replace(tmp_meta, meta_path(session_id, root))
+
+    # readers that already mapped the previous build keep it until they close
+    if previous and previous.get("samples_file") != meta["samples_file"]:
+        for path in _published_paths(previous, root):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    return samples_path
+
+
+# ===============================
+# Read
+# ===============================
+class TelemetryCache:
+    """
+    Read-only view of a built cache. The samples file is memory-mapped, so
+    every process that opens it shares the same page-cache pages and a lap
+    is a slice of the array, not a copy.
+    """
+
+    def __init__(self, session_id, root=MMAP_DIR):
+        meta = _read_meta(session_id, root)
+        if meta is None or "samples_file" not in meta:
+            raise FileNotFoundError(f"No telemetry cache for session {session_id} in {root}")
+        samples_path, index_path = _published_paths(meta, root)
+        self.session_id = session_id
+        self.samples = np.load(samples_path, mmap_mode="r")
+        index = np.load(index_path)
+        self.laps = {
+            (int(d), int(n)): (int(start), int(stop))
+            for d, n, start, stop in zip(index["driver_id"], index["lap_number"], index["start"], index["stop"])
+        }
+
+    def lap(self, driver_id, lap_number):
+        """Structured array of one lap's samples ordered by distance (zero-copy)."""
+        try:
+            start, stop = self.laps[(driver_id, lap_number)]
+        except KeyError:
+            raise KeyError(f"No telemetry for driver {driver_id} lap {lap_number}") from None
+        return self.samples[start:stop]
+
+    def lap_frame(self, driver_id, lap_number, columns=SAMPLE_DTYPE.names):
+        samples = self.lap(driver_id, lap_number)
+        return pd.DataFrame({name: samples[name] for name in columns}, copy=False)
+
+
+def is_current(session_id, root=MMAP_DIR):
+    meta = _read_meta(session_id, root)
+    if meta is None or "samples_file" not in meta:
+        return False
+    samples_path, index_path = _published_paths(meta, root)
+    return (os.path.exists(samples_path) and os.path.exists(index_path)
+            and meta.get("version") == session_version(session_id))
+
+
+def get_telemetry_cache(session_id, root=MMAP_DIR):
+    """
+    Open a session's cache, (re)building it first if it is missing or stale.
+    The open cache is reused until the session is re-ingested.
+    """
+    cache = _caches.get((session_id, root))
+    current = is_current(session_id, root)
+    if cache is None or not current:
+        if not current:
+            build_cache(session_id, root)
+        cache = _caches[(session_id, root)] = TelemetryCache(session_id, root)
+    return cache
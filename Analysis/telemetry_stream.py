@@ -0,0 +1,201 @@
+import numpy as np
+import pandas as pd
+
+import common_path  # noqa: F401  (common/ on sys.path)
+from db_conector import db_connection
+
+# ===============================
+# Configuration
+# ===============================
+CHUNK_SIZE = 50000  # rows per fetch; bounds memory regardless of session size
+
+# Telemetry columns that may be streamed (whitelist, they end up in the SQL)
+TELEMETRY_COLUMNS = ("time", "distance", "speed", "throttle", "brake", "gear", "drs", "rpm")
+DEFAULT_COLUMNS = ("speed", "throttle", "brake", "gear", "rpm")
+
+# Rows come back in primary key order, so laps arrive contiguously and
+# MySQL reads the index without sorting.
+STREAM_QUERY = """
+SELECT d.abbreviation, t.lap_number, {columns}
+FROM telemetry t
+JOIN laps l
+  ON t.session_id = l.session_id
+ AND t.driver_id = l.driver_id
+ AND t.lap_number = l.lap_number
+JOIN drivers d ON d.driver_id = l.driver_id
+WHERE t.session_id = %s{pit_filter}
+ORDER BY t.driver_id, t.lap_number, t.sample_index
+"""
+
+
+# ===============================
+# Streaming reads
+# ===============================
+def stream_telemetry(session_id, columns=DEFAULT_COLUMNS, chunk_size=CHUNK_SIZE, include_pit=False):
+    """
+    Yield a session's telemetry as DataFrames of at most chunk_size rows
+    (abbreviation, lap_number and the requested columns). The cursor is
+    unbuffered, so rows stay on the server until they are fetched and only
+    one chunk is held in memory at a time.
+    """
+    unknown = set(columns) - set(TELEMETRY_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown telemetry columns: {sorted(unknown)}")
+    query = STREAM_QUERY.format(
+        columns=", ".join(f"t.{c}" for c in columns),
+        pit_filter="" if include_pit else " AND l.pit = 0",
+    )
+    names = ["abbreviation", "lap_number", *columns]
+
+    with db_connection() as conn:
+        cursor = conn.cursor(buffered=False)
+        try:
+            cursor.execute(query, (session_id,))
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield pd.DataFrame.from_records(rows, columns=names)
+        finally:
+            # the consumer may stop early: drain the rest so the connection
+            # goes back to the pool clean
+            if conn.unread_result:
+                conn.consume_results()
+            cursor.close()
+
+
+def stream_laps(session_id, columns=DEFAULT_COLUMNS, chunk_size=CHUNK_SIZE, include_pit=False):
+    """
+    Yield (abbreviation, lap_number, DataFrame) per lap. A lap split across
+    two chunks is held back until it is complete, so memory stays bounded by
+    one chunk plus one lap.
+    """
+    pending = None
+    for chunk in stream_telemetry(session_id, columns, chunk_size, include_pit):
+        if pending is not None:
+            chunk = pd.concat([pending, chunk], ignore_index=True)
+        keys = chunk["abbreviation"].ne(chunk["abbreviation"].shift()) | \
+            chunk["lap_number"].ne(chunk["lap_number"].shift())
+        starts = np.flatnonzero(keys.to_numpy())
+        # the last lap of the chunk may continue in the next one
+        for start, end in zip(starts[:-1], starts[1:]):
+            lap = chunk.iloc[start:end].reset_index(drop=True)
+            yield lap["abbreviation"].iat[0], int(lap["lap_number"].iat[0]), lap
+        pending = chunk.iloc[starts[-1]:].reset_index(drop=True)
+
+    if pending is not None and not pending.empty:
+        yield pending["abbreviation"].iat[0], int(pending["lap_number"].iat[0]), pending
+
+
+# ===============================
+# Incremental aggregators
+# ===============================
+class RunningStats:
+    """Count, mean, variance, min and max per column, merged chunk by chunk (Chan et al.)."""
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        k = len(self.columns)
+        self.count = np.zeros(k)
+        self.mean = np.zeros(k)
+        self.m2 = np.zeros(k)
+        self.min = np.full(k, np.inf)
+        self.max = np.full(k, -np.inf)
+
+    def update(self, df):
+        values = df[self.columns].to_numpy(dtype=float)
+        valid = ~np.isnan(values)
+        n = valid.sum(axis=0)
+        if not n.any():
+            return
+        safe_n = np.maximum(n, 1)
+        mean = np.where(valid, values, 0).sum(axis=0) / safe_n
+        m2 = np.where(valid, (values - mean) ** 2, 0).sum(axis=0)
+
+        total = self.count + n
+        safe_total = np.maximum(total, 1)
+        delta = mean - self.mean
+        self.mean = self.mean + delta * n / safe_total
+        self.m2 = self.m2 + m2 + delta ** 2 * self.count * n / safe_total
+        self.count = total
+        self.min = np.fmin(self.min, np.nanmin(np.where(valid, values, np.inf), axis=0))
+        self.max = np.fmax(self.max, np.nanmax(np.where(valid, values, -np.inf), axis=0))
+
+    def result(self):
+        """DataFrame indexed by column with count, mean, std (sample), min and max."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            std = np.sqrt(self.m2 / (self.count - 1))
+        empty = self.count == 0
+        return pd.DataFrame({
+            "count": self.count.astype(int),
+            "mean": np.where(empty, np.nan, self.mean),
+            "std": np.where(self.count > 1, std, np.nan),
+            "min": np.where(empty, np.nan, self.min),
+            "max": np.where(empty, np.nan, self.max),
+        }, index=self.columns)
+
+
+class Histogram:
+    """Fixed-bin histogram of one column; bins must be known up front."""
+
+    def __init__(self, column, bins):
+        self.column = column
+        self.edges = np.asarray(bins, dtype=float)
+        self.counts = np.zeros(len(self.edges) - 1, dtype=np.int64)
+
+    def update(self, df):
+        values = df[self.column].to_numpy(dtype=float)
+        counts, _ = np.histogram(values[~np.isnan(values)], bins=self.edges)
+        self.counts += counts
+
+    def result(self):
+        return pd.DataFrame({
+            "left": self.edges[:-1],
+            "right": self.edges[1:],
+            "count": self.counts,
+        })
+
+
+class CorrelationAccumulator:
+    """
+    Pearson correlation matrix over rows complete in every column, from the
+    merged means and co-moment matrix of each chunk. Equals
+    DataFrame.dropna().corr() over all rows.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        k = len(self.columns)
+        self.count = 0
+        self.mean = np.zeros(k)
+        self.comoment = np.zeros((k, k))
+
+    def update(self, df):
+        values = df[self.columns].to_numpy(dtype=float)
+        values = values[~np.isnan(values).any(axis=1)]
+        n = len(values)
+        if n == 0:
+            return
+        mean = values.mean(axis=0)
+        centred = values - mean
+        comoment = centred.T @ centred
+
+        total = self.count + n
+        delta = mean - self.mean
+        self.comoment += comoment + np.outer(delta, delta) * self.count * n / total
+        self.mean += delta * n / total
+        self.count = total
+
+    def result(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            std = np.sqrt(np.diag(self.comoment))
+            corr = self.comoment / np.outer(std, std)
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+
+def aggregate(chunks, *aggregators):
+    """Feed every chunk to every aggregator and return their results."""
+    for chunk in chunks:
+        for aggregator in aggregators:
+            aggregator.update(chunk)
+    return [aggregator.result() for aggregator in aggregators]
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+
+import common_path  # noqa: F401  (common/ on sys.path)
+from db_conector import db_connection
+
+_INDEXES = {}  # track_id -> TrackIndex
+
+TRACK_COORDS_QUERY = """
+SELECT distance, x, y
+FROM track_coords
+WHERE track_id = %s
+ORDER BY distance
+"""
+
+
+class TrackIndex:
+    """
+    Track centreline sorted by distance, built once per track. Maps whole
+    arrays of lap distances to X/Y (np.searchsorted + linear interpolation)
+    and X/Y points back to lap distance (KD-tree, needs scipy).
+    """
+
+    def __init__(self, distance, x, y, lap_length=None):
+        distance = np.asarray(distance, dtype=np.float64)
+        order = np.argsort(distance, kind="stable")
+        distance = distance[order]
+        x = np.asarray(x, dtype=np.float64)[order]
+        y = np.asarray(y, dtype=np.float64)[order]
+
+        # interpolation needs strictly increasing distances
+        keep = np.concatenate(([True], np.diff(distance) > 0))
+        self.distance = distance[keep]
+        self.x = x[keep]
+        self.y = y[keep]
+        # the last point is not the start line: the lap ends one sample step after it
+        step = float(np.median(np.diff(self.distance))) if len(self.distance) > 1 else 0.0
+        self.lap_length = float(lap_length or self.distance[-1] + step)
+
+        # close the loop on both sides: the last point one lap earlier before the
+        # first one, the first point one lap later after the last one, so every
+        # distance in [0, lap_length) interpolates between two real neighbours
+        self._distance_loop = np.concatenate((
+            [self.distance[-1] - self.lap_length], self.distance, [self.distance[0] + self.lap_length]
+        ))
+        self._x_loop = np.concatenate(([self.x[-1]], self.x, [self.x[0]]))
+        self._y_loop = np.concatenate(([self.y[-1]], self.y, [self.y[0]]))
+        self._tree = None
+
+    @classmethod
+    def from_frame(cls, track_df):
+        """Build from a DataFrame with distance, x and y columns (the track_coords layout)."""
+        return cls(track_df['distance'].to_numpy(), track_df['x'].to_numpy(), track_df['y'].to_numpy())
+
+    def wrap(self, distances, shift=0):
+        """Lap distances moved back by shift metres, wrapped into [0, lap_length)."""
+        return np.mod(np.asarray(distances, dtype=np.float64) - shift, self.lap_length)
+
+    def nearest(self, distances, shift=0):
+        """Index of the closest centreline point for every distance (across the start line too)."""
+        d = self.wrap(distances, shift)
+        loop = self._distance_loop
+        right = np.clip(np.searchsorted(loop, d), 1, len(loop) - 1)
+        left = right - 1
+        closest = np.where(d - loop[left] <= loop[right] - d, left, right)
+        return (closest - 1) % len(self.distance)
+
+    def xy(self, distances, shift=0):
+        """Interpolated X and Y arrays for an array of lap distances."""
+        d = self.wrap(distances, shift)
+        return np.interp(d, self._distance_loop, self._x_loop), np.interp(d, self._distance_loop, self._y_loop)
+
+    def distance_at(self, x, y):
+        """Lap distance of the centreline point closest to each (x, y)."""
+        if self._tree is None:
+            from scipy.spatial import cKDTree
+            self._tree = cKDTree(np.column_stack((self.x, self.y)))
+        _, idx = self._tree.query(np.column_stack((np.ravel(x), np.ravel(y))))
+        return self.distance[idx]
+
+
+def get_track_index(track_id):
+    """TrackIndex for a track_id, loaded from track_coords once per process."""
+    if track_id not in _INDEXES:
+        with db_connection() as conn:
+            track = pd.read_sql(TRACK_COORDS_QUERY, conn, params=(track_id,))
+        _INDEXES[track_id] = TrackIndex.from_frame(track)
+    return _INDEXES[track_id]
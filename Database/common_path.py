@@ -0,0 +1,9 @@
+import os
+import sys
+
+# Modules used by both Database/ and Analysis/ (db_conector, instrumentation,
+# lap_flags) live in common/ at the repository root. Importing this module
+# puts that directory on sys.path for scripts run from either directory.
+COMMON_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "common")
+if COMMON_DIR not in sys.path:
+    sys.path.append(COMMON_DIR)
@@ -0,0 +1,179 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+import common_path  # noqa: F401  (common/ on sys.path)
+from db_conector import get_db_connection, get_cursor
+from lap_flags import CLEAN
+
+# ===============================
+# Configuration
+# ===============================
+# Fuel correction: the car gets lighter by a fixed mass every lap, and every kg
+# costs a roughly constant lap time. Removing that trend leaves the tyre.
+FUEL_START_KG = 105.0
+FUEL_SECONDS_PER_KG = 0.03
+
+MIN_LAPS = 3  # stints with fewer clean laps are not fitted
+FIT_SESSION_TYPES = ("R",)  # fuel loads are only known for races
+
+LAP_COLUMNS = ["session_id", "driver_id", "lap_number", "lap_time",
+               "tyre_compound", "stint_number", "flags"]
+STINT_KEYS = ["session_id", "driver_id", "stint_number", "tyre_compound"]
+
+LAPS_QUERY = f"""
+SELECT {", ".join(f"l.{c}" for c in LAP_COLUMNS)}
+FROM laps l
+JOIN sessions s ON s.session_id = l.session_id
+WHERE {{where}}
+ORDER BY l.session_id, l.driver_id, l.lap_number
+"""
+
+insert_query = f"""
+INSERT INTO stint_degradation ({", ".join(STINT_KEYS)}, laps, first_lap, last_lap,
+                               base_lap_time, deg_per_lap, r_squared, residual_std)
+VALUES ({", ".join(["%s"] * 11)})
+"""
+
+
+# ===============================
+# Clean laps
+# ===============================
+def clean_stint_laps(laps):
+    """
+    Laps usable for a degradation fit, with tyre_age (laps since the stint
+    started) and fuel_corrected_time: the clean laps of laps.flags, i.e. no
+    in-, out- or first laps, no yellow / SC / VSC laps and no outliers.
+    """
+    df = laps.dropna(subset=["lap_time", "stint_number", "tyre_compound"]).copy()
+    df["tyre_compound"] = df["tyre_compound"].str.strip().str.upper()
+
+    stint_start = df.groupby(STINT_KEYS[:3])["lap_number"].transform("min")
+    race_laps = df.groupby("session_id")["lap_number"].transform("max")
+    df["tyre_age"] = df["lap_number"] - stint_start
+
+    fuel_kg = FUEL_START_KG * (1 - (df["lap_number"] - 1) / race_laps)
+    df["fuel_corrected_time"] = df["lap_time"] - FUEL_SECONDS_PER_KG * fuel_kg
+
+    return df[df["flags"].to_numpy() == CLEAN]
+
+
+# ===============================
+# Batched fit
+# ===============================
+def fit_stints(laps, min_laps=MIN_LAPS):
+    """
+    Fit fuel_corrected_time = base_lap_time + deg_per_lap * tyre_age for every
+    stint at once: the normal equations of all stints are built from per-stint
+    sums (np.bincount) and solved in closed form, with no Python loop per stint.
+    laps is the output of clean_stint_laps(); returns one row per fitted stint.
+    """
+    groups = laps.groupby(STINT_KEYS, sort=True)
+    g = groups.ngroup().to_numpy()
+    x = laps["tyre_age"].to_numpy(dtype=np.float64)
+    y = laps["fuel_corrected_time"].to_numpy(dtype=np.float64)
+    n_groups = groups.ngroups
+
+    def total(values):
+        return np.bincount(g, weights=values, minlength=n_groups)
+
+    n = np.bincount(g, minlength=n_groups).astype(np.float64)
+    sx, sy, sxx, sxy = total(x), total(y), total(x * x), total(x * y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = (n * sxy - sx * sy) / (n * sxx - sx * sx)
+        intercept = (sy - slope * sx) / n
+        residual = y - (intercept[g] + slope[g] * x)
+        rss = total(residual * residual)
+        sst = total((y - (sy / n)[g]) ** 2)
+        r_squared = 1 - rss / sst
+        residual_std = np.sqrt(rss / (n - 2))
+
+    fits = groups["lap_number"].agg(first_lap="min", last_lap="max").reset_index()
+    fits.insert(4, "laps", n.astype(int))
+    fits["base_lap_time"] = intercept
+    fits["deg_per_lap"] = slope
+    fits["r_squared"] = r_squared
+    fits["residual_std"] = residual_std
+    return fits[(fits["laps"] >= min_laps) & np.isfinite(fits["deg_per_lap"])].reset_index(drop=True)
+
+
+# ===============================
+# Storage
+# ===============================
+def _clean(value):
+    return None if pd.isna(value) else value
+
+
+def load_laps(conn, where, params):
+    cursor = get_cursor(conn)
+    try:
+        cursor.execute(LAPS_QUERY.format(where=where), params)
+        return pd.DataFrame(cursor.fetchall(), columns=LAP_COLUMNS)
+    finally:
+        cursor.close()
+
+
+def store_fits(conn, session_ids, fits):
+    """Replace the stint_degradation rows of the given sessions in one transaction."""
+    rows = [
+        (int(r.session_id), int(r.driver_id), int(r.stint_number), r.tyre_compound, int(r.laps),
+         int(r.first_lap), int(r.last_lap), float(r.base_lap_time), float(r.deg_per_lap),
+         _clean(r.r_squared), _clean(r.residual_std))
+        for r in fits.itertuples(index=False)
+    ]
+    cursor = get_cursor(conn)
+    try:
+        placeholders = ", ".join(["%s"] * len(session_ids))
+        cursor.execute(f"DELETE FROM stint_degradation WHERE session_id IN ({placeholders})", session_ids)
+        if rows:
+            cursor.executemany(insert_query, rows)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+    return len(rows)
+
+
+def refresh_degradation(conn, session_id):
+    """Refit one session (ingestion pipeline). Returns the number of stints stored."""
+    laps = load_laps(conn, "l.session_id = %s", (session_id,))
+    return store_fits(conn, [session_id], fit_stints(clean_stint_laps(laps)))
+
+
+def refresh_season(conn, year, session_types=FIT_SESSION_TYPES):
+    """Refit every session of a season from one lap query. Returns (sessions, stints)."""
+    placeholders = ", ".join(["%s"] * len(session_types))
+    laps = load_laps(conn, f"s.year = %s AND s.session_type IN ({placeholders})", (year, *session_types))
+    session_ids = sorted(int(s) for s in laps["session_id"].unique())
+    if not session_ids:
+        return 0, 0
+    return len(session_ids), store_fits(conn, session_ids, fit_stints(clean_stint_laps(laps)))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Fit fuel-corrected tyre degradation for whole seasons.")
+    parser.add_argument("years", type=int, nargs="+")
+    parser.add_argument("--sessions", nargs="+", default=list(FIT_SESSION_TYPES),
+                        help="session types to fit (default: races)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    conn = get_db_connection()
+    try:
+        for year in args.years:
+            start = time.perf_counter()
+            n_sessions, n_stints = refresh_season(conn, year, args.sessions)
+            print(f"{year}: {n_stints} stints in {n_sessions} sessions fitted in "
+                  f"{time.perf_counter() - start:.2f} s")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+import hashlib
+import os
+from decimal import Decimal
+
+import common_path  # noqa: F401  (common/ on sys.path)
+from db_conector import get_cursor
+from insert_lap import insert_query as lap_insert_query
+from lap_flags import UNFLAGGED
+
+# ===============================
+# Configuration
+# ===============================
+# laps columns after the (session_id, driver_id, lap_number) key
+LAP_VALUE_COLUMNS = (
+    "lap_time",
+    "sector1_time",
+    "sector2_time",
+    "sector3_time",
+    "pit",
+    "tyre_compound",
+    "stint_number",
+    "track_status",
+)
+
+# a changed lap is UNFLAGGED again until update_lap_flags has rerun
+lap_upsert_query = lap_insert_query.rstrip() + " ON DUPLICATE KEY UPDATE " + ", ".join(
+    [f"{c} = VALUES({c})" for c in LAP_VALUE_COLUMNS] + [f"flags = {UNFLAGGED}"]
+)
+
+
+# ===============================
+# Source cache hash
+# ===============================
+def session_cache_dir(session, cache_dir):
+    """Directory of the FastF1 cache pickles for a (not necessarily loaded) session."""
+    parts = session.api_path.strip("/").split("/")[1:]  # drop the leading 'static'
+    return os.path.join(cache_dir, *parts)
+
+
+def cache_content_hash(path):
+    """SHA-256 over the names and contents of every file in a session cache directory."""
+    if not os.path.isdir(path):
+        return None
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(path)):
+        file_path = os.path.join(path, name)
+        if not os.path.isfile(file_path):
+            continue
+        digest.update(name.encode())
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def stored_hash(conn, session_id):
+    cursor = get_cursor(conn)
+    try:
+        cursor.execute("SELECT content_hash FROM source_hashes WHERE session_id = %s", (session_id,))
+        row = cursor.fetchone()
+        return row[0] if row else None
+    finally:
+        cursor.close()
+
+
+def store_hash(conn, session_id, content_hash):
+    cursor = get_cursor(conn)
+    try:
+        cursor.execute(
+            """
+            INSERT INTO source_hashes (session_id, content_hash) VALUES (%s, %s)
+            ON DUPLICATE KEY UPDATE content_hash = VALUES(content_hash)
+            """,
+            (session_id, content_hash)
+        )
+        conn.commit()
+    finally:
+        cursor.close()
+
+
+# ===============================
+# Laps
+# ===============================
+def _normalize(value):
+    """Make stored and freshly built values comparable (DECIMAL vs float, padded strings)."""
+    if value is None:
+        return None
+    if isinstance(value, (float, Decimal)):
+        return round(float(value), 3)
+    if isinstance(value, str):
+        return value.strip()
+    return int(value) if isinstance(value, bool) else value
+
+
+def stored_laps(conn, session_id):
+    """Return {(driver_id, lap_number): normalized values} for the stored laps of a session."""
+    cursor = get_cursor(conn)
+    try:
+        cursor.execute(
+            f"""
+            SELECT driver_id, lap_number, {", ".join(LAP_VALUE_COLUMNS)}
+            FROM laps
+            WHERE session_id = %s
+            """,
+            (session_id,)
+        )
+        return {
+            (row[0], row[1]): tuple(_normalize(v) for v in row[2:])
+            for row in cursor.fetchall()
+        }
+    finally:
+        cursor.close()
+
+
+def diff_lap_rows(rows, stored):
+    """Split lap rows into (new, changed) against the stored laps; unchanged rows are dropped."""
+    new, changed = [], []
+    for row in rows:
+        key = (row[1], row[2])
+        if key not in stored:
+            new.append(row)
+        elif tuple(_normalize(v) for v in row[3:]) != stored[key]:
+            changed.append(row)
+    return new, changed
+
+
+def removed_laps(rows, stored):
+    """(driver_id, lap_number) of stored laps that are no longer in the source."""
+    return sorted(set(stored) - {(row[1], row[2]) for row in rows})
+
+
+def sync_laps(conn, session_id, new, changed, removed):
+    """
+    Apply a lap diff in one transaction: upsert new and changed laps, delete
+    the telemetry of changed and removed laps, and delete removed laps. The
+    changed laps' telemetry is then rewritten like any lap missing telemetry.
+    """
+    stale = [(session_id, row[1], row[2]) for row in changed]
+    stale += [(session_id, driver_id, lap_number) for driver_id, lap_number in removed]
+    cursor = get_cursor(conn)
+    try:
+        if new or changed:
+            cursor.executemany(lap_upsert_query, new + changed)
+        if stale:
+            cursor.executemany(
+                "DELETE FROM telemetry WHERE session_id = %s AND driver_id = %s AND lap_number = %s", stale
+            )
+        if removed:
+            cursor.executemany(
+                "DELETE FROM laps WHERE session_id = %s AND driver_id = %s AND lap_number = %s",
+                [(session_id, driver_id, lap_number) for driver_id, lap_number in removed]
+            )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+# ===============================
+# Telemetry
+# ===============================
+def stored_telemetry_laps(conn, session_id):
+    """Set of (driver_id, lap_number) that already have telemetry."""
+    cursor = get_cursor(conn)
+    try:
+        cursor.execute(
+            "SELECT DISTINCT driver_id, lap_number FROM telemetry WHERE session_id = %s",
+            (session_id,)
+        )
+        return {(row[0], row[1]) for row in cursor.fetchall()}
+    finally:
+        cursor.close()
+
+
+def telemetry_todo(rows, touched_rows, have_telemetry, driver_ids):
+    """
+    {abbreviation: lap_numbers} whose telemetry must be (re)written: laps
+    that were inserted or changed plus laps still missing telemetry.
+    """
+    keys = {(row[1], row[2]) for row in touched_rows}
+    keys |= {(row[1], row[2]) for row in rows} - have_telemetry
+    abbreviations = {driver_id: abbr for abbr, driver_id in driver_ids.items()}
+    todo = {}
+    for driver_id, lap_number in sorted(keys):
+        todo.setdefault(abbreviations[driver_id], []).append(lap_number)
+    return todo
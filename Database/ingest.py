@@ -0,0 +1,249 @@
+import argparse
+import os
+import time
+from contextlib import contextmanager
+
+import fastf1
+
+import common_path  # noqa: F401  (common/ on sys.path)
+import instrumentation
+from degradation import FIT_SESSION_TYPES, refresh_degradation
+from db_conector import db_connection, get_db_connection
+from insert_drivers import insert_drivers, session_drivers
+from incremental import (cache_content_hash, diff_lap_rows, removed_laps, session_cache_dir, store_hash,
+                         stored_hash, stored_laps, stored_telemetry_laps, sync_laps, telemetry_todo)
+from insert_lap import insert_laps, lap_rows, update_lap_flags
+from insert_sessions import bump_session_version, find_session_id, insert_session
+from insert_telemetry import insert_telemetry
+from insert_track_cords import insert_track_coords
+from migrate import apply_migrations
+from race_positions import POSITION_SESSION_TYPES, insert_race_positions
+from session_snapshot import SnapshotSession, is_current, load_snapshot, snapshot_dir, write_snapshot
+from summary_tables import refresh_summaries
+from telemetry_loader import TeeWriter, TelemetryWriter
+
+# ===============================
+# Configuration
+# ===============================
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache")
+
+
+# ===============================
+# Stage timing
+# ===============================
+@contextmanager
+def stage(name, timings, conn=None):
+    """
+    Time one pipeline stage and record it in timings and in the
+    instrumentation metrics (rows set on the yielded record, bytes via conn).
+    """
+    print(f"[{name}] ...")
+    start = time.perf_counter()
+    with instrumentation.stage(name, conn) as record:
+        try:
+            yield record
+        finally:
+            timings[name] = time.perf_counter() - start
+            print(f"[{name}] done in {timings[name]:.1f} s")
+
+
+def print_timings(timings):
+    total = sum(timings.values())
+    print("\nStage timings")
+    for name, seconds in timings.items():
+        print(f"  {name:<12} {seconds:8.1f} s")
+    print(f"  {'total':<12} {total:8.1f} s")
+
+
+# ===============================
+# Pipeline
+# ===============================
+def get_session(year, gp_name, session_type):
+    """FastF1 session object (not loaded yet) backed by the local cache."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    fastf1.Cache.enable_cache(CACHE_DIR)
+    return fastf1.get_session(year, gp_name, session_type)
+
+
+def load_session(year, gp_name, session_type, telemetry=True, session=None, snapshot=False,
+                 rebuild=False, content_hash=None, hash_cache=False):
+    """
+    Load a FastF1 session from the local cache exactly once. Returns
+    (session, content_hash of the cache files after loading); the hash is
+    None unless snapshot or hash_cache is set.
+
+    With snapshot=True a columnar snapshot built from the same cache files is
+    used instead of unpickling; without one (or with rebuild=True) the session
+    is loaded, written as a snapshot (merging every lap's telemetry once) and
+    read back from it. content_hash, when the caller already hashed the cache
+    files, is reused; the files are only hashed again after a FastF1 load,
+    which may have fetched new data.
+    """
+    if session is None:
+        session = get_session(year, gp_name, session_type)
+    cache_path = session_cache_dir(session, CACHE_DIR)
+    if snapshot and not rebuild and is_current(snapshot_dir(session), telemetry=telemetry):
+        if content_hash is None:
+            content_hash = cache_content_hash(cache_path)
+        cached = load_snapshot(session, content_hash=content_hash, telemetry=telemetry)
+        if cached is not None:
+            return cached, content_hash
+
+    session.load(laps=True, telemetry=telemetry, weather=False, messages=False)
+    if not (snapshot or hash_cache):
+        return session, None
+    content_hash = cache_content_hash(cache_path)
+    if snapshot:
+        path = write_snapshot(session, snapshot_dir(session), content_hash, telemetry)
+        return SnapshotSession(path), content_hash
+    return session, content_hash
+
+
+def ingest_session(year, gp_name, session_type, track_id=None, telemetry=True,
+                   telemetry_method="insert", workers=1, incremental=False,
+                   telemetry_backend="mysql", snapshot=False):
+    """
+    Load one session and write sessions, drivers, laps, telemetry and track
+    coordinates in a single run. Returns (session_id, timings).
+
+    With incremental=True the session is skipped when its cache files hash to
+    the value stored by the previous run; otherwise only new or changed laps
+    (and their telemetry, plus laps still missing telemetry) are written and
+    laps that disappeared from the source are deleted.
+
+    telemetry_backend is "mysql", "parquet" or "both". Parquet partitions are
+    always rewritten per driver, so they get every lap even in incremental mode.
+
+    snapshot=True loads the session from (or builds) its columnar snapshot,
+    see session_snapshot.py.
+    """
+    timings = {}
+    conn = get_db_connection()
+    try:
+        fastf1_session = get_session(year, gp_name, session_type)
+        content_hash = None
+        if incremental:
+            with stage("hash", timings, conn):
+                session_id = find_session_id(conn, year, gp_name, session_type)
+                content_hash = cache_content_hash(session_cache_dir(fastf1_session, CACHE_DIR))
+                unchanged = (session_id is not None and content_hash is not None
+                             and content_hash == stored_hash(conn, session_id))
+            if unchanged:
+                print(f"Session {session_id} unchanged since last ingest, skipping.")
+                return session_id, timings
+
+        with stage("load", timings):
+            session, content_hash = load_session(year, gp_name, session_type, telemetry=telemetry,
+                                                 session=fastf1_session, snapshot=snapshot,
+                                                 content_hash=content_hash, hash_cache=incremental)
+
+        with stage("sessions", timings, conn):
+            session_id = insert_session(conn, session, year, gp_name, session_type)
+
+        with stage("drivers", timings, conn) as record:
+            driver_ids = insert_drivers(conn, session_drivers(session))
+            record.rows = len(driver_ids)
+
+        laps_by_driver = None
+        with stage("laps", timings, conn) as record:
+            if incremental:
+                rows = lap_rows(session, session_id, driver_ids)
+                stored = stored_laps(conn, session_id)
+                new, changed = diff_lap_rows(rows, stored)
+                removed = removed_laps(rows, stored)
+                sync_laps(conn, session_id, new, changed, removed)
+                record.rows = len(new) + len(changed) + len(removed)
+                print(f"{len(new)} new laps, {len(changed)} changed, {len(removed)} removed, "
+                      f"{len(rows) - len(new) - len(changed)} unchanged")
+                if telemetry:
+                    laps_by_driver = telemetry_todo(rows, new + changed,
+                                                    stored_telemetry_laps(conn, session_id), driver_ids)
+            else:
+                n_laps = record.rows = insert_laps(conn, session, session_id, driver_ids)
+                print(f"{n_laps} laps")
+
+        if session_type in POSITION_SESSION_TYPES:
+            with stage("positions", timings, conn) as record:
+                record.rows = insert_race_positions(conn, session, session_id, driver_ids)
+
+        with stage("flags", timings, conn) as record:
+            record.rows = update_lap_flags(conn, session_id)
+
+        with stage("summaries", timings, conn):
+            refresh_summaries(conn, session_id)
+
+        if session_type in FIT_SESSION_TYPES:
+            with stage("degradation", timings, conn) as record:
+                record.rows = refresh_degradation(conn, session_id)
+
+        if telemetry:
+            with stage("telemetry", timings, conn) as record:
+                writers = []
+                if telemetry_backend in ("mysql", "both"):
+                    writers.append(TelemetryWriter(conn, method=telemetry_method, replace_laps=incremental))
+                if telemetry_backend in ("parquet", "both"):
+                    from parquet_writer import ParquetTelemetryWriter, lap_info_from_session
+                    writers.append(ParquetTelemetryWriter(year, driver_ids,
+                                                          lap_info_from_session(session, driver_ids)))
+                    laps_by_driver = None
+                writer = insert_telemetry(conn, session, session_id, driver_ids, workers=workers,
+                                          session_args=(year, gp_name, session_type),
+                                          laps_by_driver=laps_by_driver,
+                                          writer=writers[0] if len(writers) == 1 else TeeWriter(*writers))
+                writer.report()
+                record.rows = writer.rows_written
+
+            if track_id is not None:
+                with stage("track", timings, conn) as record:
+                    n_points = record.rows = insert_track_coords(conn, session, track_id)
+                    print(f"{n_points} track points")
+
+        bump_session_version(conn, session_id)
+        if incremental:
+            store_hash(conn, session_id, content_hash)
+    finally:
+        conn.close()
+
+    return session_id, timings
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Ingest one FastF1 session into MySQL.")
+    parser.add_argument("--year", type=int, required=True)
+    parser.add_argument("--gp", required=True, help='e.g. "Italian Grand Prix"')
+    parser.add_argument("--session", default="R", help="FastF1 session identifier (R, Q, FP1, ...)")
+    parser.add_argument("--track-id", type=int, help="track_coords id; omit to skip track coordinates")
+    parser.add_argument("--no-telemetry", action="store_true", help="skip telemetry and track coordinates")
+    parser.add_argument("--telemetry-method", choices=("insert", "infile"), default="insert")
+    parser.add_argument("--telemetry-backend", choices=("mysql", "parquet", "both"), default="mysql",
+                        help="where telemetry samples are stored")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="telemetry extraction processes (1 = serial)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="skip unchanged sessions and only upsert new or changed laps")
+    parser.add_argument("--snapshot", action="store_true",
+                        help="load from (or build) the columnar snapshot instead of unpickling the FastF1 cache")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    with instrumentation.run("ingest"):
+        with db_connection() as conn:
+            apply_migrations(conn)
+        session_id, timings = ingest_session(
+            args.year, args.gp, args.session,
+            track_id=args.track_id,
+            telemetry=not args.no_telemetry,
+            telemetry_method=args.telemetry_method,
+            workers=args.workers,
+            incremental=args.incremental,
+            telemetry_backend=args.telemetry_backend,
+            snapshot=args.snapshot,
+        )
+    print(f"\nSession {session_id} ingested.")
+    print_timings(timings)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+import pandas as pd
+import common_path  # noqa: F401  (common/ on sys.path)
 from db_conector import get_db_connection, get_cursor
 
 # List of drivers to insert
@@ -9,27 +11,63 @@ drivers = [
     {"driver_number": 44, "abbreviation": "HAM", "full_name": "Lewis Hamilton"}
 ]
 
-conn = get_db_connection()
-cursor = get_cursor(conn)
 
-driver_ids = {}
+def session_drivers(session):
+    """Build the drivers list from a loaded FastF1 session's results."""
+    return [
+        {
+            "driver_number": int(row['DriverNumber']),
+            "abbreviation": row['Abbreviation'],
+            "full_name": row['FullName']
+        }
+        for _, row in session.results.iterrows()
+        if pd.notna(row['DriverNumber']) and row['Abbreviation']
+    ]
 
-try:
+
+def insert_drivers(conn, drivers):
+    """
+    Insert the drivers that are not stored yet (matched on driver_number and
+    abbreviation) and return {abbreviation: driver_id} for all of them.
+    """
+    cursor = get_cursor(conn)
+    driver_ids = {}
+
+    select_query = """
+    SELECT driver_id FROM drivers
+    WHERE driver_number = %s AND abbreviation = %s
+    """
     insert_query = """
     INSERT INTO drivers (driver_number, abbreviation, full_name)
     VALUES (%s, %s, %s)
     """
-    for driver in drivers:
-        cursor.execute(insert_query, (driver["driver_number"], driver["abbreviation"], driver["full_name"]))
+    try:
+        for driver in drivers:
+            cursor.execute(select_query, (driver["driver_number"], driver["abbreviation"]))
+            row = cursor.fetchone()
+            if row:
+                driver_ids[driver["abbreviation"]] = row[0]
+                continue
+
+            cursor.execute(insert_query, (driver["driver_number"], driver["abbreviation"], driver["full_name"]))
+            driver_ids[driver["abbreviation"]] = cursor.lastrowid
+            print(f"Inserted {driver['full_name']} with driver_id = {cursor.lastrowid}")
         conn.commit()
-        driver_ids[driver["abbreviation"]] = cursor.lastrowid
-        print(f"Inserted {driver['full_name']} with driver_id = {cursor.lastrowid}")
+    finally:
+        cursor.close()
+
+    return driver_ids
+
 
-except Exception as e:
-    print(f"Error inserting drivers: {e}")
+if __name__ == "__main__":
+    conn = get_db_connection()
+    driver_ids = {}
 
-finally:
-    cursor.close()
-    conn.close()
+    try:
+        driver_ids = insert_drivers(conn, drivers)
+    except Exception as e:
+        print(f"Error inserting drivers: {e}")
+    finally:
+        conn.close()
 
-print("\nAll driver IDs:", driver_ids)
+    print("\nAll driver IDs:", driver_ids)
@@ -1,7 +1,8 @@
-import fastf1
 import pandas as pd
 import os
+import common_path  # noqa: F401  (common/ on sys.path)
 from db_conector import get_db_connection, get_cursor
+from lap_flags import compute_flags
 
 
 # to clean the Nan values put by panda and convert it to None
@@ -26,17 +27,6 @@ year = 2024
 gp_name = "Italian Grand Prix"
 session_type = "R"
 
-# ---------- load session ----------
-os.makedirs("cache", exist_ok=True)
-fastf1.Cache.enable_cache("cache")
-
-session = fastf1.get_session(year, gp_name, session_type)
-session.load()
-
-# ---------- database ----------
-conn = get_db_connection()
-cursor = get_cursor(conn)
-
 insert_query = """
                INSERT INTO laps (session_id, \
                                  driver_id, \
@@ -52,14 +42,17 @@ insert_query = """
                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) \
                """
 
-try:
+
+def lap_rows(session, session_id, driver_ids):
+    """Build the laps table rows for the given drivers of a loaded session."""
+    rows = []
     for abbreviation, driver_id in driver_ids.items():
         laps = session.laps.pick_drivers([abbreviation])
 
         for _, lap in laps.iterrows():
             pit_flag = 1 if pd.notna(lap['PitInTime']) else 0
 
-            cursor.execute(insert_query, (
+            rows.append((
                 session_id,
                 driver_id,
                 int(lap['LapNumber']),
@@ -72,13 +65,102 @@ try:
                 clean(lap['Stint']),
                 clean(lap['TrackStatus'])
             ))
-
-    conn.commit()
-    print("Laps inserted successfully.")
-
-except Exception as e:
-    print(f" Error inserting laps: {e}")
-
-finally:
-    cursor.close()
-    conn.close()
+    return rows
+
+
+def insert_laps(conn, session, session_id, driver_ids):
+    """Insert every lap of the given drivers and return the number of rows."""
+    rows = lap_rows(session, session_id, driver_ids)
+    cursor = get_cursor(conn)
+    try:
+        cursor.executemany(insert_query, rows)
+        conn.commit()
+    finally:
+        cursor.close()
+    return len(rows)
+
+
+# ===============================
+# Lap flags
+# ===============================
+FLAG_INPUT_COLUMNS = ["driver_id", "lap_number", "lap_time", "pit", "stint_number", "track_status"]
+
+FLAGS_TMP_DDL = """
+CREATE TEMPORARY TABLE lap_flags_tmp (
+    driver_id INT NOT NULL,
+    lap_number SMALLINT UNSIGNED NOT NULL,
+    flags SMALLINT UNSIGNED NOT NULL,
+    PRIMARY KEY (driver_id, lap_number)
+)
+"""
+
+FLAGS_UPDATE_QUERY = """
+UPDATE laps l
+JOIN lap_flags_tmp f
+  ON f.driver_id = l.driver_id
+ AND f.lap_number = l.lap_number
+SET l.flags = f.flags
+WHERE l.session_id = %s
+  AND l.flags <> f.flags
+"""
+
+
+def update_lap_flags(conn, session_id):
+    """
+    Recompute laps.flags (lap_flags.py) for every lap of a session: one
+    read, flags computed in NumPy, then a single UPDATE joined to a
+    temporary table. Computed flags never carry UNFLAGGED, so every new lap
+    is written. Returns the number of laps whose flags changed.
+    """
+    cursor = get_cursor(conn)
+    try:
+        cursor.execute(
+            f"SELECT {', '.join(FLAG_INPUT_COLUMNS)} FROM laps WHERE session_id = %s",
+            (session_id,)
+        )
+        laps = pd.DataFrame(cursor.fetchall(), columns=FLAG_INPUT_COLUMNS)
+        if laps.empty:
+            return 0
+        laps["lap_time"] = laps["lap_time"].astype(float)
+        flags = compute_flags(laps)
+
+        cursor.execute("DROP TEMPORARY TABLE IF EXISTS lap_flags_tmp")
+        cursor.execute(FLAGS_TMP_DDL)
+        cursor.executemany(
+            "INSERT INTO lap_flags_tmp (driver_id, lap_number, flags) VALUES (%s, %s, %s)",
+            [(int(d), int(n), int(f)) for d, n, f in zip(laps["driver_id"], laps["lap_number"], flags)]
+        )
+        cursor.execute(FLAGS_UPDATE_QUERY, (session_id,))
+        changed = cursor.rowcount
+        cursor.execute("DROP TEMPORARY TABLE lap_flags_tmp")
+        conn.commit()
+        return changed
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+if __name__ == "__main__":
+    import fastf1
+
+    # ---------- load session ----------
+    os.makedirs("cache", exist_ok=True)
+    fastf1.Cache.enable_cache("cache")
+
+    session = fastf1.get_session(year, gp_name, session_type)
+    session.load()
+
+    # ---------- database ----------
+    conn = get_db_connection()
+
+    try:
+        insert_laps(conn, session, session_id, driver_ids)
+        print("Laps inserted successfully.")
+
+    except Exception as e:
+        print(f" Error inserting laps: {e}")
+
+    finally:
+        conn.close()
@@ -1,34 +1,82 @@
-import fastf1
 import os
 
+import common_path  # noqa: F401  (common/ on sys.path)
 from db_conector import *
-os.makedirs("cache", exist_ok=True)
-fastf1.Cache.enable_cache("cache")
 
 year = 2024
 gp_name= "Italian Grand Prix"
 session_type = "R"
 
-session = fastf1.get_session(year, gp_name, session_type)
-session.load()
+# Served by uq_sessions_event (migrations/0002)
+FIND_SESSION_QUERY = "SELECT session_id FROM sessions WHERE year = %s AND grand_prix = %s AND session_type = %s"
 
-#Converting date into a string format
-session_date = session.date.strftime("%Y-%m-%d") if session.date else None
+def bump_session_version(conn, session_id):
+    """Invalidate cached analysis queries for a session after its data changed."""
+    cursor = get_cursor(conn)
+    try:
+        cursor.execute(
+            """
+            INSERT INTO session_versions (session_id, version) VALUES (%s, 1)
+            ON DUPLICATE KEY UPDATE version = version + 1
+            """,
+            (session_id,)
+        )
+        conn.commit()
+    finally:
+        cursor.close()
 
-conn = get_db_connection()
-cursor = get_cursor(conn)
 
-try:
-    insert_query = """
-    INSERT INTO sessions (year, grand_prix, session_type, date)
-    VALUES ( %s, %s, %s, %s)
+def find_session_id(conn, year, gp_name, session_type):
+    """Return the stored session_id for (year, grand_prix, session_type) or None."""
+    cursor = get_cursor(conn)
+    try:
+        cursor.execute(FIND_SESSION_QUERY, (year, gp_name, session_type))
+        row = cursor.fetchone()
+        return row[0] if row else None
+    finally:
+        cursor.close()
+
+
+def insert_session(conn, session, year, gp_name, session_type):
+    """
+    Return the session_id for (year, grand_prix, session_type), inserting the
+    session row if it does not exist yet.
     """
-    cursor.execute(insert_query, ( year, gp_name, session_type, session_date))
-    conn.commit()
-    session_id = cursor.lastrowid
-    print(f"Session '{session_id}' inserted successfully.")
-except Exception as e:
-    print(f"Error inserting session: {e}")
-finally:
-    cursor.close()
-    conn.close()
+    session_id = find_session_id(conn, year, gp_name, session_type)
+    if session_id is not None:
+        return session_id
+
+    #Converting date into a string format
+    session_date = session.date.strftime("%Y-%m-%d") if session.date else None
+
+    cursor = get_cursor(conn)
+    try:
+        insert_query = """
+        INSERT INTO sessions (year, grand_prix, session_type, date)
+        VALUES ( %s, %s, %s, %s)
+        """
+        cursor.execute(insert_query, ( year, gp_name, session_type, session_date))
+        conn.commit()
+        return cursor.lastrowid
+    finally:
+        cursor.close()
+
+
+if __name__ == "__main__":
+    import fastf1
+
+    os.makedirs("cache", exist_ok=True)
+    fastf1.Cache.enable_cache("cache")
+
+    session = fastf1.get_session(year, gp_name, session_type)
+    session.load()
+
+    conn = get_db_connection()
+
+    try:
+        session_id = insert_session(conn, session, year, gp_name, session_type)
+        print(f"Session '{session_id}' inserted successfully.")
+    except Exception as e:
+        print(f"Error inserting session: {e}")
+    finally:
+        conn.close()
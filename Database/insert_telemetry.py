@@ -1,13 +1,10 @@
 import fastf1
-import pandas as pd
 import os
-from db_conector import get_db_connection, get_cursor
-
-
-def clean(value):
-    if pd.isna(value):
-        return None
-    return value
+import time
+import common_path  # noqa: F401  (common/ on sys.path)
+from db_conector import get_db_connection
+from instrumentation import log_event
+from telemetry_loader import TelemetryWriter, extract_parallel, iter_lap_telemetry, telemetry_columns
 
 # ---------- configuration ----------
 session_id = 1  # from sessions table
@@ -23,71 +20,73 @@ year = 2024
 gp_name = "Italian Grand Prix"
 session_type = "R"
 
-# ---------- load session ----------
-os.makedirs("cache", exist_ok=True)
-fastf1.Cache.enable_cache("cache")
-
-session = fastf1.get_session(year, gp_name, session_type)
-session.load(telemetry=True)
-
-# ---------- database ----------
-conn = get_db_connection()
-cursor = get_cursor(conn)
-
-insert_query = """
-INSERT INTO telemetry (
-    session_id,
-    driver_id,
-    lap_number,
-    sample_index,
-    time,
-    distance,
-    speed,
-    throttle,
-    brake,
-    gear,
-    drs,
-    rpm
-)
-VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-"""
-
-try:
-    for abbr, driver_id in driver_ids.items():
-        laps = session.laps.pick_drivers(abbr)
-
-        for _, lap in laps.iterrows():
-            if lap['LapTime'] is None:
-                continue  # skip incomplete laps
-
-            tel = lap.get_telemetry()
-            rows = []
-
-            for idx, row in tel.iterrows():
-                rows.append((
-                    session_id,
-                    driver_id,
-                    int(lap['LapNumber']),
-                    int(idx),
-                    clean(row['Time'].total_seconds() if row['Time'] is not None else None),
-                    clean(row['Distance']),
-                    clean(row['Speed']),
-                    clean(row['Throttle']),
-                    clean(row['Brake']),
-                    clean(row['nGear']),
-                    clean(row['DRS']),
-                    clean(row['RPM'])
-                ))
-
-            if rows:
-                cursor.executemany(insert_query, rows)
-
-        conn.commit()
-        print(f"Telemetry inserted for {abbr}")
-
-except Exception as e:
-    print(f"Error inserting telemetry: {e}")
-
-finally:
-    cursor.close()
-    conn.close()
+LOAD_METHOD = "insert"  # "insert" (multi-row INSERT) or "infile" (LOAD DATA LOCAL INFILE)
+WORKERS = os.cpu_count()  # extraction processes, 1 = serial
+LAPS_PER_TASK = None      # None = one task per driver, otherwise chunks of laps
+
+
+def insert_telemetry(conn, session, session_id, driver_ids, method=LOAD_METHOD, workers=1,
+                     laps_per_task=None, session_args=None, laps_by_driver=None, replace_laps=False,
+                     writer=None):
+    """
+    Write the telemetry of every timed lap of the given drivers and return the
+    TelemetryWriter (rows written, rows/s). workers > 1 switches to the
+    process-pool pipeline, which needs session_args = (year, gp_name, session_type).
+    laps_by_driver = {abbreviation: lap_numbers} limits the laps written and
+    replace_laps=True replaces the stored samples of each lap written. A different writer
+    (e.g. ParquetTelemetryWriter) can be passed in place of the MySQL one.
+    If extraction fails the buffered rows are dropped, not written.
+    """
+    if writer is None:
+        writer = TelemetryWriter(conn, method=method, replace_laps=replace_laps)
+    try:
+        if workers > 1:
+            extract_parallel(writer, session_args, session_id, driver_ids,
+                             workers=workers, laps_per_task=laps_per_task, session=session,
+                             laps_by_driver=laps_by_driver)
+        else:
+            for abbr, driver_id in driver_ids.items():
+                lap_numbers = None if laps_by_driver is None else laps_by_driver.get(abbr)
+                if laps_by_driver is not None and not lap_numbers:
+                    continue
+                for lap_number, tel in iter_lap_telemetry(session, abbr, lap_numbers):
+                    writer.add(telemetry_columns(tel, session_id, driver_id, lap_number))
+
+                writer.flush()
+                print(f"Telemetry inserted for {abbr}")
+                log_event("telemetry_inserted", driver=abbr, rows_written=writer.rows_written)
+    except BaseException:
+        writer.close(flush=False)
+        raise
+    writer.close()
+    return writer
+
+
+def main():
+    # ---------- load session ----------
+    os.makedirs("cache", exist_ok=True)
+    fastf1.Cache.enable_cache("cache")
+
+    session = fastf1.get_session(year, gp_name, session_type)
+    session.load(telemetry=True)
+
+    # ---------- database ----------
+    conn = get_db_connection()
+    start = time.perf_counter()
+
+    try:
+        writer = insert_telemetry(conn, session, session_id, driver_ids, LOAD_METHOD, WORKERS,
+                                  LAPS_PER_TASK, (year, gp_name, session_type))
+        writer.report()
+
+    except Exception as e:
+        print(f"Error inserting telemetry: {e}")
+
+    finally:
+        conn.close()
+
+    print(f"Total telemetry time: {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,54 +1,83 @@
 import fastf1
-import pandas as pd
+import common_path  # noqa: F401  (common/ on sys.path)
 from db_conector import get_db_connection, get_cursor
+from track_geometry import centreline_rows, reference_telemetry, resample_centreline
 import os
 
 # ===============================
 # Configuration
 # ===============================
-os.makedirs("cache", exist_ok=True)
-fastf1.Cache.enable_cache("cache")
-
 YEAR = 2024
 GP_NAME = "Italian Grand Prix"
 SESSION_TYPE = "R"
 TRACK_ID = 1  # Identifier for Monza in your track_coords table
 
-# ===============================
-# Load session
-# ===============================
-session = fastf1.get_session(YEAR, GP_NAME, SESSION_TYPE)
-session.load()  # loads laps
+STEP = 1.0     # metres between stored centreline points
+N_LAPS = 5     # clean laps merged into the centreline
+
+insert_query = """
+INSERT INTO track_coords (track_id, distance, x, y)
+VALUES (%s, %s, %s, %s)
+"""
+
+def get_track_id(conn, name):
+    """Return the track_id for a circuit name, creating the tracks row if needed."""
+    cursor = get_cursor(conn)
+    try:
+        cursor.execute("SELECT track_id FROM tracks WHERE name = %s", (name,))
+        row = cursor.fetchone()
+        if row:
+            return row[0]
+        cursor.execute("INSERT INTO tracks (name) VALUES (%s)", (name,))
+        conn.commit()
+        return cursor.lastrowid
+    finally:
+        cursor.close()
+
 
 # ===============================
 # Extract track coordinates
 # ===============================
-# Take telemetry from first driver as reference
-first_driver = session.drivers[0]
-telemetry = session.laps.pick_driver(first_driver).get_telemetry()
+def track_coordinates(session, step=STEP, n_laps=N_LAPS):
+    """Centreline resampled every `step` metres from the session's fastest clean laps."""
+    return resample_centreline(reference_telemetry(session, n_laps), step)
 
-# Build DataFrame of distance + X/Y coordinates
-track_df = telemetry[['Distance', 'X', 'Y']].drop_duplicates().reset_index(drop=True)
-track_df['track_id'] = TRACK_ID
 
 # ===============================
 # Insert into MySQL
 # ===============================
-conn = get_db_connection()
-cursor = get_cursor(conn)
+def insert_track_coords(conn, session, track_id, step=STEP, n_laps=N_LAPS):
+    """Replace the track's coordinates in one batch and return the number of points."""
+    rows = centreline_rows(track_coordinates(session, step, n_laps), track_id)
+    cursor = get_cursor(conn)
+    try:
+        cursor.execute("DELETE FROM track_coords WHERE track_id = %s", (track_id,))
+        cursor.executemany(insert_query, rows)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+    return len(rows)
 
-insert_query = """
-INSERT IGNORE INTO track_coords (track_id, distance, x, y)
-VALUES (%s, %s, %s, %s)
-"""
 
-try:
-    for _, row in track_df.iterrows():
-        cursor.execute(insert_query, (row['track_id'], row['Distance'], row['X'], row['Y']))
-    conn.commit()
-    print(f"Track coordinates for '{GP_NAME}' inserted successfully ({len(track_df)} points).")
-except Exception as e:
-    print(f"Error inserting track coordinates: {e}")
-finally:
-    cursor.close()
-    conn.close()
+if __name__ == "__main__":
+    os.makedirs("cache", exist_ok=True)
+    fastf1.Cache.enable_cache("cache")
+
+    # ===============================
+    # Load session
+    # ===============================
+    session = fastf1.get_session(YEAR, GP_NAME, SESSION_TYPE)
+    session.load()  # loads laps
+
+    conn = get_db_connection()
+
+    try:
+        n_points = insert_track_coords(conn, session, TRACK_ID)
+        print(f"Track coordinates for '{GP_NAME}' inserted successfully ({n_points} points).")
+    except Exception as e:
+        print(f"Error inserting track coordinates: {e}")
+    finally:
+        conn.close()
@@ -0,0 +1,225 @@
+import argparse
+import glob
+import os
+import sys
+
+import common_path  # noqa: F401  (common/ on sys.path)
+from db_conector import get_db_connection, get_cursor
+from insert_sessions import FIND_SESSION_QUERY
+
+# The --check queries live with the analyses
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Analysis"))
+import df_Queries  # noqa: E402
+from track_index import TRACK_COORDS_QUERY  # noqa: E402
+
+# ===============================
+# Configuration
+# ===============================
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+OPTIONAL_DIR = os.path.join(MIGRATIONS_DIR, "optional")
+
+MIGRATIONS_DDL = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version VARCHAR(100) PRIMARY KEY,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+# Queries the analyses run, with sample parameters, checked by --check. The
+# SQL is imported from the modules that run it, so the check cannot drift.
+KNOWN_QUERIES = {
+    "get_laps": (df_Queries.LAPS_QUERY, (1,)),
+    "get_sectors": (df_Queries.SECTORS_QUERY, (1,)),
+    "get_telemetry": (df_Queries.TELEMETRY_QUERY, (1,)),
+    "get_session_laps": (df_Queries.SESSION_LAPS_QUERY, (1,)),
+    "get_clean_laps": (df_Queries.CLEAN_LAPS_QUERY, (1,)),
+    "get_lap_telemetry": (df_Queries.LAP_TELEMETRY_QUERY, (1, 1, 5)),
+    "get_lap_stats": (df_Queries.LAP_STATS_QUERY, (1,)),
+    "get_sector_stats": (df_Queries.SECTOR_STATS_QUERY, (1,)),
+    "get_race_positions": (df_Queries.RACE_POSITIONS_QUERY, (1,)),
+    "get_session_drivers": (df_Queries.SESSION_DRIVERS_QUERY, (1,)),
+    "get_stint_degradation": (df_Queries.STINT_DEGRADATION_QUERY, (1,)),
+    "get_season_degradation": (df_Queries.SEASON_DEGRADATION_QUERY, (2024,)),
+    "track_coords": (TRACK_COORDS_QUERY, (1,)),
+    "find_session_id": (FIND_SESSION_QUERY, (2024, "Italian Grand Prix", "R")),
+}
+
+# Dimension tables small enough that a full scan is the right plan
+# (table names or the aliases EXPLAIN reports for them)
+SMALL_TABLES = {"drivers", "d", "tracks"}
+
+
+# ===============================
+# Migrations
+# ===============================
+# Per-session tables cleared when a duplicate sessions row is removed
+SESSION_TABLES = ("source_hashes", "session_versions", "lap_stats", "sector_stats")
+
+
+def dedupe_sessions(conn):
+    """
+    Remove duplicate sessions rows (same year / grand prix / session type)
+    left by the original insert_sessions.py, so uq_sessions_event can be
+    created. Per event the session holding laps is kept (the lowest id if
+    none has laps); duplicates without laps are deleted. If laps were loaded
+    into more than one duplicate the migration stops, since merging them
+    cannot be done safely here.
+    """
+    cursor = get_cursor(conn)
+    try:
+        cursor.execute("""
+            SELECT s.year, s.grand_prix, s.session_type, s.session_id,
+                   EXISTS (SELECT 1 FROM laps l WHERE l.session_id = s.session_id)
+            FROM sessions s
+            JOIN (SELECT year, grand_prix, session_type
+                  FROM sessions
+                  GROUP BY year, grand_prix, session_type
+                  HAVING COUNT(*) > 1) dup
+              ON dup.year = s.year AND dup.grand_prix = s.grand_prix AND dup.session_type = s.session_type
+            ORDER BY s.year, s.grand_prix, s.session_type, s.session_id
+        """)
+        events = {}
+        for year, grand_prix, session_type, session_id, has_laps in cursor.fetchall():
+            events.setdefault((year, grand_prix, session_type), []).append((session_id, bool(has_laps)))
+
+        conflicts = []
+        doomed = []
+        for event, sessions in events.items():
+            with_laps = [session_id for session_id, has_laps in sessions if has_laps]
+            if len(with_laps) > 1:
+                conflicts.append(f"{event[0]} {event[1]} {event[2]}: sessions {with_laps}")
+                continue
+            keep = with_laps[0] if with_laps else sessions[0][0]
+            doomed += [session_id for session_id, _ in sessions if session_id != keep]
+        if conflicts:
+            raise RuntimeError(
+                "Cannot create uq_sessions_event: laps were loaded into several copies of the same "
+                "session. Keep one session_id per event (move or delete the other laps) and rerun:\n  "
+                + "\n  ".join(conflicts)
+            )
+
+        if doomed:
+            placeholders = ", ".join(["%s"] * len(doomed))
+            for table in SESSION_TABLES + ("sessions",):
+                cursor.execute(f"DELETE FROM {table} WHERE session_id IN ({placeholders})", doomed)
+            cursor.execute(f"UPDATE ingest_jobs SET session_id = NULL WHERE session_id IN ({placeholders})",
+                           doomed)
+            conn.commit()
+            print(f"Removed {len(doomed)} duplicate sessions rows")
+    finally:
+        cursor.close()
+
+
+def backfill_lap_flags(conn):
+    """Flag the laps of sessions ingested before laps.flags existed."""
+    from insert_lap import update_lap_flags
+
+    cursor = get_cursor(conn)
+    try:
+        cursor.execute("SELECT DISTINCT session_id FROM laps")
+        session_ids = [row[0] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+    for session_id in session_ids:
+        update_lap_flags(conn, session_id)
+
+
+# Data steps run once, right before / after the migration of the same version
+PRE_MIGRATION = {
+    "0002_analysis_indexes": dedupe_sessions,
+}
+POST_MIGRATION = {
+    "0004_lap_flags": backfill_lap_flags,
+}
+
+
+def split_statements(sql):
+    """Split a migration file into statements, dropping -- comment lines."""
+    lines = [line for line in sql.splitlines() if not line.strip().startswith("--")]
+    return [statement.strip() for statement in "\n".join(lines).split(";") if statement.strip()]
+
+
+def migration_files(with_partitioning=False):
+    """Migration files in version order; optional/ ones are numbered after the base series."""
+    files = glob.glob(os.path.join(MIGRATIONS_DIR, "*.sql"))
+    if with_partitioning:
+        files += glob.glob(os.path.join(OPTIONAL_DIR, "*.sql"))
+    return sorted(files, key=os.path.basename)
+
+
+def apply_migrations(conn, with_partitioning=False, verbose=False):
+    """Apply every migration not yet recorded in schema_migrations, in order."""
+    cursor = get_cursor(conn)
+    try:
+        cursor.execute(MIGRATIONS_DDL)
+        cursor.execute("SELECT version FROM schema_migrations")
+        applied = {row[0] for row in cursor.fetchall()}
+
+        for path in migration_files(with_partitioning):
+            version = os.path.splitext(os.path.basename(path))[0]
+            if version in applied:
+                continue
+            if version in PRE_MIGRATION:
+                PRE_MIGRATION[version](conn)
+            with open(path, encoding="utf-8") as f:
+                for statement in split_statements(f.read()):
+                    cursor.execute(statement)
+            if version in POST_MIGRATION:
+                conn.commit()
+                POST_MIGRATION[version](conn)
+            cursor.execute("INSERT INTO schema_migrations (version) VALUES (%s)", (version,))
+            conn.commit()
+            if verbose:
+                print(f"Applied {version}")
+    finally:
+        cursor.close()
+
+
+# ===============================
+# EXPLAIN check
+# ===============================
+def full_scans(conn, queries=KNOWN_QUERIES):
+    """{query name: [tables]} for every known query whose plan scans a large table."""
+    cursor = conn.cursor(dictionary=True, buffered=True)
+    problems = {}
+    try:
+        for name, (query, params) in queries.items():
+            cursor.execute("EXPLAIN " + query, params)
+            tables = [
+                row["table"] for row in cursor.fetchall()
+                if row["type"] == "ALL" and row["table"] not in SMALL_TABLES
+            ]
+            if tables:
+                problems[name] = tables
+    finally:
+        cursor.close()
+    return problems
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Apply schema migrations and check query plans.")
+    parser.add_argument("--with-partitioning", action="store_true",
+                        help="also apply optional/ migrations (partitions telemetry by session)")
+    parser.add_argument("--check", action="store_true",
+                        help="EXPLAIN the known analysis queries and fail on full table scans")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    conn = get_db_connection()
+    try:
+        apply_migrations(conn, args.with_partitioning, verbose=True)
+        if args.check:
+            problems = full_scans(conn)
+            for name, tables in problems.items():
+                print(f"FULL SCAN in {name}: {', '.join(tables)}")
+            if problems:
+                sys.exit(1)
+            print(f"All {len(KNOWN_QUERIES)} known queries use indexes.")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+-- Base schema with compact column types.
+-- Ids stay INT so they match the foreign keys of databases created before
+-- the migrations existed. Tables that already exist are left untouched.
+
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id INT AUTO_INCREMENT PRIMARY KEY,
+    year SMALLINT UNSIGNED NOT NULL,
+    grand_prix VARCHAR(100) NOT NULL,
+    session_type VARCHAR(10) NOT NULL,
+    date DATE
+);
+
+CREATE TABLE IF NOT EXISTS drivers (
+    driver_id INT AUTO_INCREMENT PRIMARY KEY,
+    driver_number SMALLINT UNSIGNED NOT NULL,
+    abbreviation CHAR(3) NOT NULL,
+    full_name VARCHAR(100) NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS laps (
+    session_id INT NOT NULL,
+    driver_id INT NOT NULL,
+    lap_number SMALLINT UNSIGNED NOT NULL,
+    lap_time FLOAT,
+    sector1_time FLOAT,
+    sector2_time FLOAT,
+    sector3_time FLOAT,
+    pit TINYINT UNSIGNED NOT NULL DEFAULT 0,
+    tyre_compound VARCHAR(12),
+    stint_number TINYINT UNSIGNED,
+    track_status VARCHAR(10),
+    PRIMARY KEY (session_id, driver_id, lap_number),
+    CONSTRAINT fk_laps_sessions FOREIGN KEY (session_id) REFERENCES sessions (session_id),
+    CONSTRAINT fk_laps_drivers FOREIGN KEY (driver_id) REFERENCES drivers (driver_id)
+);
+
+CREATE TABLE IF NOT EXISTS telemetry (
+    session_id INT NOT NULL,
+    driver_id INT NOT NULL,
+    lap_number SMALLINT UNSIGNED NOT NULL,
+    sample_index INT UNSIGNED NOT NULL,
+    time FLOAT,
+    distance FLOAT,
+    speed FLOAT,
+    throttle TINYINT UNSIGNED,
+    brake TINYINT UNSIGNED,
+    gear TINYINT UNSIGNED,
+    drs TINYINT UNSIGNED,
+    rpm SMALLINT UNSIGNED,
+    PRIMARY KEY (session_id, driver_id, lap_number, sample_index),
+    CONSTRAINT fk_telemetry_laps FOREIGN KEY (session_id, driver_id, lap_number)
+        REFERENCES laps (session_id, driver_id, lap_number)
+);
+
+CREATE TABLE IF NOT EXISTS tracks (
+    track_id INT AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(100) NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS track_coords (
+    track_id INT NOT NULL,
+    distance DECIMAL(8, 2) NOT NULL,
+    x FLOAT NOT NULL,
+    y FLOAT NOT NULL,
+    PRIMARY KEY (track_id, distance)
+);
+
+-- Ingestion bookkeeping
+CREATE TABLE IF NOT EXISTS ingest_jobs (
+    year SMALLINT NOT NULL,
+    grand_prix VARCHAR(100) NOT NULL,
+    session_type VARCHAR(10) NOT NULL,
+    location VARCHAR(100),
+    status VARCHAR(10) NOT NULL DEFAULT 'pending',
+    attempts INT NOT NULL DEFAULT 0,
+    session_id INT,
+    seconds FLOAT,
+    error TEXT,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (year, grand_prix, session_type)
+);
+
+CREATE TABLE IF NOT EXISTS source_hashes (
+    session_id INT PRIMARY KEY,
+    content_hash CHAR(64) NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+-- Bumped on every (re)load of a session; Analysis/query_cache.py keys cached
+-- query results on it.
+CREATE TABLE IF NOT EXISTS session_versions (
+    session_id INT PRIMARY KEY,
+    version INT NOT NULL DEFAULT 1
+);
+
+-- Summary tables rebuilt by Database/summary_tables.py
+CREATE TABLE IF NOT EXISTS lap_stats (
+    session_id INT NOT NULL,
+    driver_id INT NOT NULL,
+    stint_number TINYINT UNSIGNED NOT NULL,
+    tyre_compound VARCHAR(12) NOT NULL,
+    laps SMALLINT UNSIGNED NOT NULL,
+    mean_lap_time DOUBLE,
+    best_lap_time DOUBLE,
+    std_lap_time DOUBLE,
+    PRIMARY KEY (session_id, driver_id, stint_number, tyre_compound)
+);
+
+CREATE TABLE IF NOT EXISTS sector_stats (
+    session_id INT NOT NULL,
+    driver_id INT NOT NULL,
+    laps SMALLINT UNSIGNED NOT NULL,
+    mean_sector1 DOUBLE,
+    mean_sector2 DOUBLE,
+    mean_sector3 DOUBLE,
+    best_sector1 DOUBLE,
+    best_sector2 DOUBLE,
+    best_sector3 DOUBLE,
+    PRIMARY KEY (session_id, driver_id)
+);
@@ -0,0 +1,23 @@
+-- Secondary indexes for the queries in Analysis/ and the ingestion lookups.
+
+-- get_sectors / get_telemetry / consistency: WHERE session_id = ? AND pit = 0,
+-- covering the columns the lap queries read.
+CREATE INDEX idx_laps_session_pit
+    ON laps (session_id, pit, driver_id, lap_number, lap_time);
+
+-- Single-lap telemetry: WHERE session_id = ? AND driver_id = ? AND lap_number = ?
+-- ORDER BY distance, read in index order without a filesort.
+CREATE INDEX idx_telemetry_lap_distance
+    ON telemetry (session_id, driver_id, lap_number, distance);
+
+-- find_session_id() / insert_session()
+CREATE UNIQUE INDEX uq_sessions_event
+    ON sessions (year, grand_prix, session_type);
+
+-- insert_drivers() lookup
+CREATE INDEX idx_drivers_number_abbreviation
+    ON drivers (driver_number, abbreviation);
+
+-- register_jobs(): pending / running jobs
+CREATE INDEX idx_ingest_jobs_status
+    ON ingest_jobs (status, year);
@@ -0,0 +1,21 @@
+-- Fuel-corrected tyre degradation per driver / stint / compound, fitted by
+-- Database/degradation.py.
+
+CREATE TABLE IF NOT EXISTS stint_degradation (
+    session_id INT NOT NULL,
+    driver_id INT NOT NULL,
+    stint_number TINYINT UNSIGNED NOT NULL,
+    tyre_compound VARCHAR(12) NOT NULL,
+    laps SMALLINT UNSIGNED NOT NULL,
+    first_lap SMALLINT UNSIGNED NOT NULL,
+    last_lap SMALLINT UNSIGNED NOT NULL,
+    base_lap_time DOUBLE,
+    deg_per_lap DOUBLE,
+    r_squared DOUBLE,
+    residual_std DOUBLE,
+    PRIMARY KEY (session_id, driver_id, stint_number, tyre_compound)
+);
+
+-- Season-wide compound comparisons: WHERE tyre_compound = ? across sessions
+CREATE INDEX idx_stint_degradation_compound
+    ON stint_degradation (tyre_compound, session_id);
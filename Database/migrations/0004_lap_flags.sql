@@ -0,0 +1,11 @@
+-- Bit flags per lap (common/lap_flags.py), computed by the ingestion
+-- pipeline. flags = 0 is a clean, representative lap. New laps start as
+-- UNFLAGGED (128) until their flags are computed, so a lap whose flags step
+-- never ran is not taken for a clean one. Existing sessions are flagged by
+-- the Python step migrate.py runs after this file.
+
+ALTER TABLE laps ADD COLUMN flags SMALLINT UNSIGNED NOT NULL DEFAULT 128;
+
+-- get_clean_laps(): WHERE session_id = ? AND flags = 0, covering the lap columns
+CREATE INDEX idx_laps_session_flags
+    ON laps (session_id, flags, driver_id, lap_number, lap_time);
@@ -0,0 +1,18 @@
+-- Running order after every lap, rebuilt by Database/race_positions.py.
+-- race_time is seconds from the start to the end of the lap; gap_to_leader
+-- and interval_ahead are NULL for the leader.
+
+CREATE TABLE IF NOT EXISTS race_positions (
+    session_id INT NOT NULL,
+    driver_id INT NOT NULL,
+    lap_number SMALLINT UNSIGNED NOT NULL,
+    race_time DOUBLE NOT NULL,
+    position TINYINT UNSIGNED NOT NULL,
+    gap_to_leader DOUBLE,
+    interval_ahead DOUBLE,
+    PRIMARY KEY (session_id, driver_id, lap_number)
+);
+
+-- Running order of one lap: WHERE session_id = ? AND lap_number = ? ORDER BY position
+CREATE INDEX idx_race_positions_lap
+    ON race_positions (session_id, lap_number, position);
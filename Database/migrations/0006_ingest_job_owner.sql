@@ -0,0 +1,7 @@
+-- Owner ("host:pid" of the worker) and liveness of running ingest jobs.
+-- season.py requeues a 'running' job once its owner process is gone or its
+-- heartbeat is older than F1_STALE_JOB_SECONDS.
+
+ALTER TABLE ingest_jobs ADD COLUMN owner VARCHAR(100);
+
+ALTER TABLE ingest_jobs ADD COLUMN heartbeat_at TIMESTAMP NULL;
@@ -0,0 +1,19 @@
+-- Optional: hash-partition telemetry by session so per-session scans and
+-- deletes only touch one partition. InnoDB does not allow foreign keys on
+-- partitioned tables, so the foreign keys of telemetry are dropped. Their
+-- names are looked up in information_schema: databases created before the
+-- migrations carry server-generated names (telemetry_ibfk_1, ...), not
+-- fk_telemetry_laps.
+-- Applied only with: python migrate.py --with-partitioning
+
+SET @drop_fks = (
+    SELECT GROUP_CONCAT(CONCAT('DROP FOREIGN KEY `', CONSTRAINT_NAME, '`') SEPARATOR ', ')
+    FROM information_schema.REFERENTIAL_CONSTRAINTS
+    WHERE CONSTRAINT_SCHEMA = DATABASE() AND TABLE_NAME = 'telemetry'
+);
+SET @sql = IF(@drop_fks IS NULL, 'DO 0', CONCAT('ALTER TABLE telemetry ', @drop_fks));
+PREPARE drop_fks FROM @sql;
+EXECUTE drop_fks;
+DEALLOCATE PREPARE drop_fks;
+
+ALTER TABLE telemetry PARTITION BY HASH (session_id) PARTITIONS 64;
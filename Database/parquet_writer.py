@@ -0,0 +1,165 @@
+import os
+import shutil
+import time
+import uuid
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from telemetry_loader import column_length, concat_columns
+
+# ===============================
+# Configuration
+# ===============================
+# Telemetry is stored as <root>/season=<year>/session_id=<id>/driver=<abbr>/part-<n>.parquet
+PARQUET_ROOT = os.environ.get(
+    "F1_PARQUET_ROOT",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "parquet")
+)
+
+# Compact on-disk dtypes. Missing samples of integer / boolean columns are
+# stored as Arrow nulls (validity bitmap), not as 0.
+PARQUET_DTYPES = {
+    "driver_id": np.uint16,
+    "lap_number": np.uint16,
+    "sample_index": np.uint32,
+    "time": np.float32,
+    "distance": np.float32,
+    "speed": np.float32,
+    "throttle": np.uint8,
+    "brake": np.bool_,
+    "gear": np.uint8,
+    "drs": np.uint8,
+    "rpm": np.uint16,
+    "lap_time": np.float32,
+    "pit": np.bool_,
+}
+
+
+def session_dir(year, session_id, root=PARQUET_ROOT):
+    return os.path.join(root, f"season={year}", f"session_id={session_id}")
+
+
+def lap_info_from_session(session, driver_ids):
+    """{(driver_id, lap_number): (lap_time, pit)} for the laps of a loaded session."""
+    laps = session.laps[session.laps['Driver'].isin(list(driver_ids))]
+    driver = laps['Driver'].map(driver_ids).to_numpy()
+    lap_number = laps['LapNumber'].to_numpy()
+    lap_time = laps['LapTime'].dt.total_seconds().to_numpy()
+    pit = laps['PitInTime'].notna().to_numpy()
+    return {
+        (int(d), int(n)): (t, p)
+        for d, n, t, p in zip(driver, lap_number, lap_time, pit)
+    }
+
+
+def to_table(cols, driver_id, lap_info):
+    """Build an Arrow table with compact dtypes from one driver's telemetry column dict."""
+    lap_numbers = np.unique(cols["lap_number"])
+    per_lap = [lap_info.get((driver_id, int(n)), (np.nan, False)) for n in lap_numbers]
+    index = np.searchsorted(lap_numbers, cols["lap_number"])
+    lap_time = np.array([v[0] for v in per_lap], dtype=np.float64)[index]
+    pit = np.array([v[1] for v in per_lap], dtype=bool)[index]
+
+    values = {name: cols[name] for name in PARQUET_DTYPES if name in cols}
+    values["lap_time"] = lap_time
+    values["pit"] = pit
+
+    arrays = {}
+    for name, dtype in PARQUET_DTYPES.items():
+        array = np.asarray(values[name])
+        missing = None
+        if np.issubdtype(dtype, np.integer) or dtype is np.bool_:
+            array = array.astype(np.float64)
+            if np.isnan(array).any():
+                missing = np.isnan(array)
+                array = np.where(missing, 0.0, array)
+        arrays[name] = pa.array(array.astype(dtype), mask=missing)
+    return pa.table(arrays)
+
+
+class ParquetTelemetryWriter:
+    """
+    Same add/flush/close/report interface as TelemetryWriter, but writes each
+    driver's telemetry to its own Parquet partition. Parts go to a hidden
+    staging directory (ignored by pyarrow datasets) and close() swaps each
+    one in with os.replace, so readers see a driver's old or new partition,
+    never a partial one. close(flush=False) discards the staged parts.
+    """
+
+    def __init__(self, year, driver_ids, lap_info, root=PARQUET_ROOT, batch_size=500000):
+        self.year = year
+        self.abbreviations = {driver_id: abbr for abbr, driver_id in driver_ids.items()}
+        self.lap_info = lap_info
+        self.root = root
+        self.batch_size = batch_size
+        self.rows_written = 0
+        self.seconds = 0.0
+        self._pending = {}
+        self._parts = {}
+        self._staging = {}  # key -> (staging dir, partition dir)
+        self._token = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+    def add(self, cols):
+        if column_length(cols) == 0:
+            return
+        key = (int(cols["session_id"][0]), int(cols["driver_id"][0]))
+        self._pending.setdefault(key, []).append(cols)
+        if sum(column_length(c) for c in self._pending[key]) >= self.batch_size:
+            self._write(key)
+
+    def _write(self, key):
+        chunks = self._pending.pop(key, [])
+        if not chunks:
+            return
+        start = time.perf_counter()
+        session_id, driver_id = key
+        cols = concat_columns(chunks)
+        if key not in self._parts:
+            parent = session_dir(self.year, session_id, self.root)
+            name = f"driver={self.abbreviations[driver_id]}"
+            staging = os.path.join(parent, f".{name}.{self._token}.tmp")
+            os.makedirs(staging)
+            self._staging[key] = (staging, os.path.join(parent, name))
+            self._parts[key] = 0
+        pq.write_table(to_table(cols, driver_id, self.lap_info),
+                       os.path.join(self._staging[key][0], f"part-{self._parts[key]}.parquet"),
+                       compression="zstd")
+        self._parts[key] += 1
+        self.rows_written += column_length(cols)
+        self.seconds += time.perf_counter() - start
+
+    def flush(self):
+        for key in list(self._pending):
+            self._write(key)
+
+    def _publish(self):
+        """Swap every staged partition in. A directory cannot be replaced while it
+        holds files, so the old partition is renamed aside first and removed after."""
+        for staging, path in self._staging.values():
+            old = None
+            if os.path.exists(path):
+                old = f"{staging[:-len('.tmp')]}.old"
+                os.replace(path, old)
+            os.replace(staging, path)
+            if old is not None:
+                shutil.rmtree(old, ignore_errors=True)
+        self._staging.clear()
+
+    def close(self, flush=True):
+        if flush:
+            self.flush()
+            self._publish()
+        self._pending.clear()
+        for staging, _ in self._staging.values():
+            shutil.rmtree(staging, ignore_errors=True)
+        self._staging.clear()
+
+    @property
+    def rows_per_second(self):
+        return self.rows_written / self.seconds if self.seconds else 0.0
+
+    def report(self, label="Parquet telemetry"):
+        print(f"{label}: {self.rows_written} rows in {self.seconds:.1f} s "
+              f"({self.rows_per_second:,.0f} rows/s)")
@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+
+import common_path  # noqa: F401  (common/ on sys.path)
+from db_conector import get_cursor
+
+# ===============================
+# Configuration
+# ===============================
+POSITION_SESSION_TYPES = ("R", "S")  # sessions with a running order
+
+TIMELINE_COLUMNS = ["session_id", "driver_id", "lap_number", "race_time",
+                    "position", "gap_to_leader", "interval_ahead"]
+
+insert_query = f"""
+INSERT INTO race_positions ({", ".join(TIMELINE_COLUMNS)})
+VALUES ({", ".join(["%s"] * len(TIMELINE_COLUMNS))})
+"""
+
+
+# ===============================
+# Lap end times
+# ===============================
+def lap_end_times(session, session_id, driver_ids):
+    """
+    (session_id, driver_id, lap_number, race_time) for every completed lap of
+    a loaded FastF1 session. race_time is the session clock at the end of the
+    lap (Laps.Time) minus the start of lap 1, so it stays right across pit
+    stops and untimed laps, unlike a sum of lap times. Where Time is missing
+    it is rebuilt from LapStartTime + LapTime; laps with neither are dropped.
+    """
+    laps = session.laps[session.laps["Driver"].isin(list(driver_ids))]
+    end = laps["Time"].dt.total_seconds()
+    end = end.fillna(laps["LapStartTime"].dt.total_seconds() + laps["LapTime"].dt.total_seconds())
+    start = laps.loc[laps["LapNumber"] == 1, "LapStartTime"].dt.total_seconds().min()
+
+    df = pd.DataFrame({
+        "session_id": session_id,
+        "driver_id": laps["Driver"].map(driver_ids).to_numpy(),
+        "lap_number": laps["LapNumber"].to_numpy(),
+        "race_time": (end - (start if pd.notna(start) else 0.0)).to_numpy(),
+    })
+    df = df.dropna(subset=["lap_number", "race_time"])
+    df["lap_number"] = df["lap_number"].astype(int)
+    return df.reset_index(drop=True)
+
+
+# ===============================
+# Timeline
+# ===============================
+def race_timeline(laps):
+    """
+    Position, gap to the leader and interval to the car ahead of every driver
+    after every lap. laps has session_id, driver_id, lap_number and
+    race_time and may hold any number of sessions: one lexsort orders every
+    (session, lap) group by race time, and ranks and gaps come from offsets
+    to the start of each group, with no loop over laps or drivers.
+    """
+    session = laps["session_id"].to_numpy()
+    lap = laps["lap_number"].to_numpy()
+    time = laps["race_time"].to_numpy(dtype=np.float64)
+    order = np.lexsort((time, lap, session))
+    session, lap, time = session[order], lap[order], time[order]
+
+    n = len(order)
+    first = np.ones(n, dtype=bool)
+    first[1:] = (session[1:] != session[:-1]) | (lap[1:] != lap[:-1])
+    index = np.arange(n)
+    group_start = np.maximum.accumulate(np.where(first, index, 0))
+
+    gap = time - time[group_start]
+    interval = np.empty(n)
+    interval[1:] = time[1:] - time[:-1]
+    gap[first] = np.nan
+    interval[first] = np.nan
+
+    return pd.DataFrame({
+        "session_id": session,
+        "driver_id": laps["driver_id"].to_numpy()[order],
+        "lap_number": lap,
+        "race_time": time,
+        "position": index - group_start + 1,
+        "gap_to_leader": gap,
+        "interval_ahead": interval,
+    })
+
+
+# ===============================
+# Storage
+# ===============================
+def _clean(value):
+    return None if np.isnan(value) else float(value)
+
+
+def store_timeline(conn, session_id, timeline):
+    """Replace the race_positions rows of one session in a single transaction."""
+    rows = [
+        (int(r.session_id), int(r.driver_id), int(r.lap_number), float(r.race_time),
+         int(r.position), _clean(r.gap_to_leader), _clean(r.interval_ahead))
+        for r in timeline.itertuples(index=False)
+    ]
+    cursor = get_cursor(conn)
+    try:
+        cursor.execute("DELETE FROM race_positions WHERE session_id = %s", (session_id,))
+        if rows:
+            cursor.executemany(insert_query, rows)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+    return len(rows)
+
+
+def insert_race_positions(conn, session, session_id, driver_ids):
+    """Rebuild the running order of one race session. Returns the number of rows."""
+    return store_timeline(conn, session_id, race_timeline(lap_end_times(session, session_id, driver_ids)))
@@ -0,0 +1,336 @@
+import argparse
+import os
+import socket
+import threading
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+
+import fastf1
+import pandas as pd
+
+import common_path  # noqa: F401  (common/ on sys.path)
+import instrumentation
+from db_conector import get_db_connection, get_cursor
+from ingest import CACHE_DIR, ingest_session
+from insert_track_cords import get_track_id
+from migrate import apply_migrations
+
+# ===============================
+# Configuration
+# ===============================
+DEFAULT_WORKERS = 2
+
+# A running job records its owner ("host:pid" of the worker) and refreshes
+# heartbeat_at every HEARTBEAT_SECONDS. At startup a 'running' job is requeued
+# when its owner process no longer exists on this host, or when its heartbeat
+# is older than STALE_JOB_SECONDS (owner on another host that stopped).
+HEARTBEAT_SECONDS = 30
+STALE_JOB_SECONDS = int(os.environ.get("F1_STALE_JOB_SECONDS", "300"))
+HOST = socket.gethostname()
+
+# Event schedule session names -> identifiers stored in sessions.session_type
+SESSION_TYPES = {
+    "Practice 1": "FP1",
+    "Practice 2": "FP2",
+    "Practice 3": "FP3",
+    "Qualifying": "Q",
+    "Sprint Qualifying": "SQ",
+    "Sprint Shootout": "SS",
+    "Sprint": "S",
+    "Race": "R",
+}
+
+
+# ===============================
+# Job table
+# ===============================
+def season_jobs(year, session_types=None):
+    """Enumerate (year, grand_prix, session_type, location) for every session of a season."""
+    schedule = fastf1.get_event_schedule(year, include_testing=False)
+    jobs = []
+    for _, event in schedule.iterrows():
+        for i in range(1, 6):
+            name = event.get(f"Session{i}")
+            if pd.isna(name) or name not in SESSION_TYPES:
+                continue
+            session_type = SESSION_TYPES[name]
+            if session_types and session_type not in session_types:
+                continue
+            jobs.append((year, event['EventName'], session_type, event['Location']))
+    return jobs
+
+
+def job_owner():
+    return f"{HOST}:{os.getpid()}"
+
+
+def owner_alive(owner):
+    """
+    False when owner is a process of this host that no longer exists, True
+    when it does, None when this host cannot tell (another host, no owner).
+    """
+    host, _, pid = (owner or "").rpartition(":")
+    if host != HOST or not pid.isdigit():
+        return None
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # exists, owned by another user
+    return True
+
+
+def stale_running_jobs(conn, requeue_running=False, stale_after=STALE_JOB_SECONDS):
+    """
+    Split the 'running' jobs into (stale, live): stale ones lost their owner
+    (process gone, or no heartbeat for stale_after seconds); with
+    requeue_running every running job counts as stale.
+    """
+    cursor = get_cursor(conn)
+    try:
+        cursor.execute("""
+            SELECT year, grand_prix, session_type, owner, TIMESTAMPDIFF(SECOND, heartbeat_at, NOW())
+            FROM ingest_jobs
+            WHERE status = 'running'
+        """)
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+
+    stale, live = [], []
+    for year, grand_prix, session_type, owner, age in rows:
+        alive = owner_alive(owner)
+        lost = alive is False or (alive is None and (age is None or age > stale_after))
+        if requeue_running or lost:
+            stale.append((year, grand_prix, session_type))
+        else:
+            live.append((year, grand_prix, session_type, owner, age))
+    return stale, live
+
+
+def register_jobs(conn, jobs, retry_failed=False, requeue_running=False, stale_after=STALE_JOB_SECONDS):
+    """
+    Add new jobs as pending and requeue jobs left 'running' by a crashed run
+    (see stale_running_jobs; every running job with requeue_running), and
+    failed ones when retry_failed is set. Jobs still running elsewhere are
+    reported and skipped. Returns the jobs still to do.
+    """
+    stale, live = stale_running_jobs(conn, requeue_running, stale_after)
+    for year, grand_prix, session_type, owner, age in live:
+        print(f"Skipping {year} {grand_prix} {session_type}: running in {owner} "
+              f"(heartbeat {age} s ago; --requeue-running to take it over)")
+
+    cursor = get_cursor(conn)
+    try:
+        cursor.executemany(
+            "INSERT IGNORE INTO ingest_jobs (year, grand_prix, session_type, location) VALUES (%s, %s, %s, %s)",
+            jobs
+        )
+        if stale:
+            print(f"Requeueing {len(stale)} job(s) left running by a stopped run")
+            cursor.executemany(
+                """
+                UPDATE ingest_jobs SET status = 'pending', owner = NULL
+                WHERE year = %s AND grand_prix = %s AND session_type = %s AND status = 'running'
+                """,
+                stale
+            )
+        if retry_failed:
+            cursor.execute("UPDATE ingest_jobs SET status = 'pending' WHERE status = 'failed'")
+        conn.commit()
+
+        years = sorted({job[0] for job in jobs})
+        if not years:
+            return []
+        cursor.execute(
+            f"""
+            SELECT year, grand_prix, session_type, location
+            FROM ingest_jobs
+            WHERE status = 'pending' AND year IN ({', '.join(['%s'] * len(years))})
+            ORDER BY year, grand_prix, session_type
+            """,
+            years
+        )
+        wanted = {job[:3] for job in jobs}
+        return [row for row in cursor.fetchall() if tuple(row[:3]) in wanted]
+    finally:
+        cursor.close()
+
+
+def claim_job(conn, job):
+    """
+    Mark a pending job as running by this process. False when it is no
+    longer pending, i.e. another run claimed it between register_jobs and now.
+    """
+    cursor = get_cursor(conn)
+    try:
+        cursor.execute(
+            """
+            UPDATE ingest_jobs
+            SET status = 'running', attempts = attempts + 1, error = NULL,
+                owner = %s, heartbeat_at = NOW()
+            WHERE year = %s AND grand_prix = %s AND session_type = %s AND status = 'pending'
+            """,
+            (job_owner(), *job[:3])
+        )
+        claimed = cursor.rowcount == 1
+        conn.commit()
+        return claimed
+    finally:
+        cursor.close()
+
+
+def set_status(conn, job, status, session_id=None, seconds=None, error=None):
+    cursor = get_cursor(conn)
+    try:
+        cursor.execute(
+            """
+            UPDATE ingest_jobs
+            SET status = %s,
+                session_id = COALESCE(%s, session_id),
+                seconds = %s,
+                error = %s
+            WHERE year = %s AND grand_prix = %s AND session_type = %s
+            """,
+            (status, session_id, seconds, error, *job[:3])
+        )
+        conn.commit()
+    finally:
+        cursor.close()
+
+
+@contextmanager
+def heartbeat(job, interval=HEARTBEAT_SECONDS):
+    """Refresh the job's heartbeat_at from a background thread while the block runs."""
+    stop = threading.Event()
+
+    def beat():
+        conn = get_db_connection()
+        if conn is None:
+            return
+        try:
+            while not stop.wait(interval):
+                cursor = get_cursor(conn)
+                try:
+                    cursor.execute(
+                        """
+                        UPDATE ingest_jobs SET heartbeat_at = NOW()
+                        WHERE year = %s AND grand_prix = %s AND session_type = %s AND owner = %s
+                        """,
+                        (*job[:3], job_owner())
+                    )
+                    conn.commit()
+                finally:
+                    cursor.close()
+        finally:
+            conn.close()
+
+    thread = threading.Thread(target=beat, name="job-heartbeat", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+# ===============================
+# Worker
+# ===============================
+def run_job(job, telemetry=True, telemetry_method="insert", offline=False):
+    """
+    Ingest one session and record its outcome in ingest_jobs. Returns
+    (job, status, error, metrics snapshot of this session); status is
+    'skipped' when another run had already claimed the job.
+    """
+    year, gp_name, session_type, location = job
+    instrumentation.reset()  # pool processes are reused: report this job only
+    if offline:
+        fastf1.Cache.offline_mode(True)
+    conn = get_db_connection()
+    try:
+        if not claim_job(conn, job):
+            return job, "skipped", None, instrumentation.snapshot()
+        start = time.perf_counter()
+        try:
+            with heartbeat(job):
+                track_id = get_track_id(conn, location) if session_type == "R" and location else None
+                session_id, _ = ingest_session(year, gp_name, session_type, track_id=track_id,
+                                               telemetry=telemetry, telemetry_method=telemetry_method,
+                                               workers=1, incremental=True, snapshot=True)
+        except Exception as e:
+            set_status(conn, job, "failed", seconds=time.perf_counter() - start,
+                       error=f"{e}\n{traceback.format_exc()}"[-4000:])
+            return job, "failed", str(e), instrumentation.snapshot()
+
+        set_status(conn, job, "done", session_id=session_id, seconds=time.perf_counter() - start)
+        return job, "done", None, instrumentation.snapshot()
+    finally:
+        conn.close()
+
+
+# ===============================
+# Scheduler
+# ===============================
+def run_season(years, workers=DEFAULT_WORKERS, session_types=None, retry_failed=False,
+               requeue_running=False, telemetry=True, telemetry_method="insert", offline=False):
+    """Ingest every session of the given seasons, resuming from the jobs table."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    fastf1.Cache.enable_cache(CACHE_DIR)
+    if offline:
+        fastf1.Cache.offline_mode(True)
+
+    jobs = [job for year in years for job in season_jobs(year, session_types)]
+
+    conn = get_db_connection()
+    try:
+        apply_migrations(conn)
+        pending = register_jobs(conn, jobs, retry_failed=retry_failed, requeue_running=requeue_running)
+    finally:
+        conn.close()
+
+    print(f"{len(jobs)} sessions in schedule, {len(pending)} to ingest with {workers} workers")
+    counts = {"done": 0, "failed": 0, "skipped": 0}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_job, tuple(job), telemetry, telemetry_method, offline) for job in pending]
+        for future in as_completed(futures):
+            job, status, error, metrics = future.result()
+            instrumentation.merge(metrics)
+            counts[status] += 1
+            suffix = f": {error}" if error else ""
+            print(f"[{sum(counts.values())}/{len(pending)}] "
+                  f"{job[0]} {job[1]} {job[2]} {status}{suffix}")
+
+    print(f"\n{counts['done']} done, {counts['failed']} failed, {counts['skipped']} claimed by another run")
+    return counts
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Ingest whole seasons from the FastF1 cache.")
+    parser.add_argument("years", type=int, nargs="+")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="sessions ingested concurrently")
+    parser.add_argument("--sessions", nargs="+", choices=sorted(set(SESSION_TYPES.values())),
+                        help="only these session types (default: all)")
+    parser.add_argument("--retry-failed", action="store_true", help="requeue sessions that failed before")
+    parser.add_argument("--requeue-running", action="store_true",
+                        help="requeue every session marked running, even if its owner still looks alive")
+    parser.add_argument("--no-telemetry", action="store_true")
+    parser.add_argument("--telemetry-method", choices=("insert", "infile"), default="insert")
+    parser.add_argument("--offline", action="store_true", help="only use the local FastF1 cache")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    with instrumentation.run("season"):
+        run_season(args.years, workers=args.workers, session_types=args.sessions,
+                   retry_failed=args.retry_failed, requeue_running=args.requeue_running,
+                   telemetry=not args.no_telemetry,
+                   telemetry_method=args.telemetry_method, offline=args.offline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+from incremental import session_cache_dir
+from telemetry_loader import iter_lap_telemetry
+
+# ===============================
+# Configuration
+# ===============================
+# Snapshots mirror the FastF1 cache layout: <root>/<year>/<event>/<session>/
+SNAPSHOT_ROOT = os.environ.get(
+    "F1_SNAPSHOT_ROOT",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "snapshots")
+)
+FORMAT_VERSION = 1
+
+# Merged per-lap telemetry columns kept in the snapshot (what ingestion and
+# the track centreline read from lap.get_telemetry())
+LAP_TELEMETRY_COLUMNS = ("Time", "SessionTime", "Distance", "Speed", "Throttle", "Brake",
+                         "nGear", "DRS", "RPM", "X", "Y", "Z")
+
+
+def snapshot_dir(session, root=SNAPSHOT_ROOT):
+    """Snapshot directory of a (not necessarily loaded) FastF1 session."""
+    return session_cache_dir(session, root)
+
+
+def _read_meta(path):
+    try:
+        with open(os.path.join(path, "meta.json")) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_current(path, content_hash=None, telemetry=True):
+    """
+    Whether a usable snapshot exists: same format, telemetry if needed and,
+    when content_hash is given, built from the same FastF1 cache files.
+    """
+    meta = _read_meta(path)
+    if meta is None or meta.get("format") != FORMAT_VERSION:
+        return False
+    if telemetry and not meta.get("telemetry"):
+        return False
+    return content_hash is None or meta.get("source_hash") == content_hash
+
+
+# ===============================
+# Write
+# ===============================
+def _per_driver(data):
+    """Concatenate FastF1's {driver_number: Telemetry} dict into one frame."""
+    frames = [frame.assign(DriverNumber=str(number)) for number, frame in data.items() if len(frame)]
+    if not frames:
+        return pd.DataFrame()
+    return pd.DataFrame(pd.concat(frames, ignore_index=True))
+
+
+def _lap_telemetry_frame(session):
+    """Merged telemetry of every timed lap, tagged with Driver / LapNumber / SampleIndex."""
+    frames = []
+    for abbreviation in session.laps['Driver'].dropna().unique():
+        for lap_number, tel in iter_lap_telemetry(session, abbreviation):
+            frame = pd.DataFrame(tel[[c for c in LAP_TELEMETRY_COLUMNS if c in tel.columns]])
+            frame.insert(0, "SampleIndex", tel.index.to_numpy())
+            frame.insert(0, "LapNumber", lap_number)
+            frame.insert(0, "Driver", abbreviation)
+            frames.append(frame)
+    if not frames:
+        return pd.DataFrame(columns=["Driver", "LapNumber", "SampleIndex", *LAP_TELEMETRY_COLUMNS])
+    return pd.concat(frames, ignore_index=True)
+
+
+def write_snapshot(session, path, content_hash=None, telemetry=True):
+    """
+    Convert a loaded FastF1 session into Feather files (laps, results, car
+    data, position data and merged per-lap telemetry) under path. The
+    directory is replaced atomically so readers never see half a snapshot.
+    """
+    tmp = f"{path}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    start = time.perf_counter()
+
+    pd.DataFrame(session.laps).reset_index(drop=True).to_feather(os.path.join(tmp, "laps.feather"))
+    pd.DataFrame(session.results).reset_index(drop=True).to_feather(os.path.join(tmp, "results.feather"))
+    if telemetry:
+        _per_driver(session.car_data).to_feather(os.path.join(tmp, "car_data.feather"))
+        _per_driver(session.pos_data).to_feather(os.path.join(tmp, "pos_data.feather"))
+        _lap_telemetry_frame(session).to_feather(os.path.join(tmp, "lap_telemetry.feather"))
+
+    meta = {
+        "format": FORMAT_VERSION,
+        "telemetry": telemetry,
+        "source_hash": content_hash,
+        "date": session.date.isoformat() if session.date else None,
+        "seconds": round(time.perf_counter() - start, 2),
+    }
+    with open(os.path.join(tmp, "meta.json"), "w") as f:
+        json.dump(meta, f)
+
+    old = f"{path}.old-{os.getpid()}"
+    if os.path.isdir(path):
+        os.replace(path, old)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    os.replace(tmp, path)
+    shutil.rmtree(old, ignore_errors=True)
+    return path
+
+
+# ===============================
+# Read
+# ===============================
+class SnapshotSession:
+    """
+    The parts of a loaded fastf1 Session the pipeline uses (laps, results,
+    date, car_data, pos_data, per-lap telemetry) rebuilt from a snapshot.
+    Telemetry files are read on first use.
+    """
+
+    def __init__(self, path):
+        from fastf1.core import Laps
+
+        self.path = path
+        meta = _read_meta(path)
+        if meta is None:
+            raise FileNotFoundError(f"No session snapshot in {path}")
+        self.date = pd.Timestamp(meta["date"]) if meta["date"] else None
+        self.laps = Laps(pd.read_feather(os.path.join(path, "laps.feather")))
+        self.results = pd.read_feather(os.path.join(path, "results.feather"))
+        self._has_telemetry = meta["telemetry"]
+        self._lap_telemetry = None
+        self._lap_index = None
+
+    def _read(self, name):
+        if not self._has_telemetry:
+            raise ValueError(f"Snapshot {self.path} was built without telemetry")
+        return pd.read_feather(os.path.join(self.path, f"{name}.feather"))
+
+    def _by_driver(self, name):
+        frame = self._read(name)
+        if frame.empty:
+            return {}
+        return {number: group.drop(columns="DriverNumber").reset_index(drop=True)
+                for number, group in frame.groupby("DriverNumber", sort=False)}
+
+    @property
+    def car_data(self):
+        return self._by_driver("car_data")
+
+    @property
+    def pos_data(self):
+        return self._by_driver("pos_data")
+
+    def lap_telemetry(self, driver, lap_number):
+        """Merged telemetry of one lap, as lap.get_telemetry() returned it when the snapshot was built."""
+        if self._lap_telemetry is None:
+            frame = self._read("lap_telemetry")
+            change = np.ones(len(frame), dtype=bool)
+            driver_col = frame["Driver"].to_numpy()
+            lap_col = frame["LapNumber"].to_numpy()
+            change[1:] = (driver_col[1:] != driver_col[:-1]) | (lap_col[1:] != lap_col[:-1])
+            starts = np.flatnonzero(change)
+            ends = np.append(starts[1:], len(frame))
+            self._lap_index = {(driver_col[s], int(lap_col[s])): (s, e) for s, e in zip(starts, ends)}
+            self._lap_telemetry = (frame.set_index("SampleIndex").rename_axis(None)
+                                   .drop(columns=["Driver", "LapNumber"]))
+        start, end = self._lap_index[(driver, int(lap_number))]
+        return self._lap_telemetry.iloc[start:end]
+
+
+def load_snapshot(session, root=SNAPSHOT_ROOT, content_hash=None, telemetry=True):
+    """SnapshotSession for a FastF1 session object, or None when there is no current snapshot."""
+    path = snapshot_dir(session, root)
+    if not is_current(path, content_hash, telemetry):
+        return None
+    return SnapshotSession(path)
@@ -0,0 +1,64 @@
+import common_path  # noqa: F401  (common/ on sys.path)
+from db_conector import get_cursor
+
+# ===============================
+# Summary tables
+# ===============================
+# Small per-session aggregates (tables created by migrations/0001) rebuilt by
+# the ingestion pipeline, so the analyses read a few hundred rows instead of
+# every lap.
+
+# Timed non-pit laps, per driver / stint / compound
+LAP_STATS_QUERY = """
+INSERT INTO lap_stats
+SELECT session_id,
+       driver_id,
+       COALESCE(stint_number, 0),
+       COALESCE(UPPER(TRIM(tyre_compound)), 'UNKNOWN'),
+       COUNT(*),
+       AVG(lap_time),
+       MIN(lap_time),
+       STDDEV_SAMP(lap_time)
+FROM laps
+WHERE session_id = %s
+  AND pit = 0
+  AND lap_time IS NOT NULL
+GROUP BY session_id, driver_id, COALESCE(stint_number, 0), COALESCE(UPPER(TRIM(tyre_compound)), 'UNKNOWN')
+"""
+
+# Non-pit laps with all three sectors timed (same selection as Sector_time_analysis.py)
+SECTOR_STATS_QUERY = """
+INSERT INTO sector_stats
+SELECT session_id,
+       driver_id,
+       COUNT(*),
+       AVG(sector1_time), AVG(sector2_time), AVG(sector3_time),
+       MIN(sector1_time), MIN(sector2_time), MIN(sector3_time)
+FROM laps
+WHERE session_id = %s
+  AND pit = 0
+  AND sector1_time IS NOT NULL
+  AND sector2_time IS NOT NULL
+  AND sector3_time IS NOT NULL
+GROUP BY session_id, driver_id
+"""
+
+SUMMARY_QUERIES = {
+    "lap_stats": LAP_STATS_QUERY,
+    "sector_stats": SECTOR_STATS_QUERY,
+}
+
+
+def refresh_summaries(conn, session_id):
+    """Rebuild every summary table for one session in a single transaction."""
+    cursor = get_cursor(conn)
+    try:
+        for table, query in SUMMARY_QUERIES.items():
+            cursor.execute(f"DELETE FROM {table} WHERE session_id = %s", (session_id,))
+            cursor.execute(query, (session_id,))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
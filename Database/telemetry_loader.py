@@ -0,0 +1,326 @@
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+import common_path  # noqa: F401  (common/ on sys.path)
+from db_conector import get_local_infile_connection
+from instrumentation import InstrumentedCursor, log_event
+
+# ===============================
+# Configuration
+# ===============================
+BATCH_SIZE = 50000  # rows sent to MySQL per batch
+
+# Column order of the telemetry table
+TELEMETRY_COLUMNS = (
+    "session_id",
+    "driver_id",
+    "lap_number",
+    "sample_index",
+    "time",
+    "distance",
+    "speed",
+    "throttle",
+    "brake",
+    "gear",
+    "drs",
+    "rpm",
+)
+
+# FastF1 telemetry column feeding each value column
+FASTF1_COLUMNS = {
+    "distance": "Distance",
+    "speed": "Speed",
+    "throttle": "Throttle",
+    "brake": "Brake",
+    "gear": "nGear",
+    "drs": "DRS",
+    "rpm": "RPM",
+}
+
+INSERT_QUERY = f"""
+INSERT INTO telemetry ({", ".join(TELEMETRY_COLUMNS)})
+VALUES ({", ".join(["%s"] * len(TELEMETRY_COLUMNS))})
+"""
+
+# Re-ingest: a lap's stored samples are removed before its new ones are
+# inserted, so a lap that now has fewer samples keeps no stale tail
+DELETE_LAP_QUERY = "DELETE FROM telemetry WHERE session_id = %s AND driver_id = %s AND lap_number = %s"
+
+LOAD_QUERY = f"""
+LOAD DATA LOCAL INFILE '{{path}}'
+INTO TABLE telemetry
+FIELDS TERMINATED BY ','
+LINES TERMINATED BY '\\n'
+({", ".join(TELEMETRY_COLUMNS)})
+"""
+
+
+# ===============================
+# Column-wise conversion
+# ===============================
+def lap_telemetry(session, lap):
+    """lap.get_telemetry(), or the precomputed frame when session is a SnapshotSession."""
+    if hasattr(session, "lap_telemetry"):
+        return session.lap_telemetry(lap['Driver'], lap['LapNumber'])
+    return lap.get_telemetry()
+
+
+def iter_lap_telemetry(session, abbreviation, lap_numbers=None):
+    """Yield (lap_number, telemetry) for every timed lap of one driver."""
+    laps = session.laps.pick_drivers(abbreviation)
+    if lap_numbers is not None:
+        laps = laps[laps['LapNumber'].isin(lap_numbers)]
+    for _, lap in laps.iterrows():
+        if pd.isna(lap['LapTime']):
+            continue  # skip incomplete laps
+        yield int(lap['LapNumber']), lap_telemetry(session, lap)
+
+
+def telemetry_columns(tel, session_id, driver_id, lap_number):
+    """
+    Convert one lap of FastF1 telemetry into a dict of NumPy arrays keyed by
+    telemetry table column. NaN values are kept and only replaced on write.
+    """
+    n = len(tel)
+    cols = {
+        "session_id": np.full(n, session_id, dtype=np.int64),
+        "driver_id": np.full(n, driver_id, dtype=np.int64),
+        "lap_number": np.full(n, lap_number, dtype=np.int64),
+        "sample_index": tel.index.to_numpy(dtype=np.int64),
+        "time": tel['Time'].dt.total_seconds().to_numpy(),
+    }
+    for column, source in FASTF1_COLUMNS.items():
+        values = tel[source].to_numpy()
+        if values.dtype == bool:
+            values = values.astype(np.uint8)
+        cols[column] = values
+    return cols
+
+
+def concat_columns(chunks):
+    """Concatenate several column dicts into one."""
+    if len(chunks) == 1:
+        return chunks[0]
+    return {c: np.concatenate([chunk[c] for chunk in chunks]) for c in TELEMETRY_COLUMNS}
+
+
+def column_length(cols):
+    return len(cols["sample_index"])
+
+
+def to_nullable(values):
+    """Return an object array of Python scalars with NaN replaced by None."""
+    out = values.astype(object)
+    if values.dtype.kind in "fmM":
+        out[pd.isna(values)] = None
+    return out
+
+
+def columns_to_rows(cols):
+    """Turn a column dict into the list of tuples expected by executemany."""
+    return list(zip(*(to_nullable(np.asarray(cols[c])) for c in TELEMETRY_COLUMNS)))
+
+
+# ===============================
+# Writers
+# ===============================
+def insert_rows(cursor, cols, batch_size=BATCH_SIZE, query=INSERT_QUERY):
+    """Multi-row INSERT (executemany rewrites the batch into one statement)."""
+    rows = columns_to_rows(cols)
+    for start in range(0, len(rows), batch_size):
+        cursor.executemany(query, rows[start:start + batch_size])
+
+
+def delete_laps(cursor, cols):
+    """Delete the stored samples of every lap present in the columns."""
+    keys = np.unique(np.column_stack([cols["session_id"], cols["driver_id"], cols["lap_number"]]), axis=0)
+    cursor.executemany(DELETE_LAP_QUERY, [tuple(int(v) for v in key) for key in keys])
+
+
+def load_data_infile(cursor, cols):
+    """Write the columns to a temporary CSV and bulk load it with LOAD DATA LOCAL INFILE."""
+    frame = pd.DataFrame({c: cols[c] for c in TELEMETRY_COLUMNS})
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    try:
+        with os.fdopen(fd, "w", newline="") as f:
+            frame.to_csv(f, header=False, index=False, na_rep="\\N", lineterminator="\n")
+        cursor.execute(LOAD_QUERY.format(path=path.replace("\\", "/")))
+    finally:
+        os.remove(path)
+
+
+class TelemetryWriter:
+    """
+    Buffer telemetry column dicts and stream them to MySQL in large batches.
+    method is either "insert" (multi-row INSERT) or "infile" (LOAD DATA LOCAL INFILE).
+    With replace_laps=True the stored samples of each lap are deleted before
+    its new samples are inserted, in the same transaction. "infile" writes
+    through its own connection with local infile enabled (pooled connections
+    have it off) and closes it in close().
+    """
+
+    def __init__(self, conn, method="insert", batch_size=BATCH_SIZE, replace_laps=False):
+        if method not in ("insert", "infile"):
+            raise ValueError(f"Unknown telemetry load method: {method}")
+        self._own_conn = method == "infile"
+        self.conn = get_local_infile_connection() if self._own_conn else conn
+        self.cursor = InstrumentedCursor(self.conn.cursor())
+        self.method = method
+        self.batch_size = batch_size
+        self.replace_laps = replace_laps
+        self.rows_written = 0
+        self.seconds = 0.0
+        self._pending = []
+        self._pending_rows = 0
+
+    def add(self, cols):
+        n = column_length(cols)
+        if n == 0:
+            return
+        self._pending.append(cols)
+        self._pending_rows += n
+        if self._pending_rows >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        cols = concat_columns(self._pending)
+        start = time.perf_counter()
+        try:
+            if self.replace_laps:
+                delete_laps(self.cursor, cols)
+            if self.method == "infile":
+                load_data_infile(self.cursor, cols)
+            else:
+                insert_rows(self.cursor, cols, self.batch_size)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        self.seconds += time.perf_counter() - start
+        self.rows_written += self._pending_rows
+        self._pending = []
+        self._pending_rows = 0
+
+    def close(self, flush=True):
+        """Write the buffered rows (unless flush is False, e.g. after an error) and release the cursor."""
+        try:
+            if flush:
+                self.flush()
+        finally:
+            self._pending = []
+            self._pending_rows = 0
+            self.cursor.close()
+            if self._own_conn:
+                self.conn.close()
+
+    @property
+    def rows_per_second(self):
+        return self.rows_written / self.seconds if self.seconds else 0.0
+
+    def report(self, label="Telemetry"):
+        print(f"{label}: {self.rows_written} rows in {self.seconds:.1f} s "
+              f"({self.rows_per_second:,.0f} rows/s)")
+
+
+class TeeWriter:
+    """Send the same telemetry columns to several writers (e.g. MySQL and Parquet)."""
+
+    def __init__(self, *writers):
+        self.writers = writers
+
+    @property
+    def rows_written(self):
+        return self.writers[0].rows_written
+
+    def add(self, cols):
+        for writer in self.writers:
+            writer.add(cols)
+
+    def flush(self):
+        for writer in self.writers:
+            writer.flush()
+
+    def close(self, flush=True):
+        for writer in self.writers:
+            writer.close(flush)
+
+    def report(self):
+        for writer in self.writers:
+            writer.report()
+
+
+# ===============================
+# Parallel extraction
+# ===============================
+# Session used by pool workers. With the fork start method the parent's loaded
+# session is inherited; otherwise each worker loads it once from the cache.
+_worker_session = None
+
+
+def _init_worker(year, gp_name, session_type, cache_dir, session=None):
+    global _worker_session
+    if session is not None:
+        _worker_session = session
+    if _worker_session is None:
+        import fastf1
+
+        fastf1.Cache.enable_cache(cache_dir)
+        _worker_session = fastf1.get_session(year, gp_name, session_type)
+        _worker_session.load(telemetry=True, weather=False, messages=False)
+
+
+def _extract_task(abbreviation, driver_id, session_id, lap_numbers):
+    chunks = [
+        telemetry_columns(tel, session_id, driver_id, lap_number)
+        for lap_number, tel in iter_lap_telemetry(_worker_session, abbreviation, lap_numbers)
+    ]
+    return abbreviation, concat_columns(chunks) if chunks else None
+
+
+def _lap_chunks(session, abbreviation, laps_per_task, lap_numbers=None):
+    if not laps_per_task or (session is None and lap_numbers is None):
+        return [lap_numbers]
+    if lap_numbers is None:
+        lap_numbers = session.laps.pick_drivers(abbreviation)['LapNumber']
+    lap_numbers = sorted(int(n) for n in lap_numbers)
+    return [lap_numbers[i:i + laps_per_task] for i in range(0, len(lap_numbers), laps_per_task)]
+
+
+def extract_parallel(writer, session_args, session_id, driver_ids, workers=None,
+                     laps_per_task=None, session=None, cache_dir="cache", laps_by_driver=None):
+    """
+    Fan get_telemetry() out across a process pool, one task per driver (or per
+    chunk of laps_per_task laps). Workers only extract; the calling process is
+    the single writer draining results into the database as they complete.
+    session_args is (year, gp_name, session_type); laps_by_driver optionally
+    restricts each driver to {abbreviation: lap_numbers}.
+    """
+    workers = workers or os.cpu_count()
+    fork = "fork" in multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if fork else None)
+    initargs = (*session_args, cache_dir, session if fork else None)
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker, initargs=initargs) as pool:
+        futures = [
+            pool.submit(_extract_task, abbr, driver_id, session_id, chunk)
+            for abbr, driver_id in driver_ids.items()
+            if laps_by_driver is None or laps_by_driver.get(abbr)
+            for chunk in _lap_chunks(session, abbr, laps_per_task,
+                                     None if laps_by_driver is None else laps_by_driver[abbr])
+        ]
+        for future in as_completed(futures):
+            abbr, cols = future.result()
+            if cols is not None:
+                writer.add(cols)
+                print(f"Telemetry extracted for {abbr} ({column_length(cols)} samples)")
+                log_event("telemetry_extracted", driver=abbr, rows=column_length(cols))
+    writer.flush()
@@ -1,3 +1,4 @@
+import common_path  # noqa: F401  (common/ on sys.path)
 from db_conector import get_db_connection, get_cursor
 
 conn = get_db_connection()
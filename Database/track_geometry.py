@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+
+from telemetry_loader import lap_telemetry
+
+# ===============================
+# Configuration
+# ===============================
+STEP = 1.0           # metres between centreline points
+N_LAPS = 5           # clean laps merged into the centreline
+MAX_LAP_RATIO = 1.07  # laps slower than 107% of the fastest are not representative
+
+
+# ===============================
+# Lap selection
+# ===============================
+def clean_laps(laps):
+    """Timed green-flag laps without pit in/out, within 107% of the fastest, fastest first."""
+    timed = laps[
+        laps['LapTime'].notna()
+        & laps['PitInTime'].isna()
+        & laps['PitOutTime'].isna()
+        & (laps['TrackStatus'].astype(str) == "1")
+    ]
+    if timed.empty:
+        return timed
+    return timed[timed['LapTime'] <= timed['LapTime'].min() * MAX_LAP_RATIO].sort_values('LapTime')
+
+
+def reference_telemetry(session, n_laps=N_LAPS):
+    """Distance/X/Y telemetry of the n fastest clean laps of a loaded session."""
+    return [lap_telemetry(session, lap)[['Distance', 'X', 'Y']]
+            for _, lap in clean_laps(session.laps).head(n_laps).iterrows()]
+
+
+# ===============================
+# Centreline
+# ===============================
+def resample_centreline(frames, step=STEP):
+    """
+    Merge several laps into one centreline sampled every `step` metres.
+    Each lap's distance is scaled to the median lap length so the laps line
+    up, X/Y are interpolated onto the common grid and the median is taken.
+    """
+    laps = []
+    for frame in frames:
+        frame = frame.dropna(subset=['Distance', 'X', 'Y'])
+        d = frame['Distance'].to_numpy(dtype=np.float64)
+        # np.interp needs strictly increasing distances: keep only the points
+        # beyond every earlier one (a single diff > 0 pass lets a dip through)
+        keep = np.concatenate(([True], d[1:] > np.maximum.accumulate(d)[:-1]))
+        if keep.sum() > 1:
+            laps.append((d[keep], frame['X'].to_numpy()[keep], frame['Y'].to_numpy()[keep]))
+    if not laps:
+        raise ValueError("No usable laps to build the track centreline")
+
+    length = float(np.median([d[-1] - d[0] for d, _, _ in laps]))
+    grid = np.arange(0.0, length, step)
+    xs = np.empty((len(laps), len(grid)))
+    ys = np.empty((len(laps), len(grid)))
+    for i, (d, x, y) in enumerate(laps):
+        scaled = (d - d[0]) * (length / (d[-1] - d[0]))
+        xs[i] = np.interp(grid, scaled, x)
+        ys[i] = np.interp(grid, scaled, y)
+
+    return pd.DataFrame({
+        "distance": grid,
+        "x": np.median(xs, axis=0),
+        "y": np.median(ys, axis=0),
+    })
+
+
+def centreline_rows(centreline, track_id):
+    """Rows for a single executemany into track_coords."""
+    return list(zip(
+        [int(track_id)] * len(centreline),
+        centreline['distance'].round(3).tolist(),
+        centreline['x'].round(3).tolist(),
+        centreline['y'].round(3).tolist(),
+    ))
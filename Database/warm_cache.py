@@ -0,0 +1,83 @@
+import argparse
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import fastf1
+
+from incremental import cache_content_hash, session_cache_dir
+from ingest import CACHE_DIR, get_session, load_session
+from season import DEFAULT_WORKERS, SESSION_TYPES, season_jobs
+from session_snapshot import is_current, snapshot_dir
+
+# Converts the FastF1 cache of whole seasons into columnar session snapshots
+# (see session_snapshot.py) so later ingests skip the pickle parse.
+
+
+# ===============================
+# Worker
+# ===============================
+def warm_job(job, telemetry=True, offline=False, force=False):
+    """Build the snapshot of one session unless a current one exists. Returns (job, status, seconds, error)."""
+    year, gp_name, session_type = job[:3]
+    if offline:
+        fastf1.Cache.offline_mode(True)
+    start = time.perf_counter()
+    try:
+        session = get_session(year, gp_name, session_type)
+        if not force:
+            content_hash = cache_content_hash(session_cache_dir(session, CACHE_DIR))
+            if content_hash is not None and is_current(snapshot_dir(session), content_hash, telemetry):
+                return job, "current", 0.0, None
+        load_session(year, gp_name, session_type, telemetry=telemetry, session=session, snapshot=True,
+                     rebuild=True)
+    except Exception as e:
+        return job, "failed", time.perf_counter() - start, f"{e}\n{traceback.format_exc()}"[-2000:]
+    return job, "built", time.perf_counter() - start, None
+
+
+# ===============================
+# Scheduler
+# ===============================
+def warm_seasons(years, workers=DEFAULT_WORKERS, session_types=None, telemetry=True, offline=False, force=False):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    fastf1.Cache.enable_cache(CACHE_DIR)
+    if offline:
+        fastf1.Cache.offline_mode(True)
+
+    jobs = [job for year in years for job in season_jobs(year, session_types)]
+    print(f"{len(jobs)} sessions to check with {workers} workers")
+    counts = {"built": 0, "current": 0, "failed": 0}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(warm_job, job, telemetry, offline, force) for job in jobs]
+        for future in as_completed(futures):
+            job, status, seconds, error = future.result()
+            counts[status] += 1
+            suffix = f": {error}" if error else f" in {seconds:.1f} s" if status == "built" else ""
+            print(f"[{sum(counts.values())}/{len(jobs)}] {job[0]} {job[1]} {job[2]} {status}{suffix}")
+
+    print(f"\n{counts['built']} built, {counts['current']} already current, {counts['failed']} failed")
+    return counts
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Convert the FastF1 cache of whole seasons into session snapshots.")
+    parser.add_argument("years", type=int, nargs="+")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="sessions converted concurrently")
+    parser.add_argument("--sessions", nargs="+", choices=sorted(set(SESSION_TYPES.values())),
+                        help="only these session types (default: all)")
+    parser.add_argument("--no-telemetry", action="store_true", help="laps and results only")
+    parser.add_argument("--offline", action="store_true", help="only use the local FastF1 cache")
+    parser.add_argument("--force", action="store_true", help="rebuild snapshots that are already current")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    warm_seasons(args.years, workers=args.workers, session_types=args.sessions,
+                 telemetry=not args.no_telemetry, offline=args.offline, force=args.force)
+
+
+if __name__ == "__main__":
+    main()
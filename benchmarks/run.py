@@ -0,0 +1,316 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path[:0] = [os.path.join(ROOT, "common"), os.path.join(ROOT, "Database"), os.path.join(ROOT, "Analysis")]
+
+import numpy as np
+import pandas as pd
+
+import consistency_metrics
+import degradation
+import race_positions
+from insert_lap import insert_query as lap_insert_query, lap_rows
+from lap_flags import compute_flags
+from lap_comparison import resample
+from migrate import KNOWN_QUERIES
+from sqlite_db import create_database, seed_dimensions
+from synthetic import analysis_laps, driver_abbreviations, synthetic_session, synthetic_telemetry, synthetic_track
+from telemetry_loader import TelemetryWriter, columns_to_rows
+from telemetry_stream import CorrelationAccumulator, RunningStats, aggregate
+from track_index import TrackIndex
+
+# ===============================
+# Configuration
+# ===============================
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+RESULTS_PATH = os.path.join(BENCH_DIR, "results.json")
+TOLERANCE = 0.25  # slower than baseline by more than this fraction = regression
+SESSION_ID = 1
+
+BENCHMARKS = {}  # name -> (group, factory); factory(data) -> (run, rows)
+
+
+def benchmark(group):
+    """Register a benchmark. The factory does the untimed setup and returns (run, rows)."""
+    def register(factory):
+        BENCHMARKS[factory.__name__] = (group, factory)
+        return factory
+    return register
+
+
+# ===============================
+# Synthetic data
+# ===============================
+def make_data(n_drivers, n_laps, samples_per_lap):
+    abbreviations = driver_abbreviations(n_drivers)
+    telemetry = synthetic_telemetry(n_drivers, n_laps, samples_per_lap, SESSION_ID)
+    return SimpleNamespace(
+        abbreviations=abbreviations,
+        driver_ids={abbr: i for i, abbr in enumerate(abbreviations, start=1)},
+        session=synthetic_session(n_drivers, n_laps),
+        laps=analysis_laps(n_drivers, n_laps),
+        telemetry=telemetry,
+        track=synthetic_track(),
+        loaded_db=None,
+    )
+
+
+def database_with_laps(data):
+    conn = create_database()
+    seed_dimensions(conn, data.abbreviations, SESSION_ID)
+    cursor = conn.cursor()
+    cursor.executemany(lap_insert_query, lap_rows(data.session, SESSION_ID, data.driver_ids))
+    conn.commit()
+    cursor.close()
+    return conn
+
+
+def loaded_database(data):
+    """Database with laps and telemetry, built once and shared by the query benchmarks."""
+    if data.loaded_db is None:
+        conn = database_with_laps(data)
+        writer = TelemetryWriter(conn)
+        writer.add(data.telemetry)
+        writer.close()
+        data.loaded_db = conn
+    return data.loaded_db
+
+
+def lap_records(cols):
+    """One structured array view per lap, ordered like the telemetry cache."""
+    records = np.rec.fromarrays(
+        [cols[c] for c in ("distance", "time", "speed", "throttle", "brake", "gear")],
+        names="distance,time,speed,throttle,brake,gear"
+    )
+    change = np.flatnonzero(np.diff(cols["lap_number"]) != 0) + 1
+    return np.split(records, change)
+
+
+# ===============================
+# Ingestion
+# ===============================
+@benchmark("ingestion")
+def lap_row_building(data):
+    rows = len(data.session.laps)
+    return lambda: lap_rows(data.session, SESSION_ID, data.driver_ids), rows
+
+
+@benchmark("ingestion")
+def insert_laps(data):
+    conn = create_database()
+    seed_dimensions(conn, data.abbreviations, SESSION_ID)
+    rows = lap_rows(data.session, SESSION_ID, data.driver_ids)
+
+    def run():
+        cursor = conn.cursor()
+        cursor.executemany(lap_insert_query, rows)
+        conn.commit()
+        cursor.close()
+    return run, len(rows)
+
+
+@benchmark("ingestion")
+def lap_flag_computation(data):
+    laps = data.laps.assign(driver_id=data.laps["driver"].map(data.driver_ids), track_status="1")
+    return lambda: compute_flags(laps), len(laps)
+
+
+@benchmark("ingestion")
+def telemetry_row_building(data):
+    return lambda: columns_to_rows(data.telemetry), len(data.telemetry["sample_index"])
+
+
+@benchmark("ingestion")
+def insert_telemetry(data):
+    conn = database_with_laps(data)
+
+    def run():
+        writer = TelemetryWriter(conn)
+        writer.add(data.telemetry)
+        writer.close()
+    return run, len(data.telemetry["sample_index"])
+
+
+# ===============================
+# Queries
+# ===============================
+def query_benchmark(name, params):
+    def factory(data):
+        conn = loaded_database(data)
+        query = KNOWN_QUERIES[name][0]
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        rows = len(cursor.fetchall())
+
+        def run():
+            cursor.execute(query, params)
+            cursor.fetchall()
+        return run, rows
+    factory.__name__ = f"query_{name}"
+    return benchmark("queries")(factory)
+
+
+query_benchmark("get_laps", (SESSION_ID,))
+query_benchmark("get_telemetry", (SESSION_ID,))
+query_benchmark("get_lap_telemetry", (SESSION_ID, 1, 5))
+
+
+# ===============================
+# Analysis
+# ===============================
+@benchmark("analysis")
+def track_index_xy(data):
+    distances = data.telemetry["distance"]
+    index = TrackIndex.from_frame(data.track)
+    return lambda: index.xy(distances, shift=320), len(distances)
+
+
+@benchmark("analysis")
+def consistency_report(data):
+    return lambda: consistency_metrics.consistency_report(data.laps), len(data.laps)
+
+
+@benchmark("analysis")
+def rolling_consistency(data):
+    return lambda: consistency_metrics.rolling_consistency(data.laps), len(data.laps)
+
+
+@benchmark("analysis")
+def resample_laps(data):
+    laps = lap_records(data.telemetry)
+    grid = np.arange(0.0, data.telemetry["distance"].max(), 5.0)
+    return lambda: resample(laps, grid), len(data.telemetry["sample_index"])
+
+
+@benchmark("analysis")
+def streaming_aggregates(data):
+    frame = pd.DataFrame({c: data.telemetry[c] for c in ("speed", "gear", "throttle", "brake", "rpm")})
+    chunk_size = 50000
+    chunks = [frame.iloc[i:i + chunk_size] for i in range(0, len(frame), chunk_size)]
+    columns = list(frame.columns)
+    return (lambda: aggregate(chunks, RunningStats(columns), CorrelationAccumulator(columns))), len(frame)
+
+
+@benchmark("analysis")
+def stint_degradation(data):
+    laps = data.laps.assign(session_id=SESSION_ID, driver_id=data.laps["driver"].map(data.driver_ids),
+                            track_status="1")
+    laps["flags"] = compute_flags(laps)
+    return lambda: degradation.fit_stints(degradation.clean_stint_laps(laps)), len(laps)
+
+
+@benchmark("analysis")
+def race_position_timeline(data):
+    laps = data.laps.sort_values(["driver", "lap_number"])
+    lap_ends = pd.DataFrame({
+        "session_id": SESSION_ID,
+        "driver_id": laps["driver"].map(data.driver_ids).to_numpy(),
+        "lap_number": laps["lap_number"].to_numpy(),
+        "race_time": laps.groupby("driver")["lap_time"].cumsum().to_numpy(),
+    })
+    return lambda: race_positions.race_timeline(lap_ends), len(lap_ends)
+
+
+# ===============================
+# Runner
+# ===============================
+def run_benchmarks(data, names, repeat):
+    results = {}
+    for name in names:
+        group, factory = BENCHMARKS[name]
+        times = []
+        for _ in range(repeat):
+            run, rows = factory(data)
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+        best = min(times)
+        results[name] = {
+            "group": group,
+            "seconds": best,
+            "median_seconds": statistics.median(times),
+            "rows": rows,
+            "rows_per_second": rows / best if best else None,
+        }
+        print(f"{group:<10} {name:<28} {best * 1000:10.2f} ms  {rows:>10} rows")
+    return results
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """Print the ratio to the baseline for every benchmark and return the regressions."""
+    regressions = []
+    print(f"\n{'benchmark':<28} {'baseline':>12} {'now':>12} {'ratio':>7}")
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]["seconds"]
+        ratio = result["seconds"] / before if before else float("inf")
+        flag = "  REGRESSION" if ratio > 1 + tolerance else ""
+        print(f"{name:<28} {before * 1000:10.2f}ms {result['seconds'] * 1000:10.2f}ms {ratio:7.2f}{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark ingestion, query and analysis hot paths offline.")
+    parser.add_argument("--drivers", type=int, default=20)
+    parser.add_argument("--laps", type=int, default=53)
+    parser.add_argument("--samples", type=int, default=700, help="telemetry samples per lap")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="run only these benchmarks")
+    parser.add_argument("--output", default=RESULTS_PATH)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    params = {"drivers": args.drivers, "laps": args.laps, "samples_per_lap": args.samples, "repeat": args.repeat}
+    data = make_data(args.drivers, args.laps, args.samples)
+    results = run_benchmarks(data, args.only or list(BENCHMARKS), args.repeat)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": params,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline["meta"]["params"] != params:
+            print("Baseline was recorded with different parameters; ratios are not comparable.")
+        regressions = compare(results, baseline["results"], args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
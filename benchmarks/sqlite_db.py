@@ -0,0 +1,120 @@
+import os
+import re
+import sqlite3
+
+import numpy as np
+
+from migrate import migration_files, split_statements
+
+# NumPy scalars are bound as plain Python numbers
+for _type in (np.int8, np.int16, np.int32, np.int64, np.uint8, np.uint16, np.uint32, np.uint64):
+    sqlite3.register_adapter(_type, int)
+for _type in (np.float32, np.float64):
+    sqlite3.register_adapter(_type, float)
+
+# MySQL-only DDL rewritten for SQLite, in order
+DDL_REWRITES = (
+    (re.compile(r"\bINT AUTO_INCREMENT PRIMARY KEY\b", re.I), "INTEGER PRIMARY KEY"),
+    (re.compile(r"\s+ON UPDATE CURRENT_TIMESTAMP\b", re.I), ""),
+)
+
+
+class SQLiteCursor:
+    """DB-API cursor accepting the MySQL %s paramstyle used across the repo."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    @staticmethod
+    def _sql(query):
+        return query.replace("%s", "?")
+
+    def execute(self, query, params=()):
+        self._cursor.execute(self._sql(query), params)
+
+    def executemany(self, query, rows):
+        self._cursor.executemany(self._sql(query), rows)
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def fetchmany(self, size):
+        return self._cursor.fetchmany(size)
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    """
+    Local stand-in for a pooled MySQL connection: enough of the
+    mysql-connector interface for the loaders (cursor, commit, rollback,
+    close) on an SQLite file or :memory: database.
+    """
+
+    def __init__(self, path=":memory:"):
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+
+    def cursor(self, **kwargs):
+        # buffered / dictionary options do not apply to sqlite3
+        return SQLiteCursor(self._conn.cursor())
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def close(self):
+        self._conn.close()
+
+    def is_connected(self):
+        return True
+
+
+def sqlite_ddl(statement):
+    for pattern, replacement in DDL_REWRITES:
+        statement = pattern.sub(replacement, statement)
+    return statement
+
+
+def create_database(path=":memory:"):
+    """SQLite database with the schema of the (non-optional) migrations."""
+    if path != ":memory:" and os.path.exists(path):
+        os.remove(path)
+    conn = SQLiteConnection(path)
+    cursor = conn.cursor()
+    try:
+        for migration in migration_files():
+            with open(migration, encoding="utf-8") as f:
+                for statement in split_statements(f.read()):
+                    cursor.execute(sqlite_ddl(statement))
+        conn.commit()
+    finally:
+        cursor.close()
+    return conn
+
+
+def seed_dimensions(conn, abbreviations, session_id=1):
+    """Session and driver rows the lap / telemetry foreign keys point at."""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            "INSERT INTO sessions (session_id, year, grand_prix, session_type) VALUES (%s, %s, %s, %s)",
+            (session_id, 2024, "Synthetic Grand Prix", "R")
+        )
+        cursor.executemany(
+            "INSERT INTO drivers (driver_id, driver_number, abbreviation, full_name) VALUES (%s, %s, %s, %s)",
+            [(i, i, abbr, f"Driver {abbr}") for i, abbr in enumerate(abbreviations, start=1)]
+        )
+        conn.commit()
+    finally:
+        cursor.close()
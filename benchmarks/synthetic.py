@@ -0,0 +1,136 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+# ===============================
+# Configuration
+# ===============================
+LAP_LENGTH = 5793.0   # metres (Monza)
+BASE_LAP_TIME = 82.0  # seconds
+COMPOUNDS = ("SOFT", "MEDIUM", "HARD")
+
+
+def driver_abbreviations(n_drivers):
+    """Three-letter codes AAA, AAB, ... one per driver."""
+    letters = [chr(ord("A") + i) for i in range(26)]
+    return [letters[i // 676 % 26] + letters[i // 26 % 26] + letters[i % 26] for i in range(n_drivers)]
+
+
+# ===============================
+# Laps
+# ===============================
+def synthetic_laps(n_drivers=20, n_laps=53, seed=0):
+    """
+    Lap DataFrame in the FastF1 layout (Driver, LapNumber, LapTime, ...):
+    tyre degradation within each stint, noise, and a pit stop every
+    n_laps // 3 laps.
+    """
+    rng = np.random.default_rng(seed)
+    abbreviations = driver_abbreviations(n_drivers)
+    driver = np.repeat(abbreviations, n_laps)
+    lap_number = np.tile(np.arange(1, n_laps + 1), n_drivers)
+    stint_length = max(n_laps // 3, 1)
+    stint = (lap_number - 1) // stint_length + 1
+    tyre_age = (lap_number - 1) % stint_length
+
+    pace = np.repeat(rng.normal(0, 0.4, n_drivers), n_laps)
+    lap_time = BASE_LAP_TIME + pace + 0.05 * tyre_age + rng.normal(0, 0.3, len(driver))
+    sectors = lap_time[:, None] * np.array([0.33, 0.36, 0.31])
+    pit_in = (tyre_age == stint_length - 1) & (lap_number < n_laps)
+
+    def seconds(values):
+        return pd.to_timedelta(values, unit="s")
+
+    return pd.DataFrame({
+        "Driver": driver,
+        "DriverNumber": np.repeat([str(i + 1) for i in range(n_drivers)], n_laps),
+        "LapNumber": lap_number.astype(float),
+        "LapTime": seconds(lap_time),
+        "Sector1Time": seconds(sectors[:, 0]),
+        "Sector2Time": seconds(sectors[:, 1]),
+        "Sector3Time": seconds(sectors[:, 2]),
+        "PitInTime": seconds(lap_time).where(pit_in),
+        "Compound": np.array(COMPOUNDS)[(stint - 1) % len(COMPOUNDS)],
+        "Stint": stint.astype(float),
+        "TrackStatus": "1",
+    })
+
+
+class SyntheticLaps(pd.DataFrame):
+    """The part of fastf1.core.Laps that lap_rows() uses, without FastF1."""
+
+    @property
+    def _constructor(self):
+        return SyntheticLaps
+
+    def pick_drivers(self, identifiers):
+        return self[self["Driver"].isin(identifiers)]
+
+
+def synthetic_session(n_drivers=20, n_laps=53, seed=0):
+    """Stand-in for a loaded FastF1 session exposing .laps."""
+    return SimpleNamespace(laps=SyntheticLaps(synthetic_laps(n_drivers, n_laps, seed)))
+
+
+def analysis_laps(n_drivers=20, n_laps=53, seed=0):
+    """Laps in the layout the analyses use (driver, lap_number, lap_time in seconds, ...)."""
+    laps = synthetic_laps(n_drivers, n_laps, seed)
+    return pd.DataFrame({
+        "driver": laps["Driver"],
+        "lap_number": laps["LapNumber"].astype(int),
+        "lap_time": laps["LapTime"].dt.total_seconds(),
+        "stint_number": laps["Stint"].astype(int),
+        "tyre_compound": laps["Compound"],
+        "pit": laps["PitInTime"].notna().astype(int),
+    })
+
+
+# ===============================
+# Telemetry
+# ===============================
+def lap_profile(samples_per_lap, lap_length=LAP_LENGTH):
+    """Distance, speed and time of one synthetic lap: straights and braking zones."""
+    distance = np.linspace(0.0, lap_length, samples_per_lap)
+    speed = 230 + 90 * np.sin(distance / lap_length * 2 * np.pi * 6)
+    dt = np.diff(distance, prepend=0.0) / (speed / 3.6)
+    return distance, speed, np.cumsum(dt)
+
+
+def synthetic_telemetry(n_drivers=20, n_laps=53, samples_per_lap=700, session_id=1, seed=0):
+    """Telemetry column dict in the telemetry_loader.TELEMETRY_COLUMNS layout."""
+    rng = np.random.default_rng(seed)
+    distance, speed, time = lap_profile(samples_per_lap)
+    n = n_drivers * n_laps * samples_per_lap
+    speed_all = np.tile(speed, n_drivers * n_laps) + rng.normal(0, 2.0, n)
+    throttle = np.clip((speed_all - 150) / 1.5, 0, 100)
+    return {
+        "session_id": np.full(n, session_id, dtype=np.int64),
+        "driver_id": np.repeat(np.arange(1, n_drivers + 1), n_laps * samples_per_lap),
+        "lap_number": np.tile(np.repeat(np.arange(1, n_laps + 1), samples_per_lap), n_drivers),
+        "sample_index": np.tile(np.arange(samples_per_lap), n_drivers * n_laps),
+        "time": np.tile(time, n_drivers * n_laps),
+        "distance": np.tile(distance, n_drivers * n_laps),
+        "speed": speed_all,
+        "throttle": throttle,
+        "brake": (throttle < 5).astype(np.uint8),
+        "gear": np.clip(speed_all // 45 + 1, 1, 8),
+        "drs": np.zeros(n, dtype=np.uint8),
+        "rpm": 9000 + speed_all * 10,
+    }
+
+
+def telemetry_frame(cols):
+    """The telemetry columns as a DataFrame (what the analyses read back)."""
+    return pd.DataFrame({name: cols[name] for name in cols if name != "session_id"})
+
+
+def synthetic_track(lap_length=LAP_LENGTH, step=1.0):
+    """track_coords-style DataFrame of an ellipse with the given length."""
+    distance = np.arange(0.0, lap_length, step)
+    angle = distance / lap_length * 2 * np.pi
+    return pd.DataFrame({
+        "distance": distance,
+        "x": 1200 * np.cos(angle),
+        "y": 700 * np.sin(angle),
+    })
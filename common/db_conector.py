@@ -0,0 +1,159 @@
+import configparser
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from instrumentation import InstrumentedCursor
+
+# ===============================
+# Configuration
+# ===============================
+# mysql.connector is imported when the first connection is made, so modules
+# that only use the pure helpers next to their queries (benchmarks, tests)
+# import without the driver installed.
+#
+# Each setting is read from the F1_DB_<NAME> environment variable, then from
+# the [mysql] section of the ini file named by F1_DB_CONFIG, then the default.
+DEFAULTS = {
+    "host": "localhost",
+    "port": "3306",
+    "user": "f1_user",
+    "password": "StrongPassword123!",
+    "database": "f1_analysis",
+    "pool_size": "5",       # connections kept open per process
+    "pool_timeout": "30",   # seconds to wait for a free connection
+}
+
+# Pool usage counters: connections served straight away, callers that had to
+# wait for a free connection, and the total time spent waiting. Updated
+# under _stats_lock: connections are taken from several threads
+# (Analysis/async_queries.py).
+POOL_STATS = {"hits": 0, "waits": 0, "wait_seconds": 0.0}
+
+_pool = None
+_pool_pid = None
+_pool_timeout = None
+_pool_lock = threading.Lock()
+_stats_lock = threading.Lock()
+
+
+def get_db_config():
+    """Connection settings from the environment / config file / defaults."""
+    file_settings = {}
+    config_path = os.environ.get("F1_DB_CONFIG")
+    if config_path:
+        parser = configparser.ConfigParser()
+        parser.read(config_path)
+        if parser.has_section("mysql"):
+            file_settings = dict(parser["mysql"])
+
+    config = {}
+    for name, default in DEFAULTS.items():
+        config[name] = os.environ.get(f"F1_DB_{name.upper()}", file_settings.get(name, default))
+    return config
+
+
+def get_pool():
+    """
+    The process-wide MySQLConnectionPool, created on first use. A pool
+    inherited through fork is discarded so processes never share sockets.
+    """
+    global _pool, _pool_pid, _pool_timeout
+    from mysql.connector import pooling
+
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            config = get_db_config()
+            _pool = pooling.MySQLConnectionPool(
+                pool_name=f"f1_pool_{os.getpid()}",
+                pool_size=int(config["pool_size"]),
+                host=config["host"],
+                port=int(config["port"]),
+                user=config["user"],
+                password=config["password"],
+                database=config["database"]
+            )
+            _pool_pid = os.getpid()
+            _pool_timeout = float(config["pool_timeout"])
+        return _pool
+
+
+def get_db_connection():
+    """
+    Connection to the MySQL database, taken from the shared pool.
+    Calling close() on it returns it to the pool.
+    """
+    from mysql.connector import Error
+    from mysql.connector.errors import PoolError
+
+    try:
+        pool = get_pool()
+        start = time.perf_counter()
+        waited = False
+        while True:
+            try:
+                connection = pool.get_connection()
+                break
+            except PoolError:
+                # pool exhausted: wait for another caller to return a connection
+                if time.perf_counter() - start > _pool_timeout:
+                    raise
+                waited = True
+                time.sleep(0.01)
+
+        waited_seconds = time.perf_counter() - start
+        with _stats_lock:
+            if waited:
+                POOL_STATS["waits"] += 1
+                POOL_STATS["wait_seconds"] += waited_seconds
+            else:
+                POOL_STATS["hits"] += 1
+
+        if connection.is_connected():
+            return connection
+
+    except Error as e:
+        print(f"Database connection error: {e}")
+        return None
+
+
+def get_local_infile_connection():
+    """
+    Dedicated (not pooled) connection with LOAD DATA LOCAL INFILE enabled,
+    for the telemetry bulk loader only. Pooled connections keep it off, so
+    the analysis side never lets the server request local files.
+    """
+    import mysql.connector
+
+    config = get_db_config()
+    return mysql.connector.connect(
+        host=config["host"],
+        port=int(config["port"]),
+        user=config["user"],
+        password=config["password"],
+        database=config["database"],
+        allow_local_infile=True
+    )
+
+
+@contextmanager
+def db_connection():
+    """Context manager yielding a pooled connection and returning it afterwards."""
+    from mysql.connector import Error
+
+    connection = get_db_connection()
+    if connection is None:
+        raise Error("Could not get a database connection")
+    try:
+        yield connection
+    finally:
+        connection.close()
+
+
+def get_cursor(connection):
+    """
+    Return a cursor (statement latencies go to the instrumentation histograms)
+    """
+    return InstrumentedCursor(connection.cursor(buffered=True))
+
@@ -0,0 +1,284 @@
+import cProfile
+import json
+import math
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource  # Unix only
+except ImportError:
+    resource = None
+
+# ===============================
+# Configuration
+# ===============================
+METRICS_FILE = os.environ.get("F1_METRICS_FILE")       # Prometheus text file written at the end of a run
+LOG_FILE = os.environ.get("F1_METRICS_LOG")            # JSON lines, "-" for stderr
+PROFILE = os.environ.get("F1_PROFILE", "")             # "", "cprofile" or "tracemalloc"
+PROFILE_DIR = os.environ.get("F1_PROFILE_DIR", ".")
+PROFILE_TOP = 25
+
+# Upper bounds (seconds) of the SQL latency histogram buckets
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0, math.inf)
+
+_stages = {}  # name -> {"count", "seconds", "rows", "bytes_sent", "bytes_received"}
+_sql = {}     # statement verb -> {"buckets", "sum", "count"}
+_lock = threading.Lock()  # queries may run on several threads (Analysis/async_queries.py)
+
+
+# ===============================
+# Structured logs
+# ===============================
+def log_event(event, **fields):
+    """One JSON line per event to F1_METRICS_LOG (no-op when it is not set)."""
+    if not LOG_FILE:
+        return
+    line = json.dumps({"ts": round(time.time(), 3), "pid": os.getpid(), "event": event, **fields},
+                      default=str)
+    if LOG_FILE == "-":
+        print(line, file=sys.stderr)
+    else:
+        with open(LOG_FILE, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+def peak_memory_bytes():
+    """Peak resident set size of this process (None where resource is unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # kB on Linux
+
+
+# ===============================
+# Stages
+# ===============================
+class StageRecord:
+    __slots__ = ("name", "rows", "seconds", "bytes_sent", "bytes_received")
+
+    def __init__(self, name):
+        self.name = name
+        self.rows = 0
+        self.seconds = 0.0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+
+def session_bytes(conn):
+    """(Bytes_sent, Bytes_received) of the MySQL session, None if the server cannot tell."""
+    try:
+        cursor = conn.cursor(buffered=True)
+        try:
+            cursor.execute("SHOW SESSION STATUS WHERE Variable_name IN ('Bytes_sent', 'Bytes_received')")
+            status = {name: int(value) for name, value in cursor.fetchall()}
+        finally:
+            cursor.close()
+    except Exception:
+        return None
+    return status.get("Bytes_sent", 0), status.get("Bytes_received", 0)
+
+
+@contextmanager
+def stage(name, conn=None):
+    """
+    Record wall time, rows (set record.rows inside the block) and, when a
+    MySQL connection is given, bytes exchanged with the server for one stage.
+    """
+    record = StageRecord(name)
+    before = session_bytes(conn) if conn is not None else None
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record.seconds = time.perf_counter() - start
+        after = session_bytes(conn) if before is not None else None
+        if after is not None:
+            # Bytes_sent is what the server sent, i.e. what we received
+            record.bytes_received = after[0] - before[0]
+            record.bytes_sent = after[1] - before[1]
+
+        with _lock:
+            totals = _stages.setdefault(name, {"count": 0, "seconds": 0.0, "rows": 0,
+                                               "bytes_sent": 0, "bytes_received": 0})
+            totals["count"] += 1
+            totals["seconds"] += record.seconds
+            totals["rows"] += record.rows
+            totals["bytes_sent"] += record.bytes_sent
+            totals["bytes_received"] += record.bytes_received
+        log_event("stage", stage=name, seconds=round(record.seconds, 4), rows=record.rows,
+                  bytes_sent=record.bytes_sent, bytes_received=record.bytes_received,
+                  peak_memory_bytes=peak_memory_bytes())
+
+
+# ===============================
+# SQL latency
+# ===============================
+def observe_sql(query, seconds):
+    """Add one statement's latency to the histogram of its verb (SELECT, INSERT, ...)."""
+    words = query.split(None, 1)
+    verb = words[0].upper() if words else "OTHER"
+    with _lock:
+        histogram = _sql.setdefault(verb, {"buckets": [0] * len(LATENCY_BUCKETS), "sum": 0.0, "count": 0})
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                histogram["buckets"][i] += 1
+                break
+        histogram["sum"] += seconds
+        histogram["count"] += 1
+
+
+@contextmanager
+def sql_timer(query):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_sql(query, time.perf_counter() - start)
+
+
+class InstrumentedCursor:
+    """Cursor proxy timing execute / executemany; everything else is passed through."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, query, *args, **kwargs):
+        with sql_timer(query):
+            return self._cursor.execute(query, *args, **kwargs)
+
+    def executemany(self, query, *args, **kwargs):
+        with sql_timer(query):
+            return self._cursor.executemany(query, *args, **kwargs)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+# ===============================
+# Snapshots and export
+# ===============================
+def snapshot():
+    """Picklable copy of this process's metrics (e.g. to return from a pool worker)."""
+    with _lock:
+        text = json.dumps({"stages": _stages, "sql": _sql})
+    return {**json.loads(text), "peak_memory_bytes": peak_memory_bytes()}
+
+
+def merge(other):
+    """Add a snapshot from another process to this process's metrics."""
+    with _lock:
+        for name, values in other.get("stages", {}).items():
+            totals = _stages.setdefault(name, {key: 0 for key in values})
+            for key, value in values.items():
+                totals[key] = totals.get(key, 0) + value
+        for verb, values in other.get("sql", {}).items():
+            histogram = _sql.setdefault(verb, {"buckets": [0] * len(LATENCY_BUCKETS), "sum": 0.0, "count": 0})
+            histogram["buckets"] = [a + b for a, b in zip(histogram["buckets"], values["buckets"])]
+            histogram["sum"] += values["sum"]
+            histogram["count"] += values["count"]
+
+
+def reset():
+    with _lock:
+        _stages.clear()
+        _sql.clear()
+
+
+def prometheus_text(job):
+    """Metrics in the Prometheus text exposition format."""
+    metrics = snapshot()  # copied under the lock: queries may still be running
+    stages, sql = metrics["stages"], metrics["sql"]
+    labels = f'job="{job}"'
+    lines = [
+        "# TYPE f1_stage_seconds_total counter",
+        *(f'f1_stage_seconds_total{{{labels},stage="{n}"}} {s["seconds"]:.6f}' for n, s in stages.items()),
+        "# TYPE f1_stage_runs_total counter",
+        *(f'f1_stage_runs_total{{{labels},stage="{n}"}} {s["count"]}' for n, s in stages.items()),
+        "# TYPE f1_stage_rows_total counter",
+        *(f'f1_stage_rows_total{{{labels},stage="{n}"}} {s["rows"]}' for n, s in stages.items()),
+        "# TYPE f1_stage_bytes_total counter",
+    ]
+    for name, s in stages.items():
+        lines.append(f'f1_stage_bytes_total{{{labels},stage="{name}",direction="sent"}} {s["bytes_sent"]}')
+        lines.append(f'f1_stage_bytes_total{{{labels},stage="{name}",direction="received"}} {s["bytes_received"]}')
+
+    lines.append("# TYPE f1_sql_latency_seconds histogram")
+    for verb, histogram in sql.items():
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, histogram["buckets"]):
+            cumulative += count
+            le = "+Inf" if bound == math.inf else repr(bound)
+            lines.append(f'f1_sql_latency_seconds_bucket{{{labels},statement="{verb}",le="{le}"}} {cumulative}')
+        lines.append(f'f1_sql_latency_seconds_sum{{{labels},statement="{verb}"}} {histogram["sum"]:.6f}')
+        lines.append(f'f1_sql_latency_seconds_count{{{labels},statement="{verb}"}} {histogram["count"]}')
+
+    peak = metrics["peak_memory_bytes"]
+    if peak is not None:
+        lines += ["# TYPE f1_peak_memory_bytes gauge", f"f1_peak_memory_bytes{{{labels}}} {peak}"]
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics(job, path=METRICS_FILE):
+    """Write the Prometheus text file atomically (node_exporter textfile collector style)."""
+    if not path:
+        return
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(prometheus_text(job))
+    os.replace(tmp, path)
+
+
+# ===============================
+# Runs and profiling
+# ===============================
+@contextmanager
+def profiled(name, mode=PROFILE):
+    """cProfile or tracemalloc the block when F1_PROFILE asks for it."""
+    if mode == "cprofile":
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            path = os.path.join(PROFILE_DIR, f"{name}-{os.getpid()}.prof")
+            profiler.dump_stats(path)
+            print(f"\nProfile written to {path}", file=sys.stderr)
+            pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(PROFILE_TOP)
+    elif mode == "tracemalloc":
+        tracemalloc.start()
+        try:
+            yield
+        finally:
+            top = tracemalloc.take_snapshot().statistics("lineno")[:PROFILE_TOP]
+            tracemalloc.stop()
+            print("\nLargest allocations still held", file=sys.stderr)
+            for stat in top:
+                print(f"  {stat}", file=sys.stderr)
+    else:
+        yield
+
+
+@contextmanager
+def run(job):
+    """Whole-run wrapper: optional profiling, a summary log event and the metrics file."""
+    start = time.perf_counter()
+    log_event("run_start", job=job)
+    try:
+        with profiled(job):
+            yield
+    finally:
+        with _lock:
+            stages = {name: dict(totals) for name, totals in _stages.items()}
+            sql_counts = {verb: h["count"] for verb, h in _sql.items()}
+        log_event("run_end", job=job, seconds=round(time.perf_counter() - start, 3),
+                  peak_memory_bytes=peak_memory_bytes(), stages=stages, sql=sql_counts)
+        write_metrics(job)
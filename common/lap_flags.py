@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+
+# ===============================
+# Configuration
+# ===============================
+# Bits of laps.flags; a lap with flags = 0 is clean.
+IN_LAP = 1        # pitted at the end of the lap
+OUT_LAP = 2       # first lap of a stint after a pit stop
+NEUTRALISED = 4   # safety car, VSC or red flag during the lap
+YELLOW = 8        # yellow flag during the lap
+FIRST_LAP = 16    # lap 1 (standing start)
+OUTLIER = 32      # outside its driver's IQR fences among the otherwise clean laps
+NO_TIME = 64      # no lap time recorded
+UNFLAGGED = 128   # not flagged yet: the column default, cleared by update_lap_flags
+
+CLEAN = 0
+FLAG_NAMES = {
+    IN_LAP: "in_lap",
+    OUT_LAP: "out_lap",
+    NEUTRALISED: "neutralised",
+    YELLOW: "yellow",
+    FIRST_LAP: "first_lap",
+    OUTLIER: "outlier",
+    NO_TIME: "no_time",
+    UNFLAGGED: "unflagged",
+}
+
+IQR_FACTOR = 1.5  # Tukey fences, as in Analysis/consistency_metrics.py
+
+# FastF1 TrackStatus digits seen during a lap: 1 green, 2 yellow,
+# 4 safety car, 5 red flag, 6 VSC deployed, 7 VSC ending
+YELLOW_STATUS = "2"
+NEUTRALISED_STATUS = "4567"
+
+
+# ===============================
+# Flags
+# ===============================
+def status_flags(track_status):
+    """YELLOW / NEUTRALISED bits from a Series of FastF1 TrackStatus strings."""
+    status = track_status.fillna("").astype(str)
+    flags = np.where(status.str.contains(YELLOW_STATUS, regex=False), YELLOW, 0)
+    flags |= np.where(status.str.contains(f"[{NEUTRALISED_STATUS}]"), NEUTRALISED, 0)
+    return flags.astype(np.uint16)
+
+
+def compute_flags(laps, by="driver_id", k=IQR_FACTOR):
+    """
+    Flags of every lap of one session, aligned with the rows of laps
+    (columns: by, lap_number, lap_time, pit, stint_number, track_status).
+    Out-laps are the first lap of each stint after lap 1; outliers use the
+    IQR fences of each driver's laps that carry no other flag.
+    """
+    lap_number = laps["lap_number"].to_numpy()
+    lap_time = laps["lap_time"].to_numpy(dtype=np.float64)
+
+    flags = status_flags(laps["track_status"])
+    flags |= np.where(laps["pit"].to_numpy() == 1, IN_LAP, 0).astype(np.uint16)
+    flags |= np.where(lap_number == 1, FIRST_LAP, 0).astype(np.uint16)
+    flags |= np.where(np.isnan(lap_time), NO_TIME, 0).astype(np.uint16)
+
+    stint = laps["stint_number"].fillna(0)
+    stint_start = laps.groupby([laps[by], stint])["lap_number"].transform("min").to_numpy()
+    flags |= np.where((lap_number == stint_start) & (lap_number > 1), OUT_LAP, 0).astype(np.uint16)
+
+    candidates = flags == CLEAN
+    if candidates.any():
+        times = pd.Series(lap_time[candidates])
+        grouped = times.groupby(laps[by].to_numpy()[candidates])
+        q1 = grouped.transform("quantile", 0.25).to_numpy()
+        q3 = grouped.transform("quantile", 0.75).to_numpy()
+        iqr = q3 - q1
+        outside = (times.to_numpy() < q1 - k * iqr) | (times.to_numpy() > q3 + k * iqr)
+        flags[np.flatnonzero(candidates)[outside]] |= OUTLIER
+    return flags
+
+
+def flag_names(flags):
+    """Names of the bits set in one flags value, e.g. ['in_lap', 'yellow']."""
+    return [name for bit, name in FLAG_NAMES.items() if int(flags) & bit]
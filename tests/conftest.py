@@ -0,0 +1,10 @@
+import os
+import sys
+
+# The scripts import each other by module name from their own directory, as
+# when run with python Database/<script>.py; module names are unique across
+# these directories (shared modules live in common/). benchmarks/ provides the
+# SQLite copy of the migrated schema.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(ROOT, "common"), os.path.join(ROOT, "Database"), os.path.join(ROOT, "Analysis"),
+                 os.path.join(ROOT, "benchmarks")]
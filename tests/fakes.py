@@ -0,0 +1,57 @@
+class FakeCursor:
+    """Records the verb of every statement; the fetch methods return the connection's queued results."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.rowcount = 0
+
+    def execute(self, query, params=()):
+        self.conn.statements.append(query.split(None, 1)[0].upper())
+        self.conn.params.append(params)
+
+    def executemany(self, query, rows):
+        self.conn.statements.append(query.split(None, 1)[0].upper())
+        self.conn.params.append(list(rows))
+
+    def fetchall(self):
+        return self.conn.results.pop(0) if self.conn.results else []
+
+    def fetchone(self):
+        rows = self.fetchall()
+        return rows[0] if rows else None
+
+    def fetchmany(self, size):
+        """Next rows of the current result; [] once it is exhausted, then the next result."""
+        if not self.conn.results:
+            return []
+        rows, self.conn.results[0] = self.conn.results[0][:size], self.conn.results[0][size:]
+        if not rows:
+            self.conn.results.pop(0)
+        return rows
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """Enough of a mysql-connector connection to check what code executes and commits on it."""
+
+    def __init__(self, results=()):
+        self.results = list(results)
+        self.statements = []
+        self.params = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.closed = False
+
+    def cursor(self, **kwargs):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
@@ -0,0 +1,43 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from async_queries import gather_queries
+
+
+class Tracker:
+    """Blocking query stand-in that records how many calls run at the same time."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.running = 0
+        self.peak = 0
+        self.started = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, value):
+        with self.lock:
+            self.started += 1
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(self.delay)
+        with self.lock:
+            self.running -= 1
+        return value * 2
+
+
+def test_semaphore_limits_concurrency_and_keeps_order():
+    query = Tracker()
+    results = asyncio.run(gather_queries([(query, i) for i in range(8)], max_concurrency=3))
+    assert results == [i * 2 for i in range(8)]
+    assert query.peak == 3
+
+
+def test_timeout_cancels_queries_not_started():
+    query = Tracker(delay=0.2)
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(gather_queries([(query, i) for i in range(6)], max_concurrency=2, timeout=0.05))
+    # asyncio.run waits for the worker threads; only the first two calls ever started
+    assert query.started == 2
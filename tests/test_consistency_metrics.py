@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from consistency_metrics import consistency_report, filter_outliers, rolling_consistency
+
+
+@pytest.fixture
+def laps():
+    rng = np.random.default_rng(3)
+    frames = []
+    for driver, spread in (("LEC", 0.3), ("PIA", 0.6), ("HAM", 0.2)):
+        lap_time = 81.0 + rng.normal(0, spread, 25)
+        lap_time[[4, 17]] += (25.0, 9.0)  # safety car / traffic
+        frames.append(pd.DataFrame({"driver": driver, "lap_number": np.arange(1, 26), "lap_time": lap_time}))
+    return pd.concat(frames, ignore_index=True).sample(frac=1, random_state=1)
+
+
+# The per-driver loops the groupby versions replaced
+def loop_filter(df):
+    cleaned = []
+    for driver in df["driver"].unique():
+        laps = df[df["driver"] == driver]["lap_time"]
+        q1, q3 = laps.quantile(0.25), laps.quantile(0.75)
+        lower, upper = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+        cleaned.append(df[(df["driver"] == driver) & (df["lap_time"] >= lower) & (df["lap_time"] <= upper)])
+    return pd.concat(cleaned)
+
+
+def loop_stats(df):
+    stats = []
+    for driver in df["driver"].unique():
+        laps = df[df["driver"] == driver]["lap_time"]
+        stats.append({"Driver": driver, "Std Dev (s)": laps.std(),
+                      "IQR (s)": laps.quantile(0.75) - laps.quantile(0.25)})
+    return pd.DataFrame(stats).sort_values("Std Dev (s)").reset_index(drop=True)
+
+
+def test_filter_outliers_matches_the_loop(laps):
+    expected = loop_filter(laps)
+    assert sorted(filter_outliers(laps).index) == sorted(expected.index)
+    assert len(expected) < len(laps)
+
+
+def test_consistency_stats_match_the_loop(laps):
+    _, stats = consistency_report(laps)
+    expected = loop_stats(loop_filter(laps))
+    assert stats["driver"].tolist() == expected["Driver"].tolist()
+    np.testing.assert_allclose(stats["std"], expected["Std Dev (s)"])
+    np.testing.assert_allclose(stats["iqr"], expected["IQR (s)"])
+
+
+def test_consistency_table_matches_the_loop(laps):
+    pytest.importorskip("seaborn")
+    from consistency_is_key import consistency_table
+
+    clean = filter_outliers(laps)
+    pd.testing.assert_frame_equal(consistency_table(clean), loop_stats(loop_filter(laps)))
+
+
+def test_rolling_consistency_matches_the_loop(laps):
+    rolling = rolling_consistency(laps, window=5)
+    for driver, group in laps.groupby("driver"):
+        ordered = group.sort_values("lap_number")
+        expected = ordered["lap_time"].rolling(5, min_periods=2).std()
+        pd.testing.assert_series_equal(rolling.loc[ordered.index], expected, check_names=False)
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+
+from degradation import clean_stint_laps, fit_stints
+from lap_flags import CLEAN, IN_LAP
+
+
+def stint_laps(deg_per_lap, n_laps=12):
+    lap_number = np.arange(1, n_laps + 1)
+    return pd.DataFrame({
+        "session_id": 1,
+        "driver_id": 1,
+        "lap_number": lap_number,
+        "lap_time": 90.0 + deg_per_lap * (lap_number - 1),
+        "tyre_compound": "medium ",
+        "stint_number": 1,
+        "flags": CLEAN,
+    })
+
+
+def test_fit_stints_recovers_degradation():
+    laps = stint_laps(0.08)
+    laps.loc[5, "flags"] = IN_LAP  # excluded from the fit
+    laps.loc[5, "lap_time"] = 110.0
+    clean = clean_stint_laps(laps)
+    fits = fit_stints(clean)
+
+    assert len(fits) == 1
+    fit = fits.iloc[0]
+    assert fit["tyre_compound"] == "MEDIUM"
+    assert fit["laps"] == len(laps) - 1
+    # the fuel correction adds FUEL_SECONDS_PER_KG * fuel burnt per lap to the slope
+    fuel_per_lap = 105.0 / len(laps) * 0.03
+    assert np.isclose(fit["deg_per_lap"], 0.08 + fuel_per_lap)
+    assert np.isclose(fit["r_squared"], 1.0)
+
+
+def test_fit_stints_skips_short_stints():
+    fits = fit_stints(clean_stint_laps(stint_laps(0.05, n_laps=2)))
+    assert fits.empty
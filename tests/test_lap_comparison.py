@@ -0,0 +1,33 @@
+import numpy as np
+
+from lap_comparison import ResampledLaps, fastest_laps, lap_grid, resample
+
+
+def lap(length, lap_time, n=500):
+    """Record array like TelemetryCache.lap(), at constant speed."""
+    distance = np.linspace(0.0, length, n)
+    return np.rec.fromarrays(
+        [distance, distance / length * lap_time, np.full(n, length / lap_time * 3.6),
+         np.full(n, 100.0), np.zeros(n), np.full(n, 7.0)],
+        names="distance,time,speed,throttle,brake,gear"
+    )
+
+
+def test_fastest_laps_with_laps_of_slightly_different_length():
+    # measured lap distances differ by tens of metres; the median is 5000 m
+    keys = [(1, 2), (1, 3), (1, 4), (2, 2), (2, 3)]
+    laps = [lap(4990.0, 80.0), lap(5030.0, 82.0), lap(5010.0, 81.0), lap(4985.0, 80.5), lap(5000.0, 81.5)]
+    grid = lap_grid(laps)
+
+    assert grid[-1] <= 4985.0
+    resampled = ResampledLaps(keys, grid, resample(laps, grid))
+    assert not np.isnan(resampled.lap_times()).any()
+    assert fastest_laps(resampled) == {1: 2, 2: 2}
+
+
+def test_lap_grid_ignores_partial_laps():
+    laps = [lap(5000.0, 80.0), lap(5010.0, 80.0), lap(5005.0, 80.0), lap(1200.0, 30.0)]
+    grid = lap_grid(laps, step=5.0)
+
+    assert grid[-1] == 5000.0
+    assert np.isnan(ResampledLaps([(1, n) for n in range(4)], grid, resample(laps, grid)).lap_times()[3])
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+from lap_flags import CLEAN, FIRST_LAP, IN_LAP, NEUTRALISED, NO_TIME, OUT_LAP, OUTLIER, YELLOW, compute_flags
+
+
+def laps_frame():
+    # one driver, 8 laps: pit at the end of lap 4, yellow on lap 6, SC on lap 7, lap 8 untimed
+    return pd.DataFrame({
+        "driver_id": 1,
+        "lap_number": np.arange(1, 9),
+        "lap_time": [95.0, 90.0, 90.2, 93.0, 94.0, 90.1, 110.0, np.nan],
+        "pit": [0, 0, 0, 1, 0, 0, 0, 0],
+        "stint_number": [1, 1, 1, 1, 2, 2, 2, 2],
+        "track_status": ["1", "1", "1", "1", "1", "12", "14", "1"],
+    })
+
+
+def test_compute_flags_bits():
+    flags = compute_flags(laps_frame())
+
+    assert flags.dtype == np.uint16
+    assert flags[0] == FIRST_LAP
+    assert flags[1] == CLEAN and flags[2] == CLEAN
+    assert flags[3] == IN_LAP
+    assert flags[4] == OUT_LAP
+    assert flags[5] == YELLOW
+    assert flags[6] & NEUTRALISED
+    assert flags[7] == NO_TIME
+
+
+def test_compute_flags_outlier_among_clean_laps():
+    laps = pd.DataFrame({
+        "driver_id": 1,
+        "lap_number": np.arange(2, 12),
+        "lap_time": [90.0, 90.1, 89.9, 90.2, 90.0, 90.1, 89.8, 90.0, 90.2, 99.0],
+        "pit": 0,
+        "stint_number": 1,
+        "track_status": "1",
+    })
+    flags = compute_flags(laps)
+
+    assert flags[0] == OUT_LAP  # first lap of the stint after lap 1
+    assert flags[-1] == OUTLIER
+    assert (flags[1:-1] == CLEAN).all()
@@ -0,0 +1,31 @@
+import os
+
+import pytest
+
+import df_Queries
+import migrate
+from sqlite_db import create_database, seed_dimensions
+
+
+def test_known_queries_are_the_analysis_sql():
+    assert migrate.KNOWN_QUERIES["get_laps"][0] is df_Queries.LAPS_QUERY
+    sql = {query for query, _ in migrate.KNOWN_QUERIES.values()}
+    constants = {value for name, value in vars(df_Queries).items() if name.endswith("_QUERY")}
+    assert constants <= sql
+
+
+@pytest.mark.parametrize("name", sorted(migrate.KNOWN_QUERIES))
+def test_known_queries_run_on_the_migrated_schema(name):
+    conn = create_database()
+    seed_dimensions(conn, ["LEC"])
+    query, params = migrate.KNOWN_QUERIES[name]
+    cursor = conn.cursor()
+    cursor.execute(query, params)
+    cursor.fetchall()
+
+
+def test_optional_migrations_sort_after_the_base_series():
+    names = [os.path.basename(path) for path in migrate.migration_files(with_partitioning=True)]
+    assert names == sorted(names)
+    assert names[-1] == "0007_partition_telemetry.sql"
+    assert "0007_partition_telemetry.sql" not in map(os.path.basename, migrate.migration_files())
@@ -0,0 +1,64 @@
+import os
+
+import numpy as np
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.parquet as pq  # noqa: E402
+
+from parquet_reader import session_dataset  # noqa: E402
+from parquet_writer import ParquetTelemetryWriter, session_dir  # noqa: E402
+
+DRIVER_IDS = {"LEC": 1}
+LAP_INFO = {(1, 1): (81.5, False)}
+
+
+def telemetry(speed, gear=(7, 8, 8)):
+    n = len(gear)
+    return {
+        "session_id": np.full(n, 9), "driver_id": np.full(n, 1), "lap_number": np.full(n, 1),
+        "sample_index": np.arange(n), "time": np.arange(n) * 0.1, "distance": np.arange(n) * 10.0,
+        "speed": np.full(n, speed, dtype=float), "throttle": np.full(n, 100.0), "brake": np.zeros(n),
+        "gear": np.asarray(gear, dtype=float), "drs": np.zeros(n), "rpm": np.full(n, 11000.0),
+    }
+
+
+def write(root, cols):
+    writer = ParquetTelemetryWriter(2024, DRIVER_IDS, LAP_INFO, root=root)
+    writer.add(cols)
+    writer.flush()
+    return writer
+
+
+def read(root):
+    return session_dataset(9, 2024, root).to_table().to_pandas()
+
+
+def test_partition_is_swapped_in_on_close(tmp_path):
+    root = str(tmp_path)
+    write(root, telemetry(200.0)).close()
+    assert read(root)["speed"].tolist() == [200, 200, 200]
+
+    writer = write(root, telemetry(300.0))
+    assert read(root)["speed"].tolist() == [200, 200, 200]  # staged parts are not visible yet
+    writer.close()
+    assert read(root)["speed"].tolist() == [300, 300, 300]
+    assert os.listdir(session_dir(2024, 9, root)) == ["driver=LEC"]
+
+
+def test_close_without_flush_keeps_the_old_partition(tmp_path):
+    root = str(tmp_path)
+    write(root, telemetry(200.0)).close()
+    write(root, telemetry(300.0)).close(flush=False)
+    assert read(root)["speed"].tolist() == [200, 200, 200]
+    assert os.listdir(session_dir(2024, 9, root)) == ["driver=LEC"]
+
+
+def test_missing_integer_samples_are_null(tmp_path):
+    root = str(tmp_path)
+    write(root, telemetry(200.0, gear=(7, np.nan, 8))).close()
+    path = os.path.join(session_dir(2024, 9, root), "driver=LEC", "part-0.parquet")
+    table = pq.read_table(path)
+    assert table.schema.field("gear").type == pa.uint8()
+    assert table.column("gear").to_pylist() == [7, None, 8]
+    assert table.column("rpm").null_count == 0
@@ -0,0 +1,66 @@
+from contextlib import nullcontext
+
+import pandas as pd
+import pytest
+
+import query_cache
+
+QUERY = "SELECT lap_number, lap_time FROM laps WHERE session_id = %s"
+
+
+@pytest.fixture
+def database(monkeypatch, tmp_path):
+    """Fake read_sql counting round trips; the session version is set by the test."""
+    state = {"version": 1, "reads": 0}
+
+    def read_sql(query, conn, params=()):
+        state["reads"] += 1
+        return pd.DataFrame({"lap_number": [1, 2], "lap_time": [81.0 + state["version"], 80.5]})
+
+    monkeypatch.setattr(query_cache, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(query_cache, "session_version", lambda session_id: state["version"])
+    monkeypatch.setattr(query_cache, "db_connection", lambda: nullcontext(None))
+    monkeypatch.setattr(query_cache.pd, "read_sql", read_sql)
+    query_cache.clear_cache()
+    yield state
+    query_cache.clear_cache()
+
+
+def test_results_are_cached_until_the_version_changes(database):
+    first = query_cache.cached_read_sql(QUERY, (1,), session_id=1)
+    first["lap_time"] = 0.0  # callers get a copy
+    again = query_cache.cached_read_sql(QUERY, (1,), session_id=1)
+    assert database["reads"] == 1
+    assert again["lap_time"].tolist() == [82.0, 80.5]
+
+    database["version"] = 2
+    reloaded = query_cache.cached_read_sql(QUERY, (1,), session_id=1)
+    assert database["reads"] == 2
+    assert reloaded["lap_time"].tolist() == [83.0, 80.5]
+
+
+@pytest.mark.skipif(not query_cache.DISK_ENABLED, reason="Feather needs pyarrow")
+def test_disk_tier_is_keyed_on_the_version(database):
+    query_cache.cached_read_sql(QUERY, (1,), session_id=1)
+    query_cache.clear_cache(disk=False)
+    assert query_cache.cached_read_sql(QUERY, (1,), session_id=1)["lap_time"].iat[0] == 82.0
+    assert database["reads"] == 1  # served from the Feather file
+
+    query_cache.clear_cache(disk=False)
+    database["version"] = 2
+    assert query_cache.cached_read_sql(QUERY, (1,), session_id=1)["lap_time"].iat[0] == 83.0
+    assert database["reads"] == 2
+
+
+def test_memory_tier_evicts_least_recently_used(database, monkeypatch):
+    size = int(pd.DataFrame({"lap_number": [1, 2], "lap_time": [82.0, 80.5]}).memory_usage(deep=True).sum())
+    monkeypatch.setattr(query_cache, "MEMORY_LIMIT_BYTES", 2 * size)
+    monkeypatch.setattr(query_cache, "DISK_ENABLED", False)
+
+    for session_id in (1, 2, 1, 3):  # 2 is the least recently used when 3 arrives
+        query_cache.cached_read_sql(QUERY, (session_id,), session_id=session_id)
+    assert database["reads"] == 3
+    query_cache.cached_read_sql(QUERY, (1,), session_id=1)
+    assert database["reads"] == 3
+    query_cache.cached_read_sql(QUERY, (2,), session_id=2)
+    assert database["reads"] == 4
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+import race_positions
+import race_timeline
+
+
+def test_race_timeline_positions_and_gaps():
+    lap_ends = pd.DataFrame({
+        "session_id": 1,
+        "driver_id": [1, 2, 3, 1, 2, 3],
+        "lap_number": [1, 1, 1, 2, 2, 2],
+        "race_time": [90.0, 91.5, 90.5, 180.0, 181.0, 182.5],
+    })
+    timeline = race_positions.race_timeline(lap_ends)
+
+    lap1 = timeline[timeline["lap_number"] == 1].set_index("driver_id")
+    assert lap1["position"].to_dict() == {1: 1, 3: 2, 2: 3}
+    assert np.isnan(lap1.loc[1, "gap_to_leader"])
+    assert np.isclose(lap1.loc[2, "gap_to_leader"], 1.5)
+    assert np.isclose(lap1.loc[2, "interval_ahead"], 1.0)
+
+    lap2 = timeline[timeline["lap_number"] == 2].set_index("driver_id")
+    assert lap2["position"].to_dict() == {1: 1, 2: 2, 3: 3}
+
+
+def test_timeline_at_orders_by_progress():
+    # A runs 1 lap / 100 s, B 1 lap / 110 s, both from t = 0
+    t = np.linspace(0.0, 200.0, 21)
+    progress = pd.DataFrame({
+        "abbreviation": ["AAA"] * len(t) + ["BBB"] * len(t),
+        "race_time": np.concatenate([t, t]),
+        "progress": np.concatenate([t / 100.0, t / 110.0]),
+    })
+    timeline = race_timeline.timeline_at(progress, np.array([50.0, 150.0]))
+
+    at_150 = timeline[timeline["time"] == 150.0].set_index("abbreviation")
+    assert at_150.loc["AAA", "position"] == 1
+    assert at_150.loc["BBB", "position"] == 2
+    # B is at lap 150 / 110; A reached that progress at 100 * 150 / 110 s
+    assert np.isclose(at_150.loc["BBB", "gap_to_leader"], 150.0 - 100.0 * 150.0 / 110.0)
+
+
+def test_race_progress_without_telemetry(monkeypatch):
+    monkeypatch.setattr(race_timeline, "stream_telemetry", lambda *args, **kwargs: iter(()))
+    positions = pd.DataFrame({"abbreviation": ["AAA"], "lap_number": [1], "race_time": [90.0]})
+
+    assert race_timeline.race_progress(1, positions=positions).empty
@@ -0,0 +1,47 @@
+import season
+from fakes import FakeConnection
+
+
+def running(*rows):
+    return FakeConnection(results=[list(rows)])
+
+
+def test_jobs_of_a_dead_local_owner_are_stale():
+    dead = f"{season.HOST}:{2 ** 22 + 12345}"  # above the default pid_max, never a live pid
+    conn = running((2024, "Italian Grand Prix", "R", dead, 5))
+
+    stale, live = season.stale_running_jobs(conn)
+    assert stale == [(2024, "Italian Grand Prix", "R")]
+    assert live == []
+
+
+def test_jobs_of_a_live_owner_are_skipped_unless_requeue_running():
+    me = season.job_owner()
+    assert season.owner_alive(me) is True
+
+    stale, live = season.stale_running_jobs(running((2024, "Italian Grand Prix", "R", me, 5000)))
+    assert stale == [] and live[0][3] == me
+
+    stale, live = season.stale_running_jobs(running((2024, "Italian Grand Prix", "R", me, 5)),
+                                            requeue_running=True)
+    assert stale == [(2024, "Italian Grand Prix", "R")]
+
+
+def test_remote_owner_is_judged_by_its_heartbeat():
+    row = (2024, "Monaco Grand Prix", "Q", "other-host:1234")
+    stale, _ = season.stale_running_jobs(running(row + (season.STALE_JOB_SECONDS + 1,)))
+    assert stale == [row[:3]]
+    stale, live = season.stale_running_jobs(running(row + (10,)))
+    assert stale == [] and len(live) == 1
+    stale, _ = season.stale_running_jobs(running(row + (None,)))  # never beat
+    assert stale == [row[:3]]
+
+
+def test_register_jobs_requeues_stale_jobs(capsys):
+    dead = f"{season.HOST}:{2 ** 22 + 12345}"
+    conn = FakeConnection(results=[[(2024, "Italian Grand Prix", "R", dead, 5)], []])
+    season.register_jobs(conn, [(2024, "Italian Grand Prix", "R", "Monza")])
+
+    assert conn.statements[:3] == ["SELECT", "INSERT", "UPDATE"]
+    assert conn.params[2] == [(2024, "Italian Grand Prix", "R")]
+    assert "Requeueing 1 job" in capsys.readouterr().out
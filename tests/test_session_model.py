@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+from lap_flags import CLEAN, OUT_LAP
+from session_model import MISSING, LapTable, TelemetryTable, categorical, codes_for
+
+
+def session_laps():
+    return pd.DataFrame({
+        "abbreviation": ["LEC", "LEC", "LEC", "PIA", "PIA"],
+        "lap_number": [1, 2, 3, 1, 2],
+        "lap_time": [81.5, 80.9, np.nan, 81.7, 81.2],
+        "sector1_time": [27.1, 26.9, np.nan, 27.2, 27.0],
+        "sector2_time": [28.0, 27.8, np.nan, 28.1, 27.9],
+        "sector3_time": [26.4, 26.2, np.nan, 26.4, 26.3],
+        "pit": [0, 1, 0, 0, 0],
+        "tyre_compound": ["medium ", "MEDIUM", "HARD", "HARD", None],
+        "stint_number": [1, 1, 2, 1, np.nan],
+        "track_status": ["1", "1", "4", "1", "1"],
+        "flags": [OUT_LAP, CLEAN, OUT_LAP, OUT_LAP, CLEAN],
+    })
+
+
+def test_lap_table_round_trip():
+    df = session_laps()
+    laps = LapTable(df, ["LEC", "PIA"])
+    assert len(laps) == 5
+    assert laps.lap_number.dtype == np.uint16 and laps.lap_time.dtype == np.float32
+    assert laps.compounds == ("HARD", "MEDIUM")
+    assert laps.compound[-1] == MISSING
+
+    frame = laps.to_frame()
+    assert frame["abbreviation"].tolist() == df["abbreviation"].tolist()
+    assert frame["lap_number"].tolist() == df["lap_number"].tolist()
+    np.testing.assert_allclose(frame["lap_time"], df["lap_time"], rtol=1e-6)
+    assert frame["tyre_compound"].tolist()[:4] == ["MEDIUM", "MEDIUM", "HARD", "HARD"]
+    assert pd.isna(frame["tyre_compound"].iat[4])
+    assert frame["pit"].tolist() == [False, True, False, False, False]
+    assert frame["stint_number"].tolist() == [1, 1, 2, 1, 0]  # 0 = unknown
+    assert frame["track_status"].tolist() == df["track_status"].tolist()
+    assert laps.clean().tolist() == [False, True, False, False, True]
+
+
+def test_stints():
+    stints = LapTable(session_laps(), ["LEC", "PIA"]).stints()
+    summary = [(s.driver, s.stint_number, s.compound, s.first_lap, s.last_lap, s.laps) for s in stints]
+    assert summary == [
+        ("LEC", 1, "MEDIUM", 1, 2, 2),
+        ("LEC", 2, "HARD", 3, 3, 1),
+        ("PIA", 0, None, 2, 2, 1),
+        ("PIA", 1, "HARD", 1, 1, 1),
+    ]
+
+
+def test_telemetry_lap_is_a_view():
+    drivers = ("LEC", "PIA")
+    driver = codes_for(["LEC", "LEC", "LEC", "PIA", "PIA"], drivers)
+    speed = np.array([100, 200, 150, 120, 180], dtype=np.float32)
+    table = TelemetryTable(driver, np.array([1, 1, 2, 1, 1], dtype=np.uint16), {"speed": speed}, drivers)
+
+    lap = table.lap("LEC", 1)
+    assert lap["speed"].tolist() == [100, 200]
+    assert np.shares_memory(lap["speed"].to_numpy(), speed)
+    assert table.to_frame()["abbreviation"].tolist() == list(categorical(driver, drivers))
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+import telemetry_loader
+from fakes import FakeConnection
+from telemetry_loader import TELEMETRY_COLUMNS, TelemetryWriter
+
+
+def lap_columns(n=10):
+    cols = {c: np.zeros(n) for c in TELEMETRY_COLUMNS}
+    cols.update(session_id=np.ones(n, dtype=np.int64), driver_id=np.ones(n, dtype=np.int64),
+                lap_number=np.full(n, 3, dtype=np.int64), sample_index=np.arange(n))
+    return cols
+
+
+@pytest.mark.parametrize("method", ["insert", "infile"])
+def test_writer_executes_and_commits_on_one_connection(monkeypatch, method):
+    pooled, infile = FakeConnection(), FakeConnection()
+    monkeypatch.setattr(telemetry_loader, "get_local_infile_connection", lambda: infile)
+
+    writer = TelemetryWriter(pooled, method=method, replace_laps=True)
+    writer.add(lap_columns())
+    writer.close()
+
+    used, unused = (infile, pooled) if method == "infile" else (pooled, infile)
+    assert used.statements == ["DELETE", "LOAD" if method == "infile" else "INSERT"]
+    assert used.commits == 1
+    assert unused.statements == [] and unused.commits == 0
+    assert infile.closed == (method == "infile")
+    assert writer.rows_written == 10
+
+
+def test_writer_close_without_flush_drops_buffered_rows():
+    conn = FakeConnection()
+    writer = TelemetryWriter(conn)
+    writer.add(lap_columns())
+    writer.close(flush=False)
+
+    assert conn.statements == [] and conn.commits == 0
@@ -0,0 +1,52 @@
+from contextlib import nullcontext
+
+import pytest
+
+import telemetry_mmap
+from fakes import FakeConnection
+
+
+def samples(speed, laps=((1, 1, 3), (1, 2, 2), (4, 1, 2))):
+    """Telemetry rows in SAMPLES_QUERY column order: (driver_id, lap_number, n samples) per lap."""
+    rows = []
+    for driver_id, lap_number, n in laps:
+        for i in range(n):
+            rows.append((driver_id, lap_number, i * 0.1, i * 10.0, speed + i, 90, 0, 7, 0, 11000))
+    return rows
+
+
+@pytest.fixture
+def session(monkeypatch, tmp_path):
+    """Fake database with one session whose version and rows the test can change."""
+    state = {"version": 1, "rows": samples(200.0), "builds": 0}
+
+    def db_connection():
+        state["builds"] += 1
+        return nullcontext(FakeConnection(results=[[(len(state["rows"]),)], list(state["rows"])]))
+
+    monkeypatch.setattr(telemetry_mmap, "session_version", lambda session_id: state["version"])
+    monkeypatch.setattr(telemetry_mmap, "db_connection", db_connection)
+    monkeypatch.setattr(telemetry_mmap, "CHUNK_SIZE", 2)  # laps span fetchmany chunks
+    monkeypatch.setattr(telemetry_mmap, "_caches", {})
+    return state, str(tmp_path)
+
+
+def test_cache_is_rebuilt_when_the_session_version_changes(session):
+    state, root = session
+    cache = telemetry_mmap.get_telemetry_cache(7, root)
+    assert state["builds"] == 1
+    assert cache.lap(1, 1)["speed"].tolist() == [200, 201, 202]
+    assert cache.lap_frame(4, 1)["distance"].tolist() == [0, 10]
+
+    assert telemetry_mmap.get_telemetry_cache(7, root) is cache
+    assert state["builds"] == 1
+
+    state["version"], state["rows"] = 2, samples(300.0, laps=((1, 1, 4),))
+    assert not telemetry_mmap.is_current(7, root)
+    rebuilt = telemetry_mmap.get_telemetry_cache(7, root)
+    assert state["builds"] == 2 and rebuilt is not cache
+    assert rebuilt.lap(1, 1)["speed"].tolist() == [300, 301, 302, 303]
+    with pytest.raises(KeyError):
+        rebuilt.lap(4, 1)
+    assert cache.lap(1, 1)["speed"].tolist() == [200, 201, 202]  # the old mapping stays readable
+    assert telemetry_mmap._read_meta(7, root)["version"] == 2
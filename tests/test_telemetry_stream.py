@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import telemetry_stream
+from telemetry_stream import CorrelationAccumulator, Histogram, RunningStats, aggregate
+
+COLUMNS = ["speed", "throttle", "rpm"]
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(7)
+    n = 1000
+    speed = rng.uniform(80, 330, n)
+    df = pd.DataFrame({
+        "speed": speed,
+        "throttle": np.clip(speed / 3.3 + rng.normal(0, 8, n), 0, 100),
+        "rpm": speed * 35 + rng.normal(0, 400, n),
+    })
+    for column, every in zip(COLUMNS, (7, 11, 13)):
+        df.loc[df.index[::every], column] = np.nan
+    return df
+
+
+def chunks(df, size=137):
+    return [df.iloc[i:i + size] for i in range(0, len(df), size)]
+
+
+def test_running_stats_match_describe(frame):
+    stats, = aggregate(chunks(frame), RunningStats(COLUMNS))
+    expected = frame.describe().T[["count", "mean", "std", "min", "max"]]
+    pd.testing.assert_frame_equal(stats, expected, check_dtype=False)
+
+
+def test_correlation_matches_complete_rows(frame):
+    corr, = aggregate(chunks(frame), CorrelationAccumulator(COLUMNS))
+    pd.testing.assert_frame_equal(corr, frame.dropna().corr())
+
+
+def test_histogram_matches_cut(frame):
+    bins = np.arange(50, 351, 25)
+    hist, = aggregate(chunks(frame), Histogram("speed", bins))
+    expected = pd.cut(frame["speed"], bins, right=False).value_counts(sort=False)
+    assert hist["count"].tolist() == expected.tolist()
+    assert hist["count"].sum() == frame["speed"].notna().sum()
+
+
+def test_stream_laps_joins_a_lap_split_across_chunks(monkeypatch):
+    telemetry = pd.DataFrame({
+        "abbreviation": ["LEC"] * 5 + ["PIA"] * 4,
+        "lap_number": [1, 1, 2, 2, 2, 1, 1, 1, 1],
+        "speed": np.arange(9, dtype=float),
+    })
+
+    def stream_telemetry(session_id, columns, chunk_size, include_pit):
+        yield from chunks(telemetry.reset_index(drop=True), chunk_size)
+
+    monkeypatch.setattr(telemetry_stream, "stream_telemetry", stream_telemetry)
+    # chunks of 3 rows: LEC lap 2 spans the first two, PIA lap 1 the last two
+    laps = list(telemetry_stream.stream_laps(1, columns=("speed",), chunk_size=3))
+
+    assert [(abbr, lap) for abbr, lap, _ in laps] == [("LEC", 1), ("LEC", 2), ("PIA", 1)]
+    assert [df["speed"].tolist() for _, _, df in laps] == [[0, 1], [2, 3, 4], [5, 6, 7, 8]]
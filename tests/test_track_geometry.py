@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+from track_geometry import resample_centreline
+
+
+def lap(distance):
+    distance = np.asarray(distance, dtype=float)
+    return pd.DataFrame({"Distance": distance, "X": distance * 2.0, "Y": -distance})
+
+
+def test_backwards_samples_are_dropped():
+    # 30 -> 25 -> 28: a single diff > 0 pass keeps 28, which is still below 30
+    frame = lap([0, 10, 20, 30, 25, 28, 40, 50, 50, 60, 70, 80, 90, 100])
+    frame.loc[[4, 5], ["X", "Y"]] = 999.0  # off the line, must not reach the centreline
+    centreline = resample_centreline([frame], step=5.0)
+
+    assert centreline["distance"].tolist() == list(np.arange(0.0, 100.0, 5.0))
+    np.testing.assert_allclose(centreline["x"], centreline["distance"] * 2.0)
+    np.testing.assert_allclose(centreline["y"], -centreline["distance"])
+
+
+def test_laps_are_scaled_to_the_median_length():
+    laps = [lap(np.linspace(0, length, 50)) for length in (990.0, 1000.0, 1010.0)]
+    centreline = resample_centreline(laps, step=10.0)
+    assert centreline["distance"].iat[-1] == 990.0
+    assert np.all(np.diff(centreline["x"]) > 0)
@@ -0,0 +1,49 @@
+import numpy as np
+
+from track_index import TrackIndex
+
+
+def circle(step=10.0, lap_length=1000.0):
+    distance = np.arange(0.0, lap_length, step)
+    angle = distance / lap_length * 2 * np.pi
+    return distance, np.cos(angle), np.sin(angle)
+
+
+def test_xy_matches_centreline_points():
+    distance, x, y = circle()
+    index = TrackIndex(distance, x, y, lap_length=1000.0)
+    px, py = index.xy(distance[[0, 25, 50]])
+
+    assert np.allclose(px, x[[0, 25, 50]])
+    assert np.allclose(py, y[[0, 25, 50]])
+
+
+def test_xy_wraps_shifted_distances():
+    distance, x, y = circle()
+    index = TrackIndex(distance, x, y, lap_length=1000.0)
+
+    # 20 m shifted back from 10 m is 990 m into the previous lap
+    px, py = index.xy([10.0], shift=20.0)
+    assert np.allclose([px[0], py[0]], [x[99], y[99]])
+    # between the last point (990 m) and the start line the loop is closed
+    px, py = index.xy([995.0])
+    assert np.allclose([px[0], py[0]], [(x[99] + x[0]) / 2, (y[99] + y[0]) / 2])
+
+
+def test_default_lap_length_closes_the_loop_one_step_after_the_last_point():
+    distance, x, y = circle()
+    index = TrackIndex(distance, x, y)
+
+    assert index.lap_length == 1000.0
+    px, py = index.xy([995.0, 1000.0])
+    assert np.allclose([px[0], py[0]], [(x[99] + x[0]) / 2, (y[99] + y[0]) / 2])
+    assert np.allclose([px[1], py[1]], [x[0], y[0]])
+    assert index.nearest([998.0, 994.0]).tolist() == [0, 99]
+
+
+def test_xy_before_the_first_point_interpolates_across_the_start_line():
+    distance, x, y = circle()
+    index = TrackIndex(distance[1:], x[1:], y[1:], lap_length=1000.0)  # first point at 10 m
+
+    px, py = index.xy([0.0])
+    assert np.allclose([px[0], py[0]], [(x[99] + x[1]) / 2, (y[99] + y[1]) / 2])